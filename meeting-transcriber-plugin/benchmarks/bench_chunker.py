@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Chunker benchmark suite.
+
+Runs the chunker over seeded synthetic transcripts of several sizes and
+shapes and reports throughput, peak memory, chunk count and chunk size
+spread. Results are saved as JSON; pass --compare to diff against an
+earlier run.
+
+Usage: bench_chunker.py [--sizes 1000,10000,...] [--shapes speakers,...]
+                        [--repeat N] [--output results.json] [--compare old.json]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+import platform
+import statistics
+import contextlib
+import tracemalloc
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "skills" / "meeting-transcriber" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from chunk_transcript import (  # noqa: E402
+    create_chunks, find_logical_breaks, stream_chunks
+)
+from workspace import ensure_workspace, remove_workspace  # noqa: E402
+from synthetic_transcript import SHAPES, DEFAULT_SEED, generate  # noqa: E402
+
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_REPEAT = 3
+REGRESSION_THRESHOLD = 0.10  # Flag throughput drops larger than 10%
+
+
+def run_in_memory(path):
+    """Legacy API: read the whole file, find breaks, pack chunks."""
+    text = path.read_text(encoding="utf-8")
+    chunks = create_chunks(find_logical_breaks(text))
+    return [len(chunk.split()) for chunk in chunks]
+
+
+def run_streaming(path):
+    """Pipeline path: stream from disk, writing chunk files as they fill."""
+    timestamp = f"bench-{os.getpid()}"
+    ensure_workspace(timestamp)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            records, _, _ = stream_chunks(path, timestamp)
+    finally:
+        remove_workspace(timestamp)
+    return [record["word_count"] for record in records]
+
+
+MODES = {"in_memory": run_in_memory, "streaming": run_streaming}
+
+
+def measure(run, path, words, repeat):
+    """Best-of-N wall time, then one traced run for peak memory."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        sizes = run(path)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    run(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        "seconds": round(best, 4),
+        "words_per_second": round(words / best) if best else None,
+        "peak_memory_bytes": peak,
+        "chunk_count": len(sizes),
+        "chunk_words_mean": round(statistics.mean(sizes), 1) if sizes else 0,
+        "chunk_words_stdev": round(statistics.pstdev(sizes), 1) if sizes else 0,
+        "chunk_words_min": min(sizes, default=0),
+        "chunk_words_max": max(sizes, default=0),
+    }
+
+
+def run_suite(sizes, shapes, repeat, seed=DEFAULT_SEED):
+    """Benchmark every mode on every (shape, size). Returns result rows."""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="meeting-bench-") as tmp:
+        for shape in shapes:
+            for size in sizes:
+                path = Path(tmp) / f"{shape}-{size}.md"
+                words = generate(path, size, shape, seed)
+                for mode, run in MODES.items():
+                    row = {"shape": shape, "size": size, "words": words, "mode": mode}
+                    row.update(measure(run, path, words, repeat))
+                    results.append(row)
+                    print(f"{shape:>9} {size:>9} {mode:>10}: "
+                          f"{row['words_per_second']:>10} words/s, "
+                          f"peak {row['peak_memory_bytes'] / 1024:>9.0f} KB, "
+                          f"{row['chunk_count']:>5} chunks, "
+                          f"stdev {row['chunk_words_stdev']:>6} words")
+    return results
+
+
+def compare(results, baseline):
+    """Print throughput and memory change against a saved baseline run."""
+    previous = {(r["shape"], r["size"], r["mode"]): r for r in baseline["results"]}
+    regressions = 0
+
+    print(f"\n=== Compared to {baseline.get('version', 'baseline')} ===")
+    for row in results:
+        old = previous.get((row["shape"], row["size"], row["mode"]))
+        if not old or not old.get("words_per_second"):
+            continue
+        speed = row["words_per_second"] / old["words_per_second"] - 1
+        memory = row["peak_memory_bytes"] / max(old["peak_memory_bytes"], 1) - 1
+        flag = ""
+        if speed < -REGRESSION_THRESHOLD:
+            flag = "  <-- REGRESSION"
+            regressions += 1
+        print(f"{row['shape']:>9} {row['size']:>9} {row['mode']:>10}: "
+              f"throughput {speed:+.1%}, peak memory {memory:+.1%}{flag}")
+
+    print(f"REGRESSIONS={regressions}")
+    return regressions
+
+
+def git_revision():
+    """Short git revision of the chunker being benchmarked, "+dirty" if modified."""
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS_DIR,
+                                  capture_output=True, text=True, timeout=10).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--", "."], cwd=SCRIPTS_DIR,
+                               capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    if not revision:
+        return "unknown"
+    return f"{revision}+dirty" if dirty else revision
+
+
+def parse_list(value, cast=str):
+    """Parse a comma-separated option value."""
+    return [cast(item) for item in value.split(",") if item]
+
+
+def main():
+    """Run the benchmark suite and save results as JSON."""
+    args = sys.argv[1:]
+
+    def option(name, default=None):
+        if name not in args:
+            return default
+        try:
+            return args[args.index(name) + 1]
+        except IndexError:
+            print(f"ERROR: {name} requires a value", file=sys.stderr)
+            sys.exit(1)
+
+    try:
+        sizes = parse_list(option("--sizes", ""), int) or DEFAULT_SIZES
+        repeat = int(option("--repeat", DEFAULT_REPEAT))
+    except ValueError as e:
+        print(f"ERROR: Invalid number: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    shapes = parse_list(option("--shapes", "")) or list(SHAPES)
+    unknown = [shape for shape in shapes if shape not in SHAPES]
+    if unknown:
+        print(f"ERROR: Unknown shape(s): {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(1)
+
+    print("=== Meeting Transcriber: Chunker Benchmark ===")
+    results = run_suite(sizes, shapes, repeat)
+
+    report = {
+        "version": git_revision(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": DEFAULT_SEED,
+        "repeat": repeat,
+        "results": results,
+    }
+    output = Path(option("--output", f"chunker-bench-{int(time.time())}.json"))
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"RESULTS_FILE={output}")
+
+    baseline_file = option("--compare")
+    if baseline_file:
+        try:
+            baseline = json.loads(Path(baseline_file).read_text(encoding="utf-8"))
+        except Exception as e:
+            print(f"ERROR: Failed to read baseline: {e}", file=sys.stderr)
+            sys.exit(1)
+        if compare(results, baseline):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
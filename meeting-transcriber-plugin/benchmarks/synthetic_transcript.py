@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Seeded synthetic transcript generator for chunker benchmarks.
+
+Produces transcripts of a given word count in one of several shapes, so
+benchmark runs are reproducible and comparable between versions.
+
+Usage: synthetic_transcript.py <words> <shape> <output_file> [--seed N]
+"""
+
+import sys
+import random
+from pathlib import Path
+
+
+SHAPES = ("speakers", "captions", "mixed")
+DEFAULT_SEED = 1234
+
+SPEAKERS = ["Mike", "Sarah Chen", "John Smith", "Priya", "Tom O'Neil", "Speaker 3"]
+VOCABULARY = (
+    "we the project budget timeline should review next quarter client team "
+    "um uh like so basically actually I think that is a good point and "
+    "deliverable migration rollout customer data pipeline dashboard meeting "
+    "agree follow up action item owner risk scope testing launch region "
+    "yeah right okay you know sort of kind of maybe we can discuss later"
+).split()
+
+
+def sentence(rng):
+    """One sentence of 4-20 words, capitalised and terminated."""
+    words = rng.choices(VOCABULARY, k=rng.randint(4, 20))
+    words[0] = words[0].capitalize()
+    return " ".join(words) + rng.choice(".....?!")
+
+
+def speaker_turns(rng, words):
+    """Speaker-labelled turns, grouped into blank-line separated paragraphs."""
+    written = 0
+    while written < words:
+        text = " ".join(sentence(rng) for _ in range(rng.randint(1, 6)))
+        written += len(text.split()) + 1  # Label word(s) are not counted here
+        separator = "\n\n" if rng.random() < 0.3 else "\n"
+        yield f"{rng.choice(SPEAKERS)}: {text}{separator}"
+
+
+def caption_lines(rng, words):
+    """Auto-caption dump: short lowercase lines, no paragraphs or labels."""
+    written = 0
+    while written < words:
+        line = rng.choices(VOCABULARY, k=rng.randint(5, 12))
+        written += len(line)
+        yield " ".join(line).lower() + "\n"
+
+
+def mixed(rng, words):
+    """Alternating stretches of speaker turns, caption lines and long prose."""
+    written = 0
+    while written < words:
+        stretch = min(rng.randint(200, 3000), words - written)
+        kind = rng.randrange(3)
+        if kind == 0:
+            parts = speaker_turns(rng, stretch)
+        elif kind == 1:
+            parts = caption_lines(rng, stretch)
+        else:
+            parts = iter([" ".join(sentence(rng) for _ in range(stretch // 12)) + "\n\n"])
+        for part in parts:
+            written += len(part.split())
+            yield part
+
+
+GENERATORS = {"speakers": speaker_turns, "captions": caption_lines, "mixed": mixed}
+
+
+def generate(path, words, shape, seed=DEFAULT_SEED):
+    """Write a synthetic transcript to path. Returns the actual word count."""
+    if shape not in GENERATORS:
+        raise ValueError(f"Unknown shape '{shape}' (expected one of {', '.join(SHAPES)})")
+
+    rng = random.Random(f"{seed}-{shape}-{words}")
+    total = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for part in GENERATORS[shape](rng, words):
+            f.write(part)
+            total += len(part.split())
+    return total
+
+
+def main():
+    """Generate one synthetic transcript from the command line."""
+    if len(sys.argv) < 4:
+        print("Usage: synthetic_transcript.py <words> <shape> <output_file> [--seed N]", file=sys.stderr)
+        print(f"Shapes: {', '.join(SHAPES)}", file=sys.stderr)
+        sys.exit(1)
+
+    seed = DEFAULT_SEED
+    if "--seed" in sys.argv:
+        seed = int(sys.argv[sys.argv.index("--seed") + 1])
+
+    try:
+        total = generate(Path(sys.argv[3]), int(sys.argv[1]), sys.argv[2], seed)
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"SUCCESS: Wrote {total} words")
+    print(f"TRANSCRIPT_FILE={sys.argv[3]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
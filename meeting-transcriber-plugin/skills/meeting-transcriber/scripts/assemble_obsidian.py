@@ -3,6 +3,7 @@
 Assemble complete Obsidian meeting notes file from agent outputs.
 """
 
+import os
 import sys
 import json
 import re
@@ -11,6 +12,12 @@ from datetime import datetime
 
 # Import config module from same directory
 from config import get_meetings_dir, ensure_configured
+import meeting_index
+import pipeline_state
+from workspace import remove_workspace, run_id_of, workspace_dir
+
+
+COPY_BLOCK_CHARS = 1024 * 1024  # Transcript is copied into the note in 1M-character blocks
 
 
 def read_file(file_path):
@@ -22,13 +29,110 @@ def read_file(file_path):
         return None
 
 
+METADATA_KEYS = ("date", "title", "participants")
+
+
+# Braces and string quotes are the only characters the object scanner stops at
+BRACE_OR_QUOTE = re.compile(r'[{}"]')
+STRING_REST = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+OBJECT_START = re.compile(r'\{\s*["}]')
+
+
+def balanced_spans(text, quotes_outside=True):
+    """(start, end) of every balanced {...} span in text, sorted by start.
+
+    One regex-driven pass; quoted strings are skipped so braces in them do
+    not count, both in JSON string values and in prose before the first
+    object ('the "{client}" field'). With quotes_outside=False only quotes
+    inside braces are strings, for prose with an unpaired quote (5" screen).
+    """
+    spans = []
+    stack = []
+    unterminated = False  # After an unclosed quote no later quote can close
+    pos = 0
+    while True:
+        match = BRACE_OR_QUOTE.search(text, pos)
+        if not match:
+            break
+        char = match.group()
+        pos = match.end()
+        if char == '{':
+            stack.append(match.start())
+        elif char == '}':
+            if stack:
+                spans.append((stack.pop(), pos))
+        elif (stack or quotes_outside) and not unterminated:
+            rest = STRING_REST.match(text, pos)
+            if rest:
+                pos = rest.end()
+            else:
+                unterminated = True
+    spans.sort()
+    return spans
+
+
+def iter_json_objects(text):
+    """Yield every JSON object embedded in text, outermost first.
+
+    Decodes each balanced {...} span with json.JSONDecoder.raw_decode,
+    skipping spans inside an object that already decoded, so prose, code
+    fences and several objects in one agent output are handled without
+    backtracking. Work stays linear unless non-JSON braces are deeply nested.
+    If nothing decodes, the scan is repeated ignoring quotes outside braces,
+    in case an unpaired quote in the prose swallowed the object.
+    """
+    found = False
+    for obj in decode_spans(text, balanced_spans(text)):
+        found = True
+        yield obj
+    if not found:
+        yield from decode_spans(text, balanced_spans(text, quotes_outside=False))
+
+
+def decode_spans(text, spans):
+    """Decode the outermost JSON objects among spans; yields them and their nested dicts."""
+    decoder = json.JSONDecoder()
+    decoded_end = 0
+    for start, end in spans:
+        if start < decoded_end or not OBJECT_START.match(text, start):
+            continue
+        try:
+            value, _ = decoder.raw_decode(text[start:end])
+        except ValueError:
+            continue
+        decoded_end = end
+        yield from iter_dicts(value)
+
+
+def iter_dicts(value):
+    """Yield value and any dicts nested in it, outermost first."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            yield item
+            stack.extend(reversed(list(item.values())))
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
+
+
+def find_metadata_json(text):
+    """First JSON object with all metadata keys, else the first with a date."""
+    fallback = None
+    for obj in iter_json_objects(text):
+        if all(key in obj for key in METADATA_KEYS):
+            return obj
+        if fallback is None and "date" in obj:
+            fallback = obj
+    return fallback
+
+
 def parse_metadata(metadata_text):
     """Parse metadata from agent output."""
     # Look for JSON in the output
-    json_match = re.search(r'\{[\s\S]*"date"[\s\S]*\}', metadata_text)
-    if json_match:
+    metadata = find_metadata_json(metadata_text)
+    if metadata is not None:
         try:
-            metadata = json.loads(json_match.group())
             # Ensure time field exists (backward compatibility)
             if 'time' not in metadata:
                 # Try to extract time from date field if it's in old format
@@ -115,7 +219,7 @@ def extract_meeting_notes(notes_text):
     return notes_text.strip()
 
 
-def build_yaml_frontmatter(metadata, participants):
+def build_yaml_frontmatter(metadata, participants, previous_meeting=None):
     """Build YAML frontmatter."""
     created_date = datetime.now().strftime("%Y-%m-%d %H:%M")
 
@@ -137,6 +241,9 @@ def build_yaml_frontmatter(metadata, participants):
     # Format participants (with quotes around wiki-links for proper YAML)
     participants_yaml = '\n'.join(f'  - "{p}"' for p in participants)
 
+    # Link to the previous meeting note, if one was found
+    previous_yaml = f' "[[{previous_meeting}]]"' if previous_meeting else ''
+
     # Extract first sentence from meeting notes for summary (will be added by caller)
     # Use 'or' to handle None values for all metadata fields
     yaml = f"""---
@@ -150,7 +257,7 @@ project: "{metadata.get('project') or ''}"
 region: "{metadata.get('region') or ''}"
 participants:
 {participants_yaml}
-previous meeting:
+previous meeting:{previous_yaml}
 summary: "{{SUMMARY_PLACEHOLDER}}"
 home: "[[Home]]"
 ---"""
@@ -158,6 +265,40 @@ home: "[[Home]]"
     return yaml
 
 
+def find_previous_meeting(metadata, participants, output_path):
+    """Title of the previous related meeting note, from the meeting index.
+
+    The index is a convenience; any failure just leaves the field empty.
+    """
+    date_met = metadata.get('date') or datetime.now().strftime("%Y-%m-%d")
+    time_met = metadata.get('time') or '09:00'
+    try:
+        db = meeting_index.open_index(output_path.parent)
+        try:
+            return meeting_index.previous_meeting(
+                db, date_met, time_met,
+                metadata.get('client') or '', metadata.get('project') or '',
+                participants, exclude=output_path)
+        finally:
+            db.close()
+    except Exception as e:
+        print(f"WARNING: Previous meeting lookup failed: {e}", file=sys.stderr)
+        return None
+
+
+def index_note(output_path):
+    """Add a saved note to the meeting index."""
+    try:
+        db = meeting_index.connect()
+        try:
+            meeting_index.upsert_note(db, output_path)
+            db.commit()
+        finally:
+            db.close()
+    except Exception as e:
+        print(f"WARNING: Failed to add note to meeting index: {e}", file=sys.stderr)
+
+
 def extract_first_sentence(meeting_notes):
     """Extract first sentence from meeting notes for YAML summary."""
     # Look for Executive Summary section
@@ -185,17 +326,12 @@ def validate_inputs(cleaned_file, metadata_text, people_text, notes_text):
     errors = []
     warnings = []
 
-    # Check cleaned file exists and has content
+    # Check cleaned file exists and has content (words are counted while
+    # the transcript is streamed into the note, so it is not read here)
     if not Path(cleaned_file).exists():
         errors.append(f"Cleaned transcript file not found: {cleaned_file}")
-    else:
-        content = read_file(cleaned_file)
-        if not content or len(content.strip()) < 100:
-            errors.append(f"Cleaned transcript file is empty or too short: {cleaned_file}")
-        else:
-            word_count = len(content.split())
-            if word_count < 50:
-                warnings.append(f"Cleaned transcript has very few words ({word_count})")
+    elif Path(cleaned_file).stat().st_size < 100:
+        errors.append(f"Cleaned transcript file is empty or too short: {cleaned_file}")
 
     # Check metadata is not empty/default
     if not metadata_text or len(metadata_text.strip()) < 20:
@@ -212,6 +348,56 @@ def validate_inputs(cleaned_file, metadata_text, people_text, notes_text):
     return (len(errors) == 0, errors, warnings)
 
 
+def stream_transcript(cleaned_file, out):
+    """Copy the cleaned transcript into out block by block. Returns its word count."""
+    word_count = 0
+    in_word = False
+    with open(cleaned_file, 'r', encoding='utf-8') as f:
+        while True:
+            block = f.read(COPY_BLOCK_CHARS)
+            if not block:
+                break
+            out.write(block)
+            word_count += len(block.split())
+            # A word split across two blocks was counted twice
+            if in_word and not block[0].isspace():
+                word_count -= 1
+            in_word = not block[-1].isspace()
+    return word_count
+
+
+def write_note(output_path, header, cleaned_file):
+    """Write the note to a temp file next to output_path, then rename it into place.
+
+    Synced vault folders only ever see the finished note. The transcript is
+    streamed from cleaned_file, so it is never held in memory. Returns the
+    transcript word count, or None if nothing was published.
+    """
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as out:
+            out.write(header)
+            word_count = stream_transcript(cleaned_file, out)
+            out.write("\n")
+            out.flush()
+            os.fsync(out.fileno())
+
+        if not word_count:
+            print(f"ERROR: Cleaned transcript file is empty: {cleaned_file}", file=sys.stderr)
+            tmp_path.unlink()
+            return None
+
+        os.replace(tmp_path, output_path)
+        return word_count
+    except Exception as e:
+        print(f"ERROR: Failed to save file: {e}", file=sys.stderr)
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return None
+
+
 def assemble_and_save(cleaned_file, metadata_text, people_text, notes_text):
     """Assemble complete Obsidian file and save."""
     print("=== Meeting Transcriber: Assembly ===")
@@ -231,12 +417,6 @@ def assemble_and_save(cleaned_file, metadata_text, people_text, notes_text):
         for warning in warnings:
             print(f"  - {warning}")
 
-    # Read cleaned transcript
-    cleaned_transcript = read_file(cleaned_file)
-    if not cleaned_transcript:
-        print("ERROR: Could not read cleaned transcript", file=sys.stderr)
-        return None
-
     # Parse metadata
     metadata = parse_metadata(metadata_text)
     print(f"INFO: Meeting title: {metadata['title']}")
@@ -253,21 +433,6 @@ def assemble_and_save(cleaned_file, metadata_text, people_text, notes_text):
     # Extract first sentence for summary
     summary = extract_first_sentence(meeting_notes)
 
-    # Build YAML frontmatter
-    yaml = build_yaml_frontmatter(metadata, participants)
-    summary_safe = summary.replace('"', '\\"')
-    yaml = yaml.replace('{SUMMARY_PLACEHOLDER}', summary_safe)
-
-    # Assemble complete file
-    complete_content = f"""{yaml}
-
-{meeting_notes}
-
-## Transcript
-
-{cleaned_transcript}
-"""
-
     # Build filename (date only, no time)
     # Use 'or' to handle both missing keys AND None values
     date_str = metadata.get('date') or datetime.now().strftime("%Y-%m-%d")
@@ -279,18 +444,49 @@ def assemble_and_save(cleaned_file, metadata_text, people_text, notes_text):
     meetings_dir.mkdir(parents=True, exist_ok=True)
     output_path = meetings_dir / filename
 
-    try:
-        output_path.write_text(complete_content, encoding='utf-8')
-        print(f"SUCCESS: Saved to {output_path}")
-        return output_path
-    except Exception as e:
-        print(f"ERROR: Failed to save file: {e}", file=sys.stderr)
+    previous_meeting = find_previous_meeting(metadata, participants, output_path)
+    if previous_meeting:
+        print(f"INFO: Previous meeting: {previous_meeting}")
+
+    # Build YAML frontmatter
+    yaml = build_yaml_frontmatter(metadata, participants, previous_meeting)
+    summary_safe = summary.replace('"', '\\"')
+    yaml = yaml.replace('{SUMMARY_PLACEHOLDER}', summary_safe)
+
+    # Everything before the transcript, which is streamed in after it
+    header = f"""{yaml}
+
+{meeting_notes}
+
+## Transcript
+
+"""
+
+    word_count = write_note(output_path, header, cleaned_file)
+    if word_count is None:
         return None
+    index_note(output_path)
+
+    if word_count < 50:
+        print(f"WARNING: Cleaned transcript has very few words ({word_count})")
+    print(f"INFO: Transcript: {word_count} words")
+    print(f"SUCCESS: Saved to {output_path}")
+    return output_path
 
 
 def cleanup_temp_files(raw_file, cleaned_file):
-    """Clean up temporary files."""
+    """Clean up temporary files, removing the run's whole workspace if they are in one.
+
+    Also prunes run state older than pipeline_state.RUN_MAX_AGE_DAYS.
+    """
+    pruned = pipeline_state.prune_runs()
+    if pruned:
+        print(f"INFO: Removed state of {pruned} old runs")
     try:
+        run_id = run_id_of(cleaned_file) or run_id_of(raw_file)
+        if run_id and remove_workspace(run_id):
+            print(f"INFO: Cleaned up workspace {workspace_dir(run_id)}")
+            return
         if Path(raw_file).exists():
             Path(raw_file).unlink()
             print(f"INFO: Cleaned up {raw_file}")
@@ -301,6 +497,121 @@ def cleanup_temp_files(raw_file, cleaned_file):
         print(f"WARNING: Failed to cleanup temp files: {e}", file=sys.stderr)
 
 
+def split_options(argv):
+    """Separate --resume, --batch and --run-id ID from the positional arguments."""
+    positional = []
+    run_id = None
+    resume = False
+    batch = False
+    i = 0
+    while i < len(argv):
+        if argv[i] == "--resume":
+            resume = True
+        elif argv[i] == "--batch":
+            batch = True
+        elif argv[i] == "--run-id":
+            if i + 1 >= len(argv):
+                print("ERROR: --run-id requires a value", file=sys.stderr)
+                sys.exit(1)
+            run_id = argv[i + 1]
+            i += 1
+        else:
+            positional.append(argv[i])
+        i += 1
+    return positional, run_id, resume, batch
+
+
+def read_agent_input(value):
+    """Agent output given as text or as a path to a file holding it."""
+    try:
+        return read_file(value) if Path(value).exists() else value
+    except (OSError, ValueError):
+        return value
+
+
+def resume_inputs(run_id):
+    """Recover assembly inputs from a run's saved state. Returns None if incomplete."""
+    state = pipeline_state.load_state(run_id)
+    chunked = pipeline_state.completed_phase(state, "chunk") or {}
+    reassembled = pipeline_state.completed_phase(state, "reassemble") or {}
+    inputs = [chunked.get("raw_file"), reassembled.get("cleaned_file")]
+    inputs += [pipeline_state.load_agent_output(run_id, name) for name in pipeline_state.AGENT_OUTPUTS]
+
+    missing = [name for name, value in zip(("raw_file", "cleaned_file") + pipeline_state.AGENT_OUTPUTS, inputs)
+               if not value]
+    if missing:
+        print(f"ERROR: Run {run_id} has no saved {', '.join(missing)}; pass all arguments instead",
+              file=sys.stderr)
+        return None
+    return inputs
+
+
+def finish_run(run_id):
+    """Assemble a run from its saved state and agent outputs.
+
+    Returns the note path, or None if the run is incomplete or assembly failed.
+    """
+    done = pipeline_state.completed_phase(pipeline_state.load_state(run_id), "assemble")
+    if done and Path(done["output_file"]).exists():
+        print(f"INFO: Resuming run {run_id}: meeting note already saved")
+        return Path(done["output_file"])
+
+    inputs = resume_inputs(run_id)
+    if not inputs:
+        return None
+    raw_file, cleaned_file, metadata_text, people_text, notes_text = inputs
+    print(f"INFO: Resuming run {run_id} from saved agent outputs")
+
+    output_path = assemble_and_save(cleaned_file, metadata_text, people_text, notes_text)
+    if not output_path:
+        return None
+
+    pipeline_state.complete_phase(run_id, "assemble", output_file=str(output_path))
+    cleanup_temp_files(raw_file, cleaned_file)
+    return output_path
+
+
+def batch_run_ids(args):
+    """Run IDs from batch files (meetings that chunked successfully) and plain IDs."""
+    run_ids = []
+    for arg in args:
+        if arg.endswith('.json') and Path(arg).is_file():
+            try:
+                batch = json.loads(Path(arg).read_text(encoding='utf-8'))
+            except Exception as e:
+                print(f"ERROR: Failed to read batch file {arg}: {e}", file=sys.stderr)
+                sys.exit(1)
+            run_ids.extend(meeting["run_id"] for meeting in batch.get("meetings", [])
+                           if meeting.get("status") == "chunked")
+        else:
+            run_ids.append(arg)
+    return list(dict.fromkeys(run_ids))
+
+
+def assemble_batch(run_ids):
+    """Finish many runs in one process. Returns 0 if all succeeded, else 1."""
+    saved = []
+    failed = []
+    for run_id in run_ids:
+        print(f"\n--- Run {run_id} ---")
+        try:
+            output_path = finish_run(run_id)
+        except Exception as e:
+            print(f"ERROR: Run {run_id} failed: {e}", file=sys.stderr)
+            output_path = None
+        if output_path:
+            saved.append(output_path)
+        else:
+            failed.append(run_id)
+
+    print("\n=== Batch Assembly Complete ===")
+    print(f"INFO: Saved {len(saved)} of {len(run_ids)} meetings")
+    for output_path in saved:
+        print(f"OUTPUT_FILE={output_path}")
+    print(f"FAILED_RUNS={','.join(failed)}")
+    return 1 if failed else 0
+
+
 def main():
     """Main entry point."""
     # Ensure configuration exists
@@ -308,45 +619,63 @@ def main():
         print("ERROR: Configuration required. Please run config setup.", file=sys.stderr)
         sys.exit(1)
 
-    if len(sys.argv) < 6:
-        print("Usage: assemble_obsidian.py <raw_file> <cleaned_file> <metadata_text> <people_text> <notes_text>", file=sys.stderr)
-        print("OR: assemble_obsidian.py <raw_file> <cleaned_file> <metadata_file> <people_file> <notes_file>", file=sys.stderr)
+    args, run_id, resume, batch = split_options(sys.argv[1:])
+    if batch:
+        if not args:
+            print("Usage: assemble_obsidian.py --batch <batch_file|run_id> [...]", file=sys.stderr)
+            sys.exit(1)
+        return assemble_batch(batch_run_ids(args))
+
+    if resume and not run_id and len(args) == 1:
+        run_id = args.pop()
+
+    if len(args) < 5 and not (resume and run_id and not args):
+        print("Usage: assemble_obsidian.py <raw_file> <cleaned_file> <metadata_text> <people_text> <notes_text> [--run-id ID]", file=sys.stderr)
+        print("OR: assemble_obsidian.py <raw_file> <cleaned_file> <metadata_file> <people_file> <notes_file> [--run-id ID]", file=sys.stderr)
+        print("OR: assemble_obsidian.py --resume <run_id>", file=sys.stderr)
+        print("OR: assemble_obsidian.py --batch <batch_file|run_id> [...]", file=sys.stderr)
         sys.exit(1)
 
-    raw_file = sys.argv[1]
-    cleaned_file = sys.argv[2]
-
-    # Determine if we're receiving text or file paths
-    metadata_input = sys.argv[3]
-    people_input = sys.argv[4]
-    notes_input = sys.argv[5]
-
+    # Resume entirely from the run's saved state and agent outputs
+    if resume and not args:
+        output_path = finish_run(run_id)
+        if not output_path:
+            sys.exit(1)
+        print("=== Assembly Complete ===")
+        print(f"OUTPUT_FILE={output_path}")
+        return 0
+
+    # A resumed run that already saved its note has nothing left to do
+    if resume:
+        done = pipeline_state.completed_phase(pipeline_state.load_state(run_id), "assemble")
+        if done and Path(done["output_file"]).exists():
+            print(f"INFO: Resuming run {run_id}: meeting note already saved")
+            print("=== Assembly Complete ===")
+            print(f"OUTPUT_FILE={done['output_file']}")
+            return 0
+
+    raw_file, cleaned_file = args[0], args[1]
     # If inputs look like file paths, read them
-    try:
-        metadata_text = read_file(metadata_input) if Path(metadata_input).exists() else metadata_input
-    except (OSError, ValueError):
-        metadata_text = metadata_input
-
-    try:
-        people_text = read_file(people_input) if Path(people_input).exists() else people_input
-    except (OSError, ValueError):
-        people_text = people_input
-
-    try:
-        notes_text = read_file(notes_input) if Path(notes_input).exists() else notes_input
-    except (OSError, ValueError):
-        notes_text = notes_input
+    metadata_text, people_text, notes_text = (read_agent_input(value) for value in args[2:5])
 
     if not all([metadata_text, people_text, notes_text]):
         print("ERROR: Failed to read agent outputs", file=sys.stderr)
         sys.exit(1)
 
+    # Keep agent outputs with the run so a failed assembly can be retried alone
+    if run_id:
+        for name, text in zip(pipeline_state.AGENT_OUTPUTS, (metadata_text, people_text, notes_text)):
+            pipeline_state.save_agent_output(run_id, name, text)
+
     # Assemble and save
     output_path = assemble_and_save(cleaned_file, metadata_text, people_text, notes_text)
 
     if not output_path:
         sys.exit(1)
 
+    if run_id:
+        pipeline_state.complete_phase(run_id, "assemble", output_file=str(output_path))
+
     # Cleanup temp files
     cleanup_temp_files(raw_file, cleaned_file)
 
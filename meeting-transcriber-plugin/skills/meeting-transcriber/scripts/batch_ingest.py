@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Headless batch ingestion of exported transcripts.
+
+Takes a directory or a glob of transcript files (text, WebVTT, SRT or
+Zoom/Teams JSON) instead of the web form, reads each meeting's date and
+time from its file name or a sidecar, and compacts, pre-cleans and chunks all of
+them in parallel with a process pool. Every
+meeting gets its own run ID, chunk manifest and task plan, exactly as if it
+had come through get_transcript.py; the batch file lists them all.
+
+Usage: batch_ingest.py <directory|glob> [--workers N]
+
+A sidecar is a JSON file next to the transcript named "<stem>.meta.json",
+e.g. {"date": "2025-03-14", "time": "10:30"}. Its values override dates
+and times found in the file name.
+"""
+
+import io
+import os
+import re
+import sys
+import glob
+import json
+import time
+from contextlib import redirect_stdout, redirect_stderr
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import chunk_transcript
+import pipeline_state
+from get_transcript import raw_file_path, cleaned_file_path
+from compact_transcript import compact_file
+from preclean_transcript import preclean_file
+from transcript_formats import convert_file, detect_format
+from workspace import create_workspace, ensure_workspace, workspace_dir
+
+
+TRANSCRIPT_SUFFIXES = ('.txt', '.md', '.vtt', '.srt', '.json')
+SIDECAR_SUFFIX = '.meta.json'
+# 2025-03-14, 20250314 or 2025_03_14, optionally followed by a time such as
+# " 1030", "_10-30" or Zoom's "-103000"
+DATE_IN_NAME = re.compile(
+    r'(?<!\d)((?:19|20)\d\d)[-_.]?(\d\d)[-_.]?(\d\d)'
+    r'(?:[ T_-]*(\d\d)[-_.:h]?(\d\d)(?:[-_.:]?\d\d)?)?(?!\d)'
+)
+KEY_VALUE = re.compile(r'^([A-Z_]+)=(.*)$')
+
+
+def batch_path(batch_id):
+    """Path of the batch file listing every meeting in a batch."""
+    return workspace_dir(batch_id) / "batch.json"
+
+
+def find_transcripts(source):
+    """Transcript files in a directory, or matching a glob, in name order."""
+    if Path(source).is_dir():
+        paths = Path(source).iterdir()
+    else:
+        paths = (Path(p) for p in glob.glob(source, recursive=True))
+    return sorted(p for p in paths
+                  if p.is_file() and p.suffix.lower() in TRANSCRIPT_SUFFIXES
+                  and not p.name.endswith(SIDECAR_SUFFIX))
+
+
+def date_time_from_name(name):
+    """(date, time) found in a file name; either may be ''."""
+    for match in DATE_IN_NAME.finditer(name):
+        year, month, day, hour, minute = match.groups()
+        try:
+            date_met = datetime(int(year), int(month), int(day)).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+        time_met = ''
+        if hour and int(hour) < 24 and int(minute) < 60:
+            time_met = f"{hour}:{minute}"
+        return date_met, time_met
+    return '', ''
+
+
+def read_sidecar(path):
+    """Values from a transcript's sidecar file, or {} if it has none."""
+    sidecar = path.with_name(path.stem + SIDECAR_SUFFIX)
+    if not sidecar.exists():
+        return {}
+    try:
+        data = json.loads(sidecar.read_text(encoding='utf-8'))
+        return data if isinstance(data, dict) else {}
+    except Exception as e:
+        print(f"WARNING: Ignoring unreadable sidecar {sidecar}: {e}", file=sys.stderr)
+        return {}
+
+
+def plan_jobs(paths, batch_id):
+    """One job per transcript: run ID, file paths, date and time."""
+    jobs = []
+    for i, path in enumerate(paths, 1):
+        run_id = f"{batch_id}-{i:03d}"
+        sidecar = read_sidecar(path)
+        date_met, time_met = date_time_from_name(path.name)
+        jobs.append({
+            "source": str(path),
+            "run_id": run_id,
+            "raw_file": str(raw_file_path(run_id)),
+            "cleaned_file": str(cleaned_file_path(run_id)),
+            "meeting_date": str(sidecar.get('date') or date_met),
+            "meeting_time": str(sidecar.get('time') or time_met),
+            "sidecar": sidecar,
+        })
+    return jobs
+
+
+def ingest_one(job):
+    """Compact (or parse), pre-clean and chunk one transcript. Runs in a worker process.
+
+    Uses chunk_transcript.py's normal entry point, so chunk files, cache
+    hits, the manifest, the task plan and the run checkpoint are exactly
+    what an interactive run produces. Its output is captured and parsed.
+    """
+    result = dict(job)
+    output = io.StringIO()
+    code = 0
+    try:
+        with redirect_stdout(output), redirect_stderr(output):
+            ensure_workspace(job["run_id"])
+            result["format"] = detect_format(job["source"])
+            # Caption and JSON exports become plain speaker turns on the way in;
+            # pasted text exports are compacted instead
+            if result["format"] == 'text':
+                compacted = compact_file(job["source"], job["raw_file"])
+                result["words_compacted"] = compacted["words_before"] - compacted["words_after"]
+            else:
+                convert_file(job["source"], job["raw_file"], result["format"])
+            words_before, words_removed = preclean_file(job["raw_file"], job["raw_file"])
+            if not words_before:
+                raise ValueError("transcript is empty")
+            result["words_before"] = words_before + result.get("words_compacted", 0)
+            result["words_removed"] = words_removed
+            code = chunk_transcript.main([job["raw_file"], job["run_id"]])
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 1
+    except Exception as e:
+        output.write(f"ERROR: {e}\n")
+        code = 1
+
+    lines = output.getvalue().splitlines()
+    values = dict(m.groups() for m in map(KEY_VALUE.match, lines) if m)
+    errors = [line for line in lines if line.startswith("ERROR:")]
+
+    result["status"] = "chunked" if code == 0 else "failed"
+    if code != 0:
+        result["error"] = errors[-1] if errors else f"exit code {code}"
+    for key in ("CHUNK_COUNT", "TASK_CALL_COUNT", "CACHE_HITS"):
+        if key in values:
+            result[key.lower()] = int(values[key])
+    for key in ("MANIFEST", "TASK_CALLS_JSON", "SPEAKER_INDEX"):
+        if key in values:
+            result[key.lower()] = values[key]
+    result["agent_outputs"] = {name: str(pipeline_state.agent_output_path(job["run_id"], name))
+                               for name in pipeline_state.AGENT_OUTPUTS}
+    return result
+
+
+def save_batch(batch_id, source, results):
+    """Write the batch file. Returns its path."""
+    path = batch_path(batch_id)
+    batch = {
+        "batch_id": str(batch_id),
+        "source": source,
+        "created": datetime.now().isoformat(timespec='seconds'),
+        "meetings": results,
+    }
+    try:
+        path.write_text(json.dumps(batch, indent=2), encoding='utf-8')
+        return str(path)
+    except Exception as e:
+        print(f"ERROR: Failed to save batch file: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def main():
+    """Ingest every transcript in a directory or glob."""
+    args = sys.argv[1:]
+    if not args or args[0].startswith('--'):
+        print("Usage: batch_ingest.py <directory|glob> [--workers N]", file=sys.stderr)
+        sys.exit(1)
+
+    source = args[0]
+    workers = os.cpu_count() or 1
+    if "--workers" in args:
+        try:
+            workers = int(args[args.index("--workers") + 1])
+            if workers <= 0:
+                raise ValueError
+        except (IndexError, ValueError):
+            print("ERROR: --workers must be a positive integer", file=sys.stderr)
+            sys.exit(1)
+
+    print("=== Meeting Transcriber: Batch Ingestion ===")
+
+    paths = find_transcripts(source)
+    if not paths:
+        print(f"ERROR: No transcripts ({', '.join(TRANSCRIPT_SUFFIXES)}) found in {source}", file=sys.stderr)
+        sys.exit(1)
+
+    batch_id = create_workspace()
+    jobs = plan_jobs(paths, batch_id)
+    print(f"INFO: Found {len(jobs)} transcripts, chunking with {min(workers, len(jobs))} workers")
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        results = list(pool.map(ingest_one, jobs))
+    elapsed = time.perf_counter() - started
+
+    for result in results:
+        name = Path(result["source"]).name
+        when = ' '.join(filter(None, (result["meeting_date"], result["meeting_time"]))) or 'no date'
+        if result["status"] == "chunked":
+            print(f"INFO: {result['run_id']}: {name} ({when}): {result.get('chunk_count', 0)} chunks, "
+                  f"{result.get('task_call_count', 0)} to clean")
+        else:
+            print(f"WARNING: {result['run_id']}: {name}: {result['error']}")
+
+    failed = [result for result in results if result["status"] != "chunked"]
+    batch_file = save_batch(batch_id, source, results)
+
+    print(f"SUCCESS: Chunked {len(results) - len(failed)} of {len(results)} transcripts in {elapsed:.1f}s")
+    print(f"BATCH_FILE={batch_file}")
+    print(f"MEETING_COUNT={len(results)}")
+    print(f"FAILED_COUNT={len(failed)}")
+    for result in results:
+        if result["status"] == "chunked":
+            print(f"RUN_ID={result['run_id']}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Check that cleaned chunks kept the original words.
+
+Aligns each raw chunk with its cleaned output in linear time, measures the
+share of words retained, detects summarisation and truncation, and lists
+the chunks that should be sent back to a cleaner. Chunks that pass are
+stored in the cleaned-chunk cache; nothing else adds to it, so a later
+run only reuses checked text. With --redispatch it also writes a task
+plan for just those chunks.
+
+Usage: check_fidelity.py <manifest_file> [--min-retained 0.85] [--redispatch]
+"""
+
+import os
+import re
+import sys
+import json
+from collections import defaultdict, deque
+from pathlib import Path
+
+import chunk_cache
+import pipeline_state
+from chunk_transcript import (
+    CLEANER_DESCRIPTION_TEMPLATE, CLEANER_PROMPT_PREFIX, CLEANER_PROMPT_TEMPLATE, CLEANER_SUBAGENT_TYPE,
+    task_param_rows
+)
+from expand_task_plan import build_task_plan
+from plan_waves import MAX_CONCURRENCY, critical_path_seconds, plan_waves
+from preclean_transcript import FILLER_WORDS
+from reassemble_chunks import extract_cleaned_content, read_chunk_file
+from workspace import workspace_dir
+
+
+WORD = re.compile(r"[^\W_]+(?:['’][^\W_]+)*")
+# Words the cleaner is told to drop; they do not count against retention
+REMOVABLE_WORDS = {w for words in FILLER_WORDS.values() for w in words} | {"like"}
+
+MIN_RETAINED = 0.85  # Token matches allow for spelling and grammar fixes
+MIN_TAIL_COVERAGE = 0.5  # Below this the end of the chunk is treated as cut off
+TAIL_FRACTION = 0.2  # Last 20% of the raw chunk is checked for truncation
+SUMMARY_LENGTH_RATIO = 0.7  # Cleaned/raw length below this with low retention = summarised
+MATCH_WINDOW = 40  # How far ahead in the raw chunk a cleaned word may match
+
+
+def tokens(text):
+    """Lower-cased word tokens of a text."""
+    return [word.lower() for word in WORD.findall(text)]
+
+
+def align(raw_tokens, cleaned_tokens, window=MATCH_WINDOW):
+    """Greedy monotonic alignment of cleaned tokens onto raw tokens.
+
+    Each cleaned token matches the next occurrence of the same word at most
+    `window` raw tokens past the last match. Every raw position is visited
+    at most once, so this is linear in the length of both inputs.
+    Returns a list of flags, one per raw token, marking matched positions.
+    """
+    positions = defaultdict(deque)
+    for i, token in enumerate(raw_tokens):
+        positions[token].append(i)
+
+    matched = [False] * len(raw_tokens)
+    cursor = 0
+    for token in cleaned_tokens:
+        candidates = positions.get(token)
+        if not candidates:
+            continue
+        while candidates and candidates[0] < cursor:
+            candidates.popleft()
+        if candidates and candidates[0] - cursor <= window:
+            matched[candidates[0]] = True
+            cursor = candidates.popleft() + 1
+
+    return matched
+
+
+def score_chunk(raw_text, cleaned_text, min_retained=MIN_RETAINED):
+    """Retention metrics and verdict for one cleaned chunk."""
+    raw_tokens = tokens(raw_text)
+    cleaned_tokens = tokens(cleaned_text)
+    matched = align(raw_tokens, cleaned_tokens)
+
+    # Only count words the cleaner was expected to keep
+    expected = [i for i, token in enumerate(raw_tokens) if token not in REMOVABLE_WORDS]
+    kept = sum(matched[i] for i in expected)
+    retained = kept / len(expected) if expected else 1.0
+
+    split = int(len(expected) * (1 - TAIL_FRACTION))
+    head, tail = expected[:split], expected[split:]
+    head_coverage = sum(matched[i] for i in head) / len(head) if head else 1.0
+    tail_coverage = sum(matched[i] for i in tail) / len(tail) if tail else 1.0
+    length_ratio = len(cleaned_tokens) / len(raw_tokens) if raw_tokens else 1.0
+
+    # Truncation loses the end while the start is intact; summaries thin out evenly
+    if tail_coverage < MIN_TAIL_COVERAGE and tail_coverage < head_coverage / 2:
+        verdict = "truncated"
+    elif retained < min_retained and length_ratio < SUMMARY_LENGTH_RATIO:
+        verdict = "summarised"
+    elif retained < min_retained:
+        verdict = "rewritten"
+    else:
+        verdict = "ok"
+
+    return {
+        "raw_words": len(raw_tokens),
+        "cleaned_words": len(cleaned_tokens),
+        "retained": round(retained, 3),
+        "tail_coverage": round(tail_coverage, 3),
+        "length_ratio": round(length_ratio, 3),
+        "verdict": verdict,
+    }
+
+
+def check_chunk(chunk, min_retained=MIN_RETAINED):
+    """Score one manifest chunk. Returns a result dict with a verdict.
+
+    Cache hits (no output file) are scored from their cache entry like any
+    other output, and an entry that fails is evicted so the chunk is
+    cleaned again. Output that passes is stored in the cleaned-chunk cache
+    under the raw chunk's key.
+    """
+    result = {"chunk_num": chunk["chunk_num"]}
+    output_path = Path(chunk["output_path"])
+    key = chunk.get("cache_key")
+
+    if output_path.exists():
+        cleaned_text = extract_cleaned_content(read_chunk_file(output_path) or "")
+    elif chunk.get("cached") and chunk_cache.contains(key):
+        result["cached"] = True
+        cleaned_text = chunk_cache.lookup(key) or ""
+    else:
+        result["verdict"] = "missing"
+        return result
+
+    raw_text = read_chunk_file(chunk["input_path"]) or ""
+    if cleaned_text == raw_text.strip():
+        # A raw chunk copied in as a fallback for a failed agent
+        result["verdict"] = "not_cleaned"
+    else:
+        result.update(score_chunk(raw_text, cleaned_text, min_retained))
+
+    if result["verdict"] != "ok":
+        if result.get("cached"):
+            chunk_cache.discard(key)
+    elif key and not result.get("cached"):
+        chunk_cache.store(key, cleaned_text)
+    return result
+
+
+def print_result(result):
+    """One INFO/WARNING line per chunk."""
+    num = f"{result['chunk_num']:03d}"
+    if "retained" not in result:
+        print(f"INFO: Chunk {num}: {result['verdict']}")
+        return
+    prefix = "INFO" if result["verdict"] == "ok" else "WARNING"
+    source = " (cached)" if result.get("cached") else ""
+    print(f"{prefix}: Chunk {num}{source}: retained {result['retained']:.1%}, "
+          f"tail {result['tail_coverage']:.1%}, "
+          f"{result['raw_words']} -> {result['cleaned_words']} words - {result['verdict']}")
+
+
+def redispatch_path(timestamp):
+    """Path of the task plan for re-cleaning failed chunks."""
+    return workspace_dir(timestamp) / "task-calls-redispatch.json"
+
+
+def save_redispatch_plan(manifest, failed_nums):
+    """Write a task plan for the failed chunks and move their bad outputs aside."""
+    chunks = [chunk for chunk in manifest["chunks"] if chunk["chunk_num"] in failed_nums]
+    for chunk in chunks:
+        output_path = Path(chunk["output_path"])
+        if output_path.exists():
+            os.replace(output_path, output_path.with_name(output_path.name + ".rejected"))
+
+    chunk_words = {chunk["chunk_num"]: chunk["word_count"] for chunk in chunks}
+    waves = plan_waves(chunk_words, MAX_CONCURRENCY)
+    launch_order = [num for wave in waves for num in wave]
+    plan = build_task_plan(
+        CLEANER_SUBAGENT_TYPE,
+        CLEANER_DESCRIPTION_TEMPLATE,
+        CLEANER_PROMPT_TEMPLATE,
+        task_param_rows(chunks, launch_order),
+        prompt_prefix=CLEANER_PROMPT_PREFIX,
+        waves=[[f"{num:03d}" for num in wave] for wave in waves],
+        max_concurrency=MAX_CONCURRENCY,
+        critical_path_seconds=round(critical_path_seconds(waves, chunk_words)),
+    )
+
+    path = redispatch_path(manifest["timestamp"])
+    path.write_text(json.dumps(plan, indent=2), encoding='utf-8')
+    return str(path)
+
+
+def main():
+    """Check every chunk in a manifest and list the ones to re-clean."""
+    if len(sys.argv) < 2:
+        print("Usage: check_fidelity.py <manifest_file> [--min-retained 0.85] [--redispatch]", file=sys.stderr)
+        sys.exit(1)
+
+    min_retained = MIN_RETAINED
+    if "--min-retained" in sys.argv:
+        try:
+            min_retained = float(sys.argv[sys.argv.index("--min-retained") + 1])
+        except (IndexError, ValueError):
+            print("ERROR: --min-retained requires a number between 0 and 1", file=sys.stderr)
+            sys.exit(1)
+
+    try:
+        manifest = json.loads(Path(sys.argv[1]).read_text(encoding='utf-8'))
+    except Exception as e:
+        print(f"ERROR: Failed to read manifest: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print("=== Meeting Transcriber: Checking Cleaning Fidelity ===")
+
+    chunks = sorted(manifest["chunks"], key=lambda chunk: chunk["chunk_num"])
+    results = [check_chunk(chunk, min_retained) for chunk in chunks]
+    for result in results:
+        print_result(result)
+
+    failed = [r["chunk_num"] for r in results if r["verdict"] != "ok"]
+    scored = [r for r in results if "retained" in r]
+    if scored:
+        kept = sum(r["retained"] * r["raw_words"] for r in scored)
+        total = sum(r["raw_words"] for r in scored) or 1
+        print(f"INFO: Overall retained: {kept / total:.1%} across {len(scored)} chunks")
+
+    evicted = chunk_cache.enforce_limit()
+    if evicted:
+        print(f"INFO: Evicted {evicted} old entries from the chunk cache")
+
+    pipeline_state.record_chunks(manifest["timestamp"], {
+        r["chunk_num"]: r["verdict"] if r["verdict"] != "ok" else "cached" if r.get("cached") else "cleaned"
+        for r in results
+    })
+
+    # Reassembly keeps the chunk files until this has passed
+    if failed:
+        pipeline_state.reset_phase(manifest["timestamp"], pipeline_state.FIDELITY_PHASE)
+    else:
+        pipeline_state.complete_phase(manifest["timestamp"], pipeline_state.FIDELITY_PHASE,
+                                      checked_chunks=len(results))
+
+    print(f"CHECKED_CHUNKS={len(results)}")
+    print(f"FAILED_CHUNK_COUNT={len(failed)}")
+    print(f"FAILED_CHUNKS={','.join(f'{num:03d}' for num in failed)}")
+
+    if failed and "--redispatch" in sys.argv:
+        print(f"REDISPATCH_JSON={save_redispatch_plan(manifest, set(failed))}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of cleaned transcript chunks.
+
+Entries are keyed by the hash of the raw chunk text plus the cleaner prompt
+version, so rerunning a meeting with unchanged chunks and an unchanged
+prompt reuses earlier cleaning instead of launching agents again. The cache
+is bounded in size and evicts least recently used entries first.
+"""
+
+import os
+import sys
+import hashlib
+from pathlib import Path
+
+from config import CACHE_DIR
+
+
+CHUNK_CACHE_DIR = CACHE_DIR / "cleaned-chunks"
+MAX_CACHE_BYTES = 200 * 1024 * 1024  # 200 MB of cleaned text
+
+
+def cache_key(chunk_text, prompt_version):
+    """Content address for a chunk cleaned with a given prompt version."""
+    digest = hashlib.sha256()
+    digest.update(prompt_version.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(chunk_text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def entry_path(key):
+    """Path of the cache entry for a key."""
+    return CHUNK_CACHE_DIR / f"{key}.md"
+
+
+def lookup(key):
+    """Return the cached cleaned text for a key, or None on a miss.
+
+    A hit refreshes the entry's mtime, which is the LRU clock.
+    """
+    path = entry_path(key)
+    try:
+        text = path.read_text(encoding='utf-8')
+        os.utime(path)
+        return text
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"WARNING: Failed to read cache entry {path}: {e}", file=sys.stderr)
+        return None
+
+
+def contains(key):
+    """Check for a cache entry without reading it (refreshes its LRU age)."""
+    path = entry_path(key)
+    try:
+        os.utime(path)
+        return True
+    except OSError:
+        return False
+
+
+def store(key, cleaned_text):
+    """Write a cleaned chunk to the cache atomically. Returns True on success."""
+    path = entry_path(key)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        CHUNK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(cleaned_text, encoding='utf-8')
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        print(f"WARNING: Failed to write cache entry {path}: {e}", file=sys.stderr)
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def discard(key):
+    """Remove a cache entry, e.g. one that failed a fidelity check. Returns True if it existed."""
+    try:
+        entry_path(key).unlink()
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def enforce_limit(max_bytes=MAX_CACHE_BYTES):
+    """Evict least recently used entries until the cache fits in max_bytes.
+
+    Returns the number of entries evicted.
+    """
+    try:
+        entries = []
+        total = 0
+        with os.scandir(CHUNK_CACHE_DIR) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith('.md'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+    except FileNotFoundError:
+        return 0
+
+    evicted = 0
+    if total > max_bytes:
+        entries.sort()
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+                evicted += 1
+            except OSError:
+                pass
+
+    return evicted
@@ -2,43 +2,185 @@
 """
 Chunk large transcripts into ~500 word sections at logical boundaries.
 This allows processing long transcripts without agent timeouts.
+
+The transcript is streamed from disk and each chunk is written as soon as
+it is full, so very large recordings chunk in bounded memory.
 """
 
 import sys
 import re
 import json
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
 from pathlib import Path
 
+import chunk_cache
+from plan_waves import MAX_CONCURRENCY, plan_waves, critical_path_seconds, print_plan
+from expand_task_plan import build_task_plan, expand_task_plan, prompt_prefix_record, verify_prompt_prefixes
+from speaker_index import SpeakerIndex, index_path
+from transcript_formats import convert_file, detect_format
+import pipeline_state
+from workspace import chunk_dir, ensure_workspace, workspace_dir
+
 
 CHUNK_SIZE = 500  # Target words per chunk
 MIN_CHUNK_SIZE = 300  # Minimum words to avoid tiny chunks
+MAX_CHUNK_WORDS = 1000  # Hard ceiling so no single agent call can time out
+TOKEN_BUDGET = 1000  # Target tokens per chunk in token packing mode
+BUDGET_PIECES = 8  # Token mode splits long segments to ~1/8 of the budget
+
+# Verification token embedded in every cleaner prompt. Cleaned chunks are
+# cached per prompt version, so bump this whenever the prompt changes.
+CLEANER_PROMPT_VERSION = "TRANSCRIPT_CLEANER_V1.0.18"
+CLEANER_SUBAGENT_TYPE = "general-purpose"
+CLEANER_DESCRIPTION_TEMPLATE = "Clean transcript chunk {chunk_num}"
+
+# The full prompt template with verification token. Everything before the
+# CHUNK PARAMETERS block is identical for every chunk, so parallel cleaner
+# calls share one byte-identical prefix and hit the provider's prompt cache;
+# only the trailing parameters differ. Placeholders are filled per chunk
+# with str.format, so literal braces must be doubled.
+CLEANER_PROMPT_TEMPLATE = f"""[VERIFICATION:{CLEANER_PROMPT_VERSION}]
+
+Clean this transcript chunk. Follow these steps exactly. INPUT_FILE and OUTPUT_FILE are listed under CHUNK PARAMETERS at the end of this prompt.
+
+STEP 1: Use Read tool to read the input file:
+- file_path: INPUT_FILE
+
+STEP 2: Clean the transcript by removing ONLY filler words:
+- Remove: "um", "uh", "like" (when filler), "you know", "sort of", "kind of"
+- Fix spelling/grammar errors
+- Add punctuation where missing
+- Keep speaker labels consistent
+- DO NOT rewrite sentences or summarize
+- Preserve 95-100% of original word count
+
+STEP 3: Use Write tool to save the cleaned transcript:
+- file_path: OUTPUT_FILE
+- content: [your cleaned transcript]
+
+STEP 4: Count words and output verification block:
+=== TRANSCRIPT-CLEANER VERIFICATION ===
+OUTPUT_FILE_WRITTEN: YES
+OUTPUT_FILE_PATH: [OUTPUT_FILE]
+INPUT_WORD_COUNT: [original word count]
+OUTPUT_WORD_COUNT: [cleaned word count]
+REDUCTION_PERCENT: [percentage]%
+STATUS: SUCCESS
+=== END VERIFICATION ===
 
+CRITICAL: You MUST use Read and Write tools. If you just describe what you would do, you have FAILED.
+
+CHUNK PARAMETERS:
+- INPUT_FILE: {{input_path}}
+- OUTPUT_FILE: {{output_path}}"""
+# Stored in every task JSON; expanded prompts are checked against it
+CLEANER_PROMPT_PREFIX = prompt_prefix_record(CLEANER_PROMPT_TEMPLATE, CLEANER_PROMPT_VERSION)
+
+
+# A speaker label opens a line: up to four capitalised name words (plus
+# particles such as "van" or "de") and a colon followed by whitespace, after
+# an optional "[00:01:23]" turn time. "10:30", "https://" and prose such as
+# "The meeting at 10:30" never match, nor do headings like "Note:" or "Agenda:".
+# After a turn time the name may be any label transcript_formats.speaker_label
+# writes for a converted export: "jsmith", "Jane Doe (Guest)", non-Latin or
+# longer names.
+UPPER = "A-ZÀ-ÖØ-Þ"
+SPEAKER_NAME = (rf"[{UPPER}][\w.'’-]*"
+                rf"(?: (?:[{UPPER}0-9][\w.'’-]*|van|von|de|da|del|der|di|du|la|le|bin|al)){{0,3}}")
+NOT_SPEAKER = (r"(?i:notes?|agenda|summary|action items?|next steps|decisions?|questions?|answers?"
+               r"|updates?|todo|reminders?|topics?|subject|re|fyi|examples?|important|warning"
+               r"|attendees|participants|date|time|location|title)")
+PARSED_NAME = r"[^\W\d_][^:\n]{0,63}"
+TURN_TIME = r"\[(?:\d+:)?\d{1,2}:\d{2}\]"
+LABEL_SOURCE = (rf"(?:{TURN_TIME} (?={PARSED_NAME}:(?:\s|$))|(?={SPEAKER_NAME}:(?:\s|$)))"
+                rf"(?!{NOT_SPEAKER}:)(?P<speaker>[^:\n]+?):(?=\s|$)")
+UNNAMED_LABEL = LABEL_SOURCE.replace('(?P<speaker>', '(?:')
+
+# Precompiled once; these run against every line of very large transcripts
+SPEAKER_LABEL = re.compile(LABEL_SOURCE)
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+SPEAKER_SPLIT = re.compile(rf'(\n{UNNAMED_LABEL})')
+SPEAKER_TURN = re.compile(rf'\n(?={UNNAMED_LABEL})')
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+TOKEN_PIECE = re.compile(r'[^\W\d_]+|\d+|[^\w\s]')
+
+# Fallback order for oversized segments, with the separator used to rejoin
+# pieces that are regrouped at that level. After the last level the
+# segment is cut at a hard word limit.
+SPLIT_LEVELS = (
+    (PARAGRAPH_BREAK, '\n\n'),
+    (SPEAKER_TURN, '\n'),
+    (SENTENCE_END, ' '),
+)
+
+
+def iter_segments(raw_file, on_line=None, target_words=CHUNK_SIZE):
+    """Stream (segment, word_count) pairs from the transcript file.
+
+    Reads line by line so only the current segment is held in memory. A
+    segment ends at a blank line, before every line that opens with a
+    speaker label, and before a line that would take it past target_words,
+    so a caption dump with no blank lines or labels is flushed every
+    chunk's worth of words instead of being buffered whole. (A single line
+    is still read in one piece; split_segment cuts it if it is oversized.) If on_line is given it is
+    called with (byte_offset, line) for every line read.
+    """
+    lines = []
+    words = 0
+    offset = 0
 
-def read_transcript(raw_file):
-    """Read the raw transcript file."""
     try:
-        return Path(raw_file).read_text(encoding='utf-8')
+        with open(raw_file, 'rb') as f:
+            for raw_line in f:
+                line = raw_line.decode('utf-8')
+                if on_line:
+                    on_line(offset, line)
+                offset += len(raw_line)
+
+                line_words = len(line.split())
+                if not line_words:
+                    if lines:
+                        yield build_segment(lines, words)
+                        lines = []
+                        words = 0
+                    continue
+
+                if lines and (words + line_words > target_words or SPEAKER_LABEL.match(line.lstrip())):
+                    yield build_segment(lines, words)
+                    lines = []
+                    words = 0
+
+                lines.append(line)
+                words += line_words
     except Exception as e:
         print(f"ERROR: Failed to read transcript: {e}", file=sys.stderr)
         sys.exit(1)
 
+    if lines:
+        yield build_segment(lines, words)
+
+
+def build_segment(lines, word_count):
+    """Join buffered lines into a segment; its words were counted line by line."""
+    return ''.join(lines).strip(), word_count
+
 
 def find_logical_breaks(text):
     """Find logical break points in the text (paragraphs, speaker changes)."""
     # Split by double newlines (paragraph breaks)
-    paragraphs = re.split(r'\n\s*\n', text)
+    paragraphs = PARAGRAPH_BREAK.split(text)
 
     # Further split by speaker labels if present (e.g., "John:", "Speaker 1:", etc.)
     segments = []
     for para in paragraphs:
         # Check if paragraph has speaker labels
-        speaker_pattern = r'^([A-Z][^:\n]{0,30}:)'
-        if re.match(speaker_pattern, para.strip(), re.MULTILINE):
+        if SPEAKER_LABEL.match(para.strip()):
             # Split on speaker labels
-            parts = re.split(r'(\n[A-Z][^:\n]{0,30}:)', para)
+            parts = SPEAKER_SPLIT.split(para)
             current = ""
             for part in parts:
-                if re.match(speaker_pattern, part.strip()):
+                if SPEAKER_LABEL.match(part.strip()):
                     if current:
                         segments.append(current.strip())
                     current = part
@@ -52,20 +194,77 @@ def find_logical_breaks(text):
     return [s for s in segments if s]  # Remove empty segments
 
 
-def create_chunks(segments, chunk_size=CHUNK_SIZE, min_size=MIN_CHUNK_SIZE):
-    """Group segments into chunks of approximately chunk_size words."""
-    chunks = []
+def split_segment(segment, word_count, max_words=MAX_CHUNK_WORDS,
+                  target_words=CHUNK_SIZE, level=0):
+    """Yield (piece, word_count) pieces of a segment, none over max_words.
+
+    Splits on paragraphs first, then speaker turns, then sentences, and
+    only cuts at a hard word limit when none of those boundaries exist
+    (e.g. auto-caption dumps with no punctuation). Adjacent small pieces
+    are regrouped up to target_words so splitting does not produce
+    needlessly tiny chunks.
+    """
+    if word_count <= max_words:
+        yield segment, word_count
+        return
+
+    if level >= len(SPLIT_LEVELS):
+        words = segment.split()
+        limit = min(max_words, target_words)
+        for start in range(0, len(words), limit):
+            piece = words[start:start + limit]
+            yield ' '.join(piece), len(piece)
+        return
+
+    pattern, separator = SPLIT_LEVELS[level]
+    pieces = [p.strip() for p in pattern.split(segment) if p.strip()]
+    if len(pieces) <= 1:
+        yield from split_segment(segment, word_count, max_words, target_words, level + 1)
+        return
+
+    group = []
+    group_words = 0
+    for piece in pieces:
+        piece_words = len(piece.split())
+
+        if group and group_words + piece_words > target_words:
+            yield separator.join(group), group_words
+            group = []
+            group_words = 0
+
+        if piece_words > max_words:
+            yield from split_segment(piece, piece_words, max_words, target_words, level + 1)
+            continue
+
+        group.append(piece)
+        group_words += piece_words
+
+    if group:
+        yield separator.join(group), group_words
+
+
+def pack_segments(counted_segments, chunk_size=CHUNK_SIZE, min_size=MIN_CHUNK_SIZE,
+                  max_words=MAX_CHUNK_WORDS):
+    """Group (segment, word_count) pairs into chunks of ~chunk_size words.
+
+    Yields (segments, word_count) for each chunk as soon as it is complete,
+    so callers can write chunks out without holding the whole transcript.
+    Oversized segments are split first, so no chunk exceeds max_words.
+    """
     current_chunk = []
     current_word_count = 0
 
-    for segment in segments:
-        segment_words = len(segment.split())
-
+    for segment, segment_words in split_segments(counted_segments, max_words, chunk_size):
+        # Never let a chunk grow past the hard ceiling, even if it is small
+        if current_word_count > 0 and current_word_count + segment_words > max_words:
+            yield current_chunk, current_word_count
+            current_chunk = [segment]
+            current_word_count = segment_words
         # If adding this segment would exceed chunk_size significantly
-        if current_word_count > 0 and current_word_count + segment_words > chunk_size * 1.5:
+        elif current_word_count > 0 and current_word_count + segment_words > chunk_size * 1.5:
             # Save current chunk if it meets minimum size
             if current_word_count >= min_size:
-                chunks.append('\n\n'.join(current_chunk))
+                yield current_chunk, current_word_count
                 current_chunk = [segment]
                 current_word_count = segment_words
             else:
@@ -78,96 +277,335 @@ def create_chunks(segments, chunk_size=CHUNK_SIZE, min_size=MIN_CHUNK_SIZE):
 
         # If we've reached a good chunk size, save it
         if current_word_count >= chunk_size:
-            chunks.append('\n\n'.join(current_chunk))
+            yield current_chunk, current_word_count
             current_chunk = []
             current_word_count = 0
 
     # Add remaining content
     if current_chunk:
-        chunks.append('\n\n'.join(current_chunk))
+        yield current_chunk, current_word_count
+
+
+def estimate_tokens(text):
+    """Estimate the LLM token count of text without a tokenizer.
+
+    Approximates BPE behaviour: common words are one token, long words
+    cost one token per ~8 letters, numbers one per 3 digits, and each
+    punctuation mark is its own token. Typical English transcripts land
+    within ~10% of real tokenizer counts (~1.3 tokens per word).
+    """
+    tokens = 0
+    for piece in TOKEN_PIECE.findall(text):
+        first = piece[0]
+        if first.isdigit():
+            tokens += (len(piece) + 2) // 3
+        elif first.isalpha():
+            tokens += (len(piece) + 7) // 8
+        else:
+            tokens += 1
+    return tokens
+
+
+def greedy_chunk_count(token_sums, word_sums, cap, max_words):
+    """Fewest chunks whose tokens fit in cap and words in max_words.
+
+    token_sums and word_sums are prefix sums over the segments. Filling
+    each chunk as far as it goes is optimal for contiguous chunks; a single
+    segment over the limits is a chunk of its own.
+    """
+    count = 0
+    start = 0
+    n = len(token_sums) - 1
+    while start < n:
+        start = chunk_reach(token_sums, word_sums, start, cap, max_words)
+        count += 1
+    return count
+
+
+def chunk_reach(token_sums, word_sums, start, cap, max_words):
+    """Index one past the last segment a chunk starting at start can hold."""
+    by_tokens = bisect_right(token_sums, token_sums[start] + cap) - 1
+    by_words = bisect_right(word_sums, word_sums[start] + max_words) - 1
+    return max(start + 1, min(by_tokens, by_words))
+
+
+def plan_token_chunks(segment_sizes, token_budget=TOKEN_BUDGET, max_words=MAX_CHUNK_WORDS):
+    """Choose balanced chunk boundaries for (token_count, word_count) sizes.
+
+    Returns the indices of the segments that start a new chunk (excluding
+    the first). The chunk count is the minimum the budget allows. A binary
+    search then finds the smallest per-chunk token cap that still fits
+    that many chunks, and each cut is placed at the segment boundary
+    closest to an even share of the remaining tokens, within the range
+    that keeps every chunk under the cap and leaves the rest packable.
+    This gives near-equal chunks instead of full-full-full-tiny. A chunk
+    only exceeds the budget when a single segment does.
+    """
+    token_sums = [0, *accumulate(tokens for tokens, _ in segment_sizes)]
+    word_sums = [0, *accumulate(words for _, words in segment_sizes)]
+    n = len(segment_sizes)
+    chunk_count = greedy_chunk_count(token_sums, word_sums, token_budget, max_words)
+    if chunk_count <= 1:
+        return []
+
+    low, high = 1, token_budget
+    while low < high:
+        middle = (low + high) // 2
+        if greedy_chunk_count(token_sums, word_sums, middle, max_words) <= chunk_count:
+            high = middle
+        else:
+            low = middle + 1
+    cap = low
+
+    # earliest[r]: first segment from which the rest fits in r chunks under
+    # the cap, from packing greedily backwards from the end
+    earliest = [n]
+    end = n
+    while end > 0:
+        start = end - 1
+        while (start > 0 and token_sums[end] - token_sums[start - 1] <= cap
+               and word_sums[end] - word_sums[start - 1] <= max_words):
+            start -= 1
+        earliest.append(start)
+        end = start
+
+    boundaries = []
+    start = 0
+    for chunks_left in range(chunk_count, 1, -1):
+        lowest = max(start + 1, earliest[chunks_left - 1])
+        highest = min(chunk_reach(token_sums, word_sums, start, cap, max_words), n - chunks_left + 1)
+        goal = token_sums[start] + (token_sums[n] - token_sums[start]) / chunks_left
+        cut = min(max(bisect_left(token_sums, goal, lowest, highest + 1), lowest), highest)
+        if cut > lowest and goal - token_sums[cut - 1] < token_sums[cut] - goal:
+            cut -= 1
+        boundaries.append(cut)
+        start = cut
+
+    return boundaries
+
+
+def pack_to_budget(segment_source, token_budget=TOKEN_BUDGET, max_words=MAX_CHUNK_WORDS):
+    """Pack segments into balanced chunks of about token_budget tokens.
+
+    segment_source is called twice and must return a fresh iterator of
+    (segment, word_count) pairs each time: the first pass only records
+    sizes to plan the boundaries, the second yields (segments, word_count)
+    chunks in the same streaming shape as pack_segments.
+    """
+    sizes = [(estimate_tokens(segment), words) for segment, words in segment_source()]
+    boundaries = iter(plan_token_chunks(sizes, token_budget, max_words))
+    next_boundary = next(boundaries, None)
+
+    current_chunk = []
+    current_word_count = 0
+    for i, (segment, words) in enumerate(segment_source()):
+        if i == next_boundary:
+            yield current_chunk, current_word_count
+            current_chunk = []
+            current_word_count = 0
+            next_boundary = next(boundaries, None)
+        current_chunk.append(segment)
+        current_word_count += words
+
+    if current_chunk:
+        yield current_chunk, current_word_count
+
+
+def split_segments(counted_segments, max_words=MAX_CHUNK_WORDS, target_words=CHUNK_SIZE):
+    """Apply split_segment to a stream of (segment, word_count) pairs."""
+    for segment, word_count in counted_segments:
+        yield from split_segment(segment, word_count, max_words, target_words)
+
+
+def create_chunks(segments, chunk_size=CHUNK_SIZE, min_size=MIN_CHUNK_SIZE,
+                  max_words=MAX_CHUNK_WORDS):
+    """Group segments into chunks of approximately chunk_size words."""
+    counted = ((segment, len(segment.split())) for segment in segments)
+    chunks = pack_segments(counted, chunk_size, min_size, max_words)
+    return ['\n\n'.join(chunk) for chunk, _ in chunks]
+
+
+def chunk_path(timestamp, chunk_num):
+    """Path of the raw chunk file for a chunk number."""
+    return chunk_dir(timestamp) / f"chunk-{chunk_num:03d}.md"
+
 
-    return chunks
+def cleaned_chunk_path(timestamp, chunk_num):
+    """Path the transcript-cleaner agent writes a chunk's cleaned text to."""
+    return chunk_dir(timestamp) / f"chunk-cleaned-{chunk_num:03d}.md"
 
 
-def save_chunks(chunks, timestamp):
-    """Save chunks to individual temp files."""
-    chunk_files = []
+def stream_chunks(raw_file, timestamp, chunk_size=CHUNK_SIZE, min_size=MIN_CHUNK_SIZE,
+                  max_words=MAX_CHUNK_WORDS, token_budget=None, speaker_index=None):
+    """Chunk the transcript in a single pass, writing each chunk when it fills.
 
-    for i, chunk in enumerate(chunks, 1):
-        chunk_file = Path(f"/tmp/meeting-chunk-{timestamp}-{i:03d}.md")
+    Returns (chunks, total_words, segment_count), where chunks is a list of
+    dicts with chunk_num, input_path, output_path, word_count and cache_key.
+    Peak memory stays around one chunk regardless of transcript size.
+    With token_budget set, chunks are packed to a balanced token budget
+    instead; this reads the file twice but still holds only one chunk.
+    If a SpeakerIndex is given, it is fed every line on the final pass.
+    """
+    stats = {'words': 0, 'segments': 0, 'passes': 0}
+    passes = 2 if token_budget else 1
+    # Split pieces to a fraction of the budget so there are boundaries to balance
+    target_words = (max(1, min(chunk_size, token_budget // BUDGET_PIECES)) if token_budget
+                    else chunk_size)
+
+    def counted_segments():
+        stats['words'] = 0
+        stats['segments'] = 0
+        stats['passes'] += 1
+        on_line = speaker_index.add_line if speaker_index and stats['passes'] == passes else None
+        for segment, word_count in iter_segments(raw_file, on_line, target_words):
+            stats['words'] += word_count
+            stats['segments'] += 1
+            yield segment, word_count
+
+    chunk_records = []
+
+    if token_budget:
+        chunks = pack_to_budget(
+            lambda: split_segments(counted_segments(), max_words, target_words),
+            token_budget, max_words)
+    else:
+        chunks = pack_segments(counted_segments(), chunk_size, min_size, max_words)
+    for i, (chunk, word_count) in enumerate(chunks, 1):
+        chunk_file = chunk_path(timestamp, i)
+        chunk_text = '\n\n'.join(chunk)
         try:
-            chunk_file.write_text(chunk, encoding='utf-8')
-            chunk_files.append(str(chunk_file))
+            chunk_file.write_text(chunk_text, encoding='utf-8')
         except Exception as e:
             print(f"ERROR: Failed to save chunk {i}: {e}", file=sys.stderr)
             sys.exit(1)
 
-    return chunk_files
+        print(f"INFO: Chunk {i}: {word_count} words")
+        chunk_records.append({
+            "chunk_num": i,
+            "input_path": str(chunk_file),
+            "output_path": str(cleaned_chunk_path(timestamp, i)),
+            "word_count": word_count,
+            "cache_key": chunk_cache.cache_key(chunk_text, CLEANER_PROMPT_VERSION),
+        })
+
+    return chunk_records, stats['words'], stats['segments']
+
+
+def manifest_path(timestamp):
+    """Path of the chunk manifest for a run."""
+    return workspace_dir(timestamp) / "manifest.json"
+
+
+def save_manifest(chunks, timestamp, raw_file, total_words, cached=()):
+    """Write the chunk manifest read by reassemble_chunks.py --manifest.
+
+    Lists every chunk's number, input path, expected output path and input
+    word count, so reassembly can find outputs on disk without the chunk
+    text ever passing through the command line.
+    """
+    manifest = {
+        "timestamp": str(timestamp),
+        "raw_file": str(raw_file),
+        "total_words": total_words,
+        "cleaner_version": CLEANER_PROMPT_VERSION,
+        "chunks": [{
+            "chunk_num": chunk['chunk_num'],
+            "input_path": chunk['input_path'],
+            "output_path": chunk['output_path'],
+            "word_count": chunk['word_count'],
+            "cache_key": chunk['cache_key'],
+            "cached": chunk['chunk_num'] in cached,
+        } for chunk in chunks],
+    }
+
+    path = manifest_path(timestamp)
+    try:
+        path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+        return str(path)
+    except Exception as e:
+        print(f"ERROR: Failed to save chunk manifest: {e}", file=sys.stderr)
+        sys.exit(1)
 
 
-def generate_task_tool_calls(num_chunks, timestamp):
-    """Generate pre-configured Task tool call JSON for all chunks.
+def task_param_rows(chunks, chunk_nums):
+    """Parameter table rows (chunk_num, input_path, output_path, word_count)."""
+    by_num = {chunk['chunk_num']: chunk for chunk in chunks}
+    return [(f"{num:03d}", by_num[num]['input_path'], by_num[num]['output_path'],
+             by_num[num]['word_count']) for num in chunk_nums]
+
+
+def generate_task_tool_calls(chunk_nums, timestamp):
+    """Generate pre-configured Task tool call JSON for the given chunks.
 
     This eliminates the need for the orchestrating agent to create prompts,
     which has been unreliable across multiple versions.
     """
     task_calls = []
 
-    for i in range(1, num_chunks + 1):
-        chunk_num = f"{i:03d}"
-        input_path = f"/tmp/meeting-chunk-{timestamp}-{chunk_num}.md"
-        output_path = f"/tmp/meeting-chunk-cleaned-{timestamp}-{chunk_num}.md"
+    for i in chunk_nums:
+        params = {
+            "chunk_num": f"{i:03d}",
+            "input_path": chunk_path(timestamp, i),
+            "output_path": cleaned_chunk_path(timestamp, i),
+        }
+        task_calls.append({
+            "subagent_type": CLEANER_SUBAGENT_TYPE,
+            "description": CLEANER_DESCRIPTION_TEMPLATE.format(**params),
+            "prompt": CLEANER_PROMPT_TEMPLATE.format(**params),
+        })
 
-        # The full prompt template with verification token
-        prompt = f"""[VERIFICATION:TRANSCRIPT_CLEANER_V1.0.16]
+    return task_calls
 
-Clean this transcript chunk. Follow these steps exactly:
 
-STEP 1: Use Read tool to read the input file:
-- file_path: {input_path}
+def save_task_calls_json(task_calls, timestamp, waves=None, chunk_words=None,
+                         max_concurrency=MAX_CONCURRENCY):
+    """Save the pre-generated Task tool calls to a JSON file (full format).
 
-STEP 2: Clean the transcript by removing ONLY filler words:
-- Remove: "um", "uh", "like" (when filler), "you know", "sort of", "kind of"
-- Fix spelling/grammar errors
-- Add punctuation where missing
-- Keep speaker labels consistent
-- DO NOT rewrite sentences or summarize
-- Preserve 95-100% of original word count
+    task_calls must already be in wave order; the wave plan is stored
+    alongside them so the orchestrator can launch one wave per response.
+    """
+    data = {"task_calls": task_calls, "prompt_prefix": CLEANER_PROMPT_PREFIX}
+    if waves is not None:
+        data.update(wave_fields(waves, chunk_words, max_concurrency))
+        data["chunk_words"] = {f"{num:03d}": words for num, words in chunk_words.items()}
 
-STEP 3: Use Write tool to save the cleaned transcript:
-- file_path: {output_path}
-- content: [your cleaned transcript]
+    return write_task_json(data, timestamp)
 
-STEP 4: Count words and output verification block:
-=== TRANSCRIPT-CLEANER VERIFICATION ===
-OUTPUT_FILE_WRITTEN: YES
-OUTPUT_FILE_PATH: {output_path}
-INPUT_WORD_COUNT: [original word count]
-OUTPUT_WORD_COUNT: [cleaned word count]
-REDUCTION_PERCENT: [percentage]%
-STATUS: SUCCESS
-=== END VERIFICATION ===
 
-CRITICAL: You MUST use Read and Write tools. If you just describe what you would do, you have FAILED."""
+def save_task_plan_json(param_rows, timestamp, waves, chunk_words, max_concurrency=MAX_CONCURRENCY):
+    """Save a compact task plan: one prompt template plus a parameter table."""
+    plan = build_task_plan(
+        CLEANER_SUBAGENT_TYPE,
+        CLEANER_DESCRIPTION_TEMPLATE,
+        CLEANER_PROMPT_TEMPLATE,
+        param_rows,
+        prompt_prefix=CLEANER_PROMPT_PREFIX,
+        **wave_fields(waves, chunk_words, max_concurrency),
+    )
+    return write_task_json(plan, timestamp)
 
-        task_call = {
-            "subagent_type": "general-purpose",
-            "description": f"Clean transcript chunk {chunk_num}",
-            "prompt": prompt
-        }
 
-        task_calls.append(task_call)
+def wave_fields(waves, chunk_words, max_concurrency):
+    """Wave plan fields shared by both task JSON formats."""
+    return {
+        "waves": [[f"{num:03d}" for num in wave] for wave in waves],
+        "max_concurrency": max_concurrency,
+        "critical_path_seconds": round(critical_path_seconds(waves, chunk_words)),
+    }
 
-    return task_calls
 
+def task_json_path(timestamp):
+    """Path of the run's task calls or task plan JSON."""
+    return workspace_dir(timestamp) / "task-calls.json"
 
-def save_task_calls_json(task_calls, timestamp):
-    """Save the pre-generated Task tool calls to a JSON file."""
-    json_path = Path(f"/tmp/meeting-task-calls-{timestamp}.json")
+
+def write_task_json(data, timestamp):
+    """Write task calls or a task plan to the run's task JSON file."""
+    json_path = task_json_path(timestamp)
 
     try:
         json_path.write_text(
-            json.dumps({"task_calls": task_calls}, indent=2),
+            json.dumps(data, indent=2),
             encoding='utf-8'
         )
         return str(json_path)
@@ -176,51 +614,221 @@ def save_task_calls_json(task_calls, timestamp):
         sys.exit(1)
 
 
-def main():
-    """Main entry point."""
-    if len(sys.argv) < 3:
-        print("Usage: chunk_transcript.py <raw_file> <timestamp>", file=sys.stderr)
+def load_resumable_chunks(timestamp, raw_file):
+    """Chunks from a completed chunking phase of this run, if still usable.
+
+    Returns (chunks, total_words, speaker_index_file), or None when the run
+    has no checkpoint, was for another transcript, or its files are gone.
+    """
+    done = pipeline_state.completed_phase(pipeline_state.load_state(timestamp), "chunk")
+    if not done or done.get("raw_file") != str(raw_file):
+        return None
+
+    try:
+        manifest = json.loads(Path(done["manifest"]).read_text(encoding='utf-8'))
+    except Exception:
+        return None
+
+    chunks = sorted(manifest["chunks"], key=lambda chunk: chunk["chunk_num"])
+    if not all(Path(chunk["input_path"]).exists() for chunk in chunks):
+        return None
+
+    speaker_index_file = done.get("speaker_index")
+    if speaker_index_file and not Path(speaker_index_file).exists():
+        speaker_index_file = None
+
+    return chunks, manifest["total_words"], speaker_index_file
+
+
+# Command-line options that take a value (everything else is a flag)
+VALUE_OPTIONS = {'--max-words', '--pack', '--token-budget', '--max-concurrency', '--task-format'}
+
+
+def parse_args(argv):
+    """Split argv into positional arguments and a dict of --options."""
+    positional = []
+    options = {}
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in VALUE_OPTIONS:
+            if i + 1 >= len(argv):
+                print(f"ERROR: {arg} requires a value", file=sys.stderr)
+                sys.exit(1)
+            options[arg[2:].replace('-', '_')] = argv[i + 1]
+            i += 2
+        elif arg.startswith('--'):
+            options[arg[2:].replace('-', '_')] = True
+            i += 1
+        else:
+            positional.append(arg)
+            i += 1
+    return positional, options
+
+
+def int_option(options, name, default):
+    """Read a positive integer option, exiting with an error if invalid."""
+    value = options.get(name, default)
+    try:
+        value = int(value)
+        if value <= 0:
+            raise ValueError
+    except (TypeError, ValueError):
+        print(f"ERROR: --{name.replace('_', '-')} must be a positive integer", file=sys.stderr)
         sys.exit(1)
+    return value
 
-    raw_file = sys.argv[1]
-    timestamp = sys.argv[2]
 
-    print("=== Meeting Transcriber: Chunking Transcript ===")
+def main(argv=None):
+    """Main entry point. argv defaults to the command-line arguments."""
+    args, options = parse_args(sys.argv[1:] if argv is None else argv)
+    if len(args) < 2:
+        print("Usage: chunk_transcript.py <raw_file> <timestamp> [--max-words N] "
+              "[--pack words|tokens] [--token-budget N] [--no-cache] "
+              "[--max-concurrency N] [--task-format plan|full] [--resume]", file=sys.stderr)
+        sys.exit(1)
 
-    # Read transcript
-    transcript = read_transcript(raw_file)
-    total_words = len(transcript.split())
-    print(f"INFO: Transcript has {total_words} words")
+    raw_file = args[0]
+    timestamp = args[1]
+    max_words = int_option(options, 'max_words', MAX_CHUNK_WORDS)
+    max_concurrency = int_option(options, 'max_concurrency', MAX_CONCURRENCY)
 
-    # Find logical breaks
-    segments = find_logical_breaks(transcript)
-    print(f"INFO: Found {len(segments)} logical segments")
+    task_format = options.get('task_format', 'plan')
+    if task_format not in ('plan', 'full'):
+        print(f"ERROR: --task-format must be 'plan' or 'full', got: {task_format}", file=sys.stderr)
+        sys.exit(1)
 
-    # Create chunks
-    chunks = create_chunks(segments)
-    num_chunks = len(chunks)
-    print(f"INFO: Created {num_chunks} chunks")
+    pack_mode = options.get('pack', 'tokens' if 'token_budget' in options else 'words')
+    if pack_mode not in ('words', 'tokens'):
+        print(f"ERROR: --pack must be 'words' or 'tokens', got: {pack_mode}", file=sys.stderr)
+        sys.exit(1)
+    token_budget = int_option(options, 'token_budget', TOKEN_BUDGET) if pack_mode == 'tokens' else None
 
-    # Print chunk statistics
-    for i, chunk in enumerate(chunks, 1):
-        word_count = len(chunk.split())
-        print(f"INFO: Chunk {i}: {word_count} words")
+    print("=== Meeting Transcriber: Chunking Transcript ===")
+    ensure_workspace(timestamp)
 
-    # Save chunks
-    chunk_files = save_chunks(chunks, timestamp)
+    # Caption and JSON exports are parsed into speaker turns before chunking
+    source_format = detect_format(raw_file)
+    if source_format != 'text':
+        turns_file = str(workspace_dir(timestamp) / "turns.md")
+        try:
+            stats = convert_file(raw_file, turns_file, source_format)
+        except Exception as e:
+            print(f"ERROR: Failed to parse {source_format} transcript: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"INFO: Parsed {source_format} export: {stats['cues']} cues merged into "
+              f"{stats['turns']} speaker turns")
+        print(f"TURNS_FILE={turns_file}")
+        raw_file = turns_file
+
+    # With --resume, reuse this run's chunks if they are still on disk
+    resumed = load_resumable_chunks(timestamp, raw_file) if options.get('resume') else None
+    if resumed:
+        chunks, total_words, speaker_index_file = resumed
+        print(f"INFO: Resuming run {timestamp}: reusing {len(chunks)} chunks")
+    else:
+        if options.get('resume'):
+            print(f"INFO: No completed chunking for run {timestamp}, chunking from scratch")
+
+        # Stream the transcript straight into chunk files
+        speaker_index = SpeakerIndex(SPEAKER_LABEL)
+        chunks, total_words, num_segments = stream_chunks(
+            raw_file, timestamp, max_words=max_words, token_budget=token_budget,
+            speaker_index=speaker_index)
+        print(f"INFO: Found {num_segments} logical segments")
+
+        # Speaker turns found while chunking, for metadata and people steps
+        speaker_index_file = speaker_index.save(index_path(timestamp), raw_file)
+        if speaker_index_file:
+            print(f"INFO: Indexed {len(speaker_index.turns)} speaker turns "
+                  f"from {len(speaker_index.speakers)} speakers")
 
-    # Generate pre-configured Task tool calls
-    task_calls = generate_task_tool_calls(num_chunks, timestamp)
-    task_calls_json = save_task_calls_json(task_calls, timestamp)
+    num_chunks = len(chunks)
+    chunk_word_counts = [chunk['word_count'] for chunk in chunks]
+    print(f"INFO: Transcript has {total_words} words")
+    print(f"INFO: Created {num_chunks} chunks")
+    if chunk_word_counts:
+        print(f"INFO: Chunk sizes: min {min(chunk_word_counts)}, "
+              f"max {max(chunk_word_counts)}, "
+              f"mean {total_words // num_chunks} words")
+
+    # Chunks cleaned on an earlier run are reused from the cache
+    if options.get('no_cache'):
+        cached = []
+    else:
+        cached = [chunk['chunk_num'] for chunk in chunks if chunk_cache.contains(chunk['cache_key'])]
+    # A resumed run also keeps outputs its agents already wrote
+    if resumed:
+        cleaned = [chunk['chunk_num'] for chunk in chunks if chunk['chunk_num'] not in cached
+                   and Path(chunk['output_path']).exists() and Path(chunk['output_path']).stat().st_size]
+    else:
+        cleaned = []
+    to_clean = [chunk['chunk_num'] for chunk in chunks
+                if chunk['chunk_num'] not in cached and chunk['chunk_num'] not in cleaned]
+    if cached:
+        print(f"INFO: {len(cached)} of {num_chunks} chunks already cleaned (cache hit)")
+    if cleaned:
+        print(f"INFO: {len(cleaned)} of {num_chunks} chunks already cleaned in this run")
+
+    # Schedule cache misses into waves, longest chunks first
+    chunk_words = {chunk['chunk_num']: chunk['word_count'] for chunk in chunks
+                   if chunk['chunk_num'] in to_clean}
+    waves = plan_waves(chunk_words, max_concurrency)
+    if waves:
+        print_plan(waves, chunk_words, max_concurrency)
+
+    # Generate pre-configured Task tool calls (cache misses only, in wave order).
+    # The compact plan stores the prompt once; "full" repeats it per call.
+    launch_order = [num for wave in waves for num in wave]
+    if task_format == 'full':
+        task_calls = generate_task_tool_calls(launch_order, timestamp)
+        task_calls_json = save_task_calls_json(task_calls, timestamp, waves, chunk_words, max_concurrency)
+    else:
+        param_rows = task_param_rows(chunks, launch_order)
+        task_calls_json = save_task_plan_json(param_rows, timestamp, waves, chunk_words, max_concurrency)
+        task_calls = expand_task_plan(json.loads(Path(task_calls_json).read_text(encoding='utf-8')))
+
+    # Every call must share the invariant prompt prefix to get prompt-cache hits
+    ok, prefix_length = verify_prompt_prefixes(task_calls, CLEANER_PROMPT_PREFIX)
+    if not ok:
+        print("ERROR: Generated cleaner prompts do not share the invariant prefix", file=sys.stderr)
+        sys.exit(1)
+    if task_calls:
+        print(f"INFO: Shared prompt prefix: {prefix_length} chars across {len(task_calls)} calls")
 
     print(f"SUCCESS: Saved {num_chunks} chunks")
     print(f"CHUNK_COUNT={num_chunks}")
 
     # Print chunk files (one per line for easy parsing)
-    for chunk_file in chunk_files:
-        print(f"CHUNK_FILE={chunk_file}")
+    for chunk in chunks:
+        print(f"CHUNK_FILE={chunk['input_path']}")
+
+    print(f"CACHE_HITS={len(cached)}")
+    print(f"TASK_CALL_COUNT={len(launch_order)}")
+    for chunk_num in cached:
+        print(f"CACHED_CHUNK={chunk_num:03d}")
+    for chunk_num in cleaned:
+        print(f"CLEANED_CHUNK={chunk_num:03d}")
+
+    if speaker_index_file:
+        print(f"SPEAKER_INDEX={speaker_index_file}")
+
+    # Manifest of chunk inputs and expected outputs for reassembly
+    manifest_file = save_manifest(chunks, timestamp, raw_file, total_words, cached)
+    print(f"MANIFEST={manifest_file}")
+
+    # Checkpoint so a failed run can pick up from here with --resume
+    pipeline_state.complete_phase(
+        timestamp, "chunk", raw_file=str(raw_file), manifest=manifest_file,
+        task_calls_json=task_calls_json, speaker_index=speaker_index_file,
+        chunk_count=num_chunks)
+    statuses = {num: "cached" for num in cached}
+    statuses.update({num: "cleaned" for num in cleaned})
+    statuses.update({num: "pending" for num in to_clean})
+    pipeline_state.record_chunks(timestamp, statuses, chunks)
 
     # Print task calls JSON path
+    print(f"TASK_FORMAT={task_format}")
     print(f"TASK_CALLS_JSON={task_calls_json}")
 
     return 0
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Strip caption boilerplate from a plain-text transcript before chunking.
+
+Runs between get_transcript.py and preclean_transcript.py. Transcripts
+copied out of meeting tools repeat the speaker label on every line,
+interleave timestamp lines and include "joined the meeting" events; all of
+it would otherwise be sent to the transcript-cleaner agents. In one
+streaming pass this script:
+- drops timestamp-only lines and leading timestamps, keeping the one that
+  opens a speaker turn as "[00:01:23] Speaker:"
+- drops join/leave, recording and transcription events
+- merges consecutive lines from the same speaker into one turn (speaker
+  labels are chunk_transcript.SPEAKER_LABEL, so "10:30" or "Agenda:" are text)
+- normalises whitespace
+Unlabelled text keeps its line and paragraph breaks.
+
+Usage: compact_transcript.py <raw_file> [--output <file>]
+"""
+
+import os
+import re
+import sys
+from pathlib import Path
+
+from chunk_transcript import SPEAKER_LABEL
+
+
+TIMESTAMP = r'[\[(]?(?:\d+:)?\d{1,2}:\d{2}(?:[.,]\d{1,3})?[\])]?'
+TIMESTAMP_LINE = re.compile(rf'^{TIMESTAMP}(?:\s*(?:-->|[-–])\s*{TIMESTAMP})?$')
+LEADING_TIMESTAMP = re.compile(rf'^{TIMESTAMP}(?:\s*(?:-->|[-–])\s*{TIMESTAMP})?\s*[-–|]?\s*')
+# "Jane Doe   0:03" on its own line, with the turn's text on the lines below
+SPEAKER_HEADER = re.compile(rf"^([A-Z][\w.'’-]*(?:,? [A-Z][\w.'’-]*){{0,3}})\s+{TIMESTAMP}$")
+# English event lines from Zoom, Teams and Meet; speaker-labelled lines are never matched
+SYSTEM_EVENT = re.compile(
+    r'^(?:'
+    r".{1,60}? (?:has )?(?:joined|left|rejoined|was admitted to|was removed from) the (?:meeting|call|conversation|lobby)"
+    r"|.{1,60}? (?:started|stopped|paused|resumed) (?:the )?(?:recording|transcription|live captions)"
+    r"|.{1,60}? (?:is now presenting|stopped presenting|started sharing(?: their)? screen|stopped sharing(?: their)? screen)"
+    r"|(?:recording|transcription|live captions|the meeting) (?:has )?(?:started|stopped|ended|paused|resumed)"
+    r')[.!]?$',
+    re.IGNORECASE)
+CLOCK = re.compile(r'(?:\d+:)?\d{1,2}:\d{2}')
+ZERO_WIDTH = re.compile('[\u200b\u200c\u200d\u2060\ufeff]')
+
+
+class Compactor:
+    """Line-at-a-time compaction state; only the current turn's speaker is kept."""
+
+    def __init__(self, out):
+        self.out = out
+        self.speaker = None  # Speaker of the open turn, or None for plain text
+        self.turn_has_text = False
+        self.written = False
+        self.blank = False  # A blank line was seen since the last text
+        self.stats = {"words_before": 0, "words_after": 0, "turns": 0,
+                      "timestamps_dropped": 0, "events_dropped": 0, "lines_merged": 0}
+
+    def write(self, separator, text):
+        self.out.write(separator + text)
+        self.written = True
+        self.stats["words_after"] += len(text.split())
+
+    def start_paragraph(self, text):
+        self.write('\n\n' if self.written else '', text)
+
+    def speaker_line(self, speaker, text, start=None):
+        """Text from a labelled line or a speaker header; merges with the open turn.
+
+        start is the line's timestamp, kept only when it opens a new turn.
+        """
+        if speaker == self.speaker:
+            self.stats["lines_merged"] += 1
+        else:
+            self.start_paragraph(f"[{start}] {speaker}:" if start else f"{speaker}:")
+            self.speaker = speaker
+            self.turn_has_text = False
+            self.stats["turns"] += 1
+        self.append(text)
+
+    def append(self, text):
+        if text:
+            self.write(' ', text)
+            self.turn_has_text = True
+        self.blank = False
+
+    def plain_line(self, text):
+        """Unlabelled text: continues the open turn, or is kept as its own line."""
+        if self.speaker is not None and (not self.blank or not self.turn_has_text):
+            self.stats["lines_merged"] += 1
+            self.append(text)
+            return
+        if self.speaker is not None or self.blank or not self.written:
+            self.start_paragraph(text)
+        else:
+            self.write('\n', text)
+        self.speaker = None
+        self.blank = False
+
+    def feed(self, line):
+        self.stats["words_before"] += len(line.split())
+        text = ' '.join(ZERO_WIDTH.sub('', line).split())
+        if not text:
+            self.blank = True
+            return
+
+        if TIMESTAMP_LINE.match(text):
+            self.stats["timestamps_dropped"] += 1
+            return
+        header = SPEAKER_HEADER.match(text)
+        if header:
+            self.stats["timestamps_dropped"] += 1
+            self.speaker_line(header.group(1), '', CLOCK.search(text, header.end(1)).group())
+            return
+        # "[00:01:23] text" or "00:01:23 Jane: text"; a bare "10:30 works" is prose
+        start = None
+        stamp = LEADING_TIMESTAMP.match(text)
+        if stamp and stamp.end() < len(text) and (
+                text[0] in '[(' or SPEAKER_LABEL.match(text, stamp.end())):
+            self.stats["timestamps_dropped"] += 1
+            start = CLOCK.search(text).group()
+            text = text[stamp.end():]
+
+        # A converted export's "[00:01:23] jsmith:" is only a label after its turn time
+        label = SPEAKER_LABEL.match(text) or (start and SPEAKER_LABEL.match(f"[{start}] {text}"))
+        if label:
+            self.speaker_line(label.group('speaker'), label.string[label.end():].strip(), start)
+        elif SYSTEM_EVENT.match(text):
+            self.stats["events_dropped"] += 1
+        else:
+            self.plain_line(text)
+
+
+def compact_file(input_file, output_file):
+    """Stream input_file to output_file compacted.
+
+    Writes to a temp file next to output_file and renames it into place,
+    so input_file and output_file may be the same path.
+    Returns a stats dict (words_before, words_after, turns, timestamps_dropped,
+    events_dropped, lines_merged).
+    """
+    output_path = Path(output_file)
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+
+    try:
+        with open(input_file, 'r', encoding='utf-8-sig') as src, \
+                open(tmp_path, 'w', encoding='utf-8') as dst:
+            compactor = Compactor(dst)
+            for line in src:
+                compactor.feed(line)
+            if compactor.written:
+                dst.write('\n')
+        os.replace(tmp_path, output_path)
+    except Exception as e:
+        print(f"ERROR: Failed to compact transcript: {e}", file=sys.stderr)
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        sys.exit(1)
+
+    return compactor.stats
+
+
+def main():
+    """Main entry point."""
+    args = sys.argv[1:]
+    if not args or args[0].startswith('--'):
+        print("Usage: compact_transcript.py <raw_file> [--output <file>]", file=sys.stderr)
+        sys.exit(1)
+
+    raw_file = args[0]
+    output_file = raw_file
+    if "--output" in args:
+        try:
+            output_file = args[args.index("--output") + 1]
+        except IndexError:
+            print("ERROR: --output requires a file path", file=sys.stderr)
+            sys.exit(1)
+
+    print("=== Meeting Transcriber: Compacting Transcript ===")
+    stats = compact_file(raw_file, output_file)
+    saved = stats["words_before"] - stats["words_after"]
+    percent = (saved / stats["words_before"] * 100) if stats["words_before"] else 0.0
+
+    print(f"INFO: Dropped {stats['timestamps_dropped']} timestamps and {stats['events_dropped']} meeting events, "
+          f"merged {stats['lines_merged']} lines into {stats['turns']} speaker turns")
+    print(f"INFO: {saved} fewer words ({percent:.1f}%)")
+    print(f"WORDS_BEFORE={stats['words_before']}")
+    print(f"WORDS_AFTER={stats['words_after']}")
+    print(f"COMPACTED_FILE={output_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
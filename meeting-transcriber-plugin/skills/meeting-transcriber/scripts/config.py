@@ -17,6 +17,9 @@ SCRIPT_DIR = Path(__file__).parent
 SKILL_DIR = SCRIPT_DIR.parent
 CONFIG_FILE = SKILL_DIR / "user_config.json"
 
+# Persistent caches and indexes (outside the plugin dir so updates keep them)
+CACHE_DIR = Path.home() / ".cache" / "meeting-transcriber"
+
 # Default paths (relative to vault root)
 DEFAULT_MEETINGS_FOLDER = "Calendar/Meetings"
 DEFAULT_PEOPLE_FOLDER = "Atlas/People"
@@ -68,6 +71,17 @@ def get_people_dir():
     return vault / people
 
 
+def option_value(name, default=''):
+    """Value following a command-line option in sys.argv, or default if absent."""
+    if name not in sys.argv:
+        return default
+    try:
+        return sys.argv[sys.argv.index(name) + 1]
+    except IndexError:
+        print(f"ERROR: {name} requires a value", file=sys.stderr)
+        sys.exit(1)
+
+
 def is_configured():
     """Check if the plugin has been configured."""
     config = get_config()
@@ -373,8 +387,9 @@ def run_config_dialog():
     ConfigHandler.server_should_stop = False
 
     # Start local web server
-    port = 8766  # Different port from get_transcript.py
-    server = HTTPServer(('127.0.0.1', port), ConfigHandler)
+    # Port 0 lets the OS pick a free port, so other skills' forms never collide
+    server = HTTPServer(('127.0.0.1', 0), ConfigHandler)
+    port = server.server_address[1]
 
     # Run server in background thread
     def run_server():
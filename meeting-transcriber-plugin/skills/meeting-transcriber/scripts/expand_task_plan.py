@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Expand a compact transcript-cleaner task plan into Task tool calls.
+
+A task plan stores the cleaner prompt once as a template plus a small
+parameter table with one row per chunk, instead of repeating the full
+prompt for every chunk. Calls are materialised only when they are about
+to be launched, one wave at a time.
+"""
+
+import sys
+import json
+import string
+import hashlib
+from pathlib import Path
+
+
+PLAN_FORMAT = "meeting-task-plan/1"
+PARAM_COLUMNS = ["chunk_num", "input_path", "output_path", "word_count"]
+
+
+def build_task_plan(subagent_type, description_template, prompt_template, param_rows, **extra):
+    """Build a compact task plan.
+
+    param_rows are (chunk_num, input_path, output_path, word_count) tuples
+    in launch order. Extra keyword arguments (e.g. waves) are stored as-is.
+    """
+    plan = {
+        "format": PLAN_FORMAT,
+        "subagent_type": subagent_type,
+        "description_template": description_template,
+        "prompt_template": prompt_template,
+        "param_columns": PARAM_COLUMNS,
+        "params": [list(row) for row in param_rows],
+    }
+    plan.update(extra)
+    return plan
+
+
+def is_task_plan(data):
+    """Check whether loaded JSON is a compact task plan (vs full task calls)."""
+    return data.get("format") == PLAN_FORMAT
+
+
+def plan_params(plan):
+    """Return the plan's parameter table as a list of dicts."""
+    columns = plan.get("param_columns", PARAM_COLUMNS)
+    return [dict(zip(columns, row)) for row in plan["params"]]
+
+
+def expand_call(plan, params):
+    """Materialise the Task tool call for one parameter row."""
+    return {
+        "subagent_type": plan["subagent_type"],
+        "description": plan["description_template"].format(**params),
+        "prompt": plan["prompt_template"].format(**params),
+    }
+
+
+def invariant_prefix(template):
+    """The part of a prompt template before its first placeholder."""
+    prefix = []
+    for literal, field, _, _ in string.Formatter().parse(template):
+        prefix.append(literal)
+        if field is not None:
+            break
+    return ''.join(prefix)
+
+
+def prompt_prefix_record(template, version):
+    """Prompt version plus length and SHA-256 of the template's invariant prefix.
+
+    Stored in the task JSON when it is written, so prompts expanded later
+    are checked against the prefix the plan was made with, not against
+    whatever template they were expanded from.
+    """
+    prefix = invariant_prefix(template)
+    return {
+        "version": version,
+        "length": len(prefix),
+        "sha256": hashlib.sha256(prefix.encode('utf-8')).hexdigest(),
+    }
+
+
+def verify_prompt_prefixes(task_calls, expected):
+    """Check every prompt against a prompt_prefix_record.
+
+    Each prompt must open with the recorded "[VERIFICATION:<version>]" token
+    and its first `length` characters must hash to the recorded digest.
+    Returns (ok, prefix_length). Provider-side prompt caching only helps
+    when the leading text of parallel calls is byte-identical.
+    """
+    token = f"[VERIFICATION:{expected['version']}]"
+    length = expected["length"]
+    for call in task_calls:
+        prompt = call["prompt"]
+        if not prompt.startswith(token) or len(prompt) < length:
+            return False, length
+        if hashlib.sha256(prompt[:length].encode('utf-8')).hexdigest() != expected["sha256"]:
+            return False, length
+    return True, length
+
+
+def wave_chunk_nums(data, wave):
+    """Chunk numbers in a 1-based wave, or None if the wave does not exist."""
+    waves = data.get("waves") or []
+    if wave < 1 or wave > len(waves):
+        return None
+    return set(waves[wave - 1])
+
+
+def expand_task_plan(data, wave=None):
+    """Return Task tool calls from a task plan or legacy task-calls JSON.
+
+    With wave set, only that wave's calls are returned.
+    """
+    chunk_nums = wave_chunk_nums(data, wave) if wave else None
+    if wave and chunk_nums is None:
+        return []
+
+    if is_task_plan(data):
+        return [expand_call(data, params) for params in plan_params(data)
+                if chunk_nums is None or params["chunk_num"] in chunk_nums]
+
+    # Legacy format: calls are stored in full, in wave order
+    task_calls = data.get("task_calls", [])
+    if chunk_nums is None:
+        return task_calls
+    order = [num for w in data.get("waves", []) for num in w]
+    return [call for num, call in zip(order, task_calls) if num in chunk_nums]
+
+
+def main():
+    """Main entry point."""
+    if len(sys.argv) < 2:
+        print("Usage: expand_task_plan.py <task_plan_json> [--wave N] [--output <file>]", file=sys.stderr)
+        sys.exit(1)
+
+    plan_path = Path(sys.argv[1])
+    args = sys.argv[2:]
+    wave = None
+    output = None
+    try:
+        if "--wave" in args:
+            wave = int(args[args.index("--wave") + 1])
+        if "--output" in args:
+            output = Path(args[args.index("--output") + 1])
+    except (IndexError, ValueError):
+        print("ERROR: --wave needs a number and --output needs a path", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        data = json.loads(plan_path.read_text(encoding='utf-8'))
+    except Exception as e:
+        print(f"ERROR: Failed to read task plan: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if wave and wave_chunk_nums(data, wave) is None:
+        print(f"ERROR: Task plan has no wave {wave}", file=sys.stderr)
+        sys.exit(1)
+
+    task_calls = expand_task_plan(data, wave)
+    # Task JSON written before prefixes were recorded has nothing to check against
+    if data.get("prompt_prefix"):
+        ok, _ = verify_prompt_prefixes(task_calls, data["prompt_prefix"])
+        if not ok:
+            print(f"ERROR: Prompts do not match the cleaner prompt prefix recorded for "
+                  f"{data['prompt_prefix']['version']}; re-run chunk_transcript.py", file=sys.stderr)
+            sys.exit(1)
+
+    result = json.dumps({"task_calls": task_calls}, indent=2)
+
+    if output:
+        try:
+            output.write_text(result, encoding='utf-8')
+        except Exception as e:
+            print(f"ERROR: Failed to save task calls: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"TASK_CALLS_JSON={output}")
+    else:
+        print(result)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Minimal reader for the YAML frontmatter of Obsidian notes.
+
+Handles the subset the meeting and people notes use (scalars, quoted
+strings, inline lists and block lists) without a YAML dependency, and only
+reads a note up to the end of its frontmatter.
+"""
+
+import re
+import sys
+
+
+KEY_LINE = re.compile(r'([^\s:#][^:]*):(?:\s+(.*))?$')
+LIST_ITEM = re.compile(r'\s*-\s+(.*)$')
+MAX_FRONTMATTER_LINES = 500  # Stop looking for the closing --- after this
+
+
+def unquote(value):
+    """Strip matching quotes from a scalar value."""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+        return value[1:-1]
+    return value
+
+
+def parse_value(value):
+    """Parse an inline scalar or [a, b] list."""
+    value = (value or '').strip()
+    if value.startswith('[') and value.endswith(']'):
+        return [unquote(item) for item in value[1:-1].split(',') if item.strip()]
+    return unquote(value)
+
+
+def parse_frontmatter(lines):
+    """Parse frontmatter lines (without the --- fences) into a dict."""
+    data = {}
+    key = None
+    for line in lines:
+        line = line.rstrip('\n')
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        item = LIST_ITEM.match(line)
+        if item and key is not None:
+            if not isinstance(data[key], list):
+                data[key] = []
+            data[key].append(unquote(item.group(1)))
+            continue
+        match = KEY_LINE.match(line)
+        if match and not line[0].isspace():
+            key = match.group(1).strip()
+            data[key] = parse_value(match.group(2))
+    return data
+
+
+def read_frontmatter(path):
+    """Frontmatter of a note as a dict ({} if it has none or is unreadable)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.readline().strip() != '---':
+                return {}
+            lines = []
+            for _ in range(MAX_FRONTMATTER_LINES):
+                line = f.readline()
+                if not line:
+                    return {}
+                if line.strip() == '---':
+                    return parse_frontmatter(lines)
+                lines.append(line)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"WARNING: Failed to read frontmatter of {path}: {e}", file=sys.stderr)
+    return {}
@@ -2,24 +2,120 @@
 """
 Get meeting transcript via web form and save to temp file.
 Returns the temp file path for Claude to process.
+
+The form uploads the pasted text or a dropped file to /upload, which
+streams the request body straight into the raw transcript file.
 """
 
+import os
+import re
+import codecs
 import subprocess
 import sys
-import time
 from pathlib import Path
 from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import parse_qs
+from urllib.parse import parse_qs, urlparse
 import threading
 import json
 from datetime import datetime
 
 # Import config module from same directory
 from config import ensure_configured
+from transcript_formats import convert_file, detect_format
+from workspace import create_workspace, ensure_workspace, remove_workspace, workspace_dir
+
+
+UPLOAD_BLOCK_BYTES = 64 * 1024  # Read size for streamed uploads
+NON_SPACE = re.compile(r'\S+')
+
+
+def raw_file_path(run_id):
+    """Path of the raw transcript file for a run."""
+    return workspace_dir(run_id) / "raw.md"
+
+
+def cleaned_file_path(run_id):
+    """Path of the cleaned transcript file for a run."""
+    return workspace_dir(run_id) / "cleaned.md"
+
+
+def iter_chunked(rfile):
+    """Yield the data of a Transfer-Encoding: chunked body, block by block."""
+    while True:
+        size_line = rfile.readline(1024)
+        if not size_line:
+            raise ValueError("connection closed inside chunked body")
+        size = int(size_line.split(b';', 1)[0].strip(), 16)
+        if size == 0:
+            # Skip trailers up to the terminating blank line
+            while rfile.readline(1024).strip():
+                pass
+            return
+        while size > 0:
+            block = rfile.read(min(size, UPLOAD_BLOCK_BYTES))
+            if not block:
+                raise ValueError("connection closed inside chunk")
+            size -= len(block)
+            yield block
+        rfile.readline(1024)
+
+
+def iter_sized(rfile, length):
+    """Yield exactly `length` bytes of body, block by block."""
+    while length > 0:
+        block = rfile.read(min(length, UPLOAD_BLOCK_BYTES))
+        if not block:
+            raise ValueError("connection closed before end of body")
+        length -= len(block)
+        yield block
+
+
+def count_words(text, in_word):
+    """Words in a block of text, continuing from the previous block.
+
+    in_word says whether the previous block ended inside a word, so a word
+    split across blocks is counted once. Returns (count, in_word).
+    """
+    count = 0
+    for match in NON_SPACE.finditer(text):
+        if not (match.start() == 0 and in_word):
+            count += 1
+    if text:
+        in_word = not text[-1].isspace()
+    return count, in_word
+
+
+def stream_to_file(blocks, path):
+    """Decode byte blocks as UTF-8 and write them to path, counting words as they pass.
+
+    Writes to a temp file and renames it into place, so a broken upload
+    never leaves a partial transcript behind. Returns the word count.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+    words, in_word = 0, False
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as out:
+            for block in blocks:
+                text = decoder.decode(block)
+                count, in_word = count_words(text, in_word)
+                words += count
+                out.write(text)
+            text = decoder.decode(b'', final=True)
+            words += count_words(text, in_word)[0]
+            out.write(text)
+        os.replace(tmp_path, path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return words
 
 
 class TranscriptHandler(BaseHTTPRequestHandler):
-    transcript_data = None
+    raw_file = None  # Where uploads are written; set before the server starts
+    word_count = None  # Set once a transcript has been received
+    source_format = None  # 'text', or the caption/JSON format it was parsed from
     meeting_date = None
     meeting_time = None
     server_should_stop = False
@@ -118,6 +214,11 @@ class TranscriptHandler(BaseHTTPRequestHandler):
             outline: none;
             border-color: #0071e3;
         }}
+        textarea.dragging {{
+            border-color: #0071e3;
+            border-style: dashed;
+            background-color: #f0f6ff;
+        }}
         .buttons {{
             margin-top: 20px;
             text-align: right;
@@ -150,7 +251,7 @@ class TranscriptHandler(BaseHTTPRequestHandler):
 <body>
     <div class="container">
         <h1>Meeting Transcriber</h1>
-        <p>Enter meeting details and paste your transcript below.</p>
+        <p>Enter meeting details and paste your transcript below, or drop a transcript file onto the box.</p>
 
         <form id="transcriptForm" method="POST" action="/submit">
             <div class="metadata-section">
@@ -178,28 +279,54 @@ class TranscriptHandler(BaseHTTPRequestHandler):
         </form>
     </div>
     <script>
+        const area = document.getElementById('transcript');
+        let droppedFile = null;
+
+        // Drag and drop a transcript file; it is uploaded as-is, never read into the page
+        area.addEventListener('dragover', function(e) {{
+            e.preventDefault();
+            area.classList.add('dragging');
+        }});
+        area.addEventListener('dragleave', function() {{
+            area.classList.remove('dragging');
+        }});
+        area.addEventListener('drop', function(e) {{
+            e.preventDefault();
+            area.classList.remove('dragging');
+            if (e.dataTransfer.files.length) {{
+                droppedFile = e.dataTransfer.files[0];
+                area.value = '';
+                area.placeholder = 'File: ' + droppedFile.name + ' (' + Math.ceil(droppedFile.size / 1024) + ' KB) - click Continue to upload';
+            }}
+        }});
+        area.addEventListener('input', function() {{
+            droppedFile = null;  // Typing or pasting replaces a dropped file
+        }});
+
         document.getElementById('transcriptForm').addEventListener('submit', function(e) {{
             e.preventDefault();
-            const text = document.getElementById('transcript').value.trim();
-            if (!text) {{
-                alert('Please paste your transcript before continuing.');
+            const text = area.value.trim();
+            if (!text && !droppedFile) {{
+                alert('Please paste your transcript or drop a file before continuing.');
                 return;
             }}
 
             const date = document.getElementById('meetingDate').value || '';
             const time = document.getElementById('meetingTime').value || '';
 
-            // Submit form
-            fetch('/submit', {{
+            // Upload the text or file as the raw request body
+            fetch('/upload?date=' + encodeURIComponent(date) + '&time=' + encodeURIComponent(time), {{
                 method: 'POST',
-                headers: {{'Content-Type': 'application/json'}},
-                body: JSON.stringify({{
-                    transcript: text,
-                    date: date,
-                    time: time
-                }})
-            }}).then(() => {{
-                document.body.innerHTML = '<div class="container"><h1>Success!</h1><p>Transcript received. You can close this window.</p></div>';
+                headers: {{'Content-Type': 'text/plain; charset=utf-8'}},
+                body: droppedFile || text
+            }}).then(function(response) {{
+                return response.text().then(function(message) {{
+                    if (!response.ok) {{
+                        alert('Upload failed: ' + message);
+                        return;
+                    }}
+                    document.body.innerHTML = '<div class="container"><h1>Success!</h1><p>Transcript received. You can close this window.</p></div>';
+                }});
             }});
         }});
         function handleCancel() {{
@@ -223,46 +350,98 @@ class TranscriptHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(html.encode())
 
+    def send_text(self, status, message):
+        """Send a short plain-text response."""
+        body = message.encode()
+        self.send_response(status)
+        self.send_header('Content-type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def body_blocks(self):
+        """Request body as byte blocks, or None if its length is unknown."""
+        if 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+            return iter_chunked(self.rfile)
+        length = self.headers.get('Content-Length')
+        if length is None or not length.strip().isdigit():
+            return None
+        return iter_sized(self.rfile, int(length))
+
     def do_POST(self):
         """Handle form submission."""
-        if self.path == '/submit':
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
+        url = urlparse(self.path)
 
-            try:
-                data = json.loads(post_data.decode())
-                TranscriptHandler.transcript_data = data.get('transcript', '')
-                TranscriptHandler.meeting_date = data.get('date', '')
-                TranscriptHandler.meeting_time = data.get('time', '')
-            except:
-                pass
+        if url.path in ('/upload', '/submit'):
+            blocks = self.body_blocks()
+            if blocks is None:
+                self.send_text(411, 'Content-Length or chunked Transfer-Encoding required')
+                return
 
-            self.send_response(200)
-            self.send_header('Content-type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(b'OK')
+            try:
+                if url.path == '/upload':
+                    # Raw transcript body, date and time in the query string
+                    query = parse_qs(url.query)
+                    word_count = stream_to_file(blocks, TranscriptHandler.raw_file)
+                    meeting_date = query.get('date', [''])[0]
+                    meeting_time = query.get('time', [''])[0]
+                else:
+                    # Older clients post {"transcript", "date", "time"} as JSON
+                    data = json.loads(b''.join(blocks).decode('utf-8'))
+                    transcript = data.get('transcript', '')
+                    word_count = stream_to_file([transcript.encode('utf-8')], TranscriptHandler.raw_file)
+                    meeting_date = data.get('date', '')
+                    meeting_time = data.get('time', '')
+            except Exception as e:
+                self.send_text(400, f'Upload failed: {e}')
+                return
+
+            # A dropped caption or JSON export is parsed into speaker turns in place
+            source_format = detect_format(TranscriptHandler.raw_file)
+            if source_format != 'text':
+                try:
+                    word_count = convert_file(TranscriptHandler.raw_file, TranscriptHandler.raw_file,
+                                              source_format)["words"]
+                except Exception as e:
+                    self.send_text(400, f'Could not parse {source_format} transcript: {e}')
+                    return
+
+            if not word_count:
+                self.send_text(400, 'Transcript is empty')
+                return
+
+            TranscriptHandler.word_count = word_count
+            TranscriptHandler.source_format = source_format
+            TranscriptHandler.meeting_date = meeting_date
+            TranscriptHandler.meeting_time = meeting_time
+            self.send_text(200, 'OK')
 
             # Signal server to stop
             TranscriptHandler.server_should_stop = True
 
-        elif self.path == '/cancel':
-            TranscriptHandler.transcript_data = None
+        elif url.path == '/cancel':
+            TranscriptHandler.word_count = None
             TranscriptHandler.meeting_date = None
             TranscriptHandler.meeting_time = None
             TranscriptHandler.server_should_stop = True
+            self.send_text(200, 'OK')
 
-            self.send_response(200)
-            self.send_header('Content-type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(b'OK')
+        else:
+            self.send_text(404, 'Not found')
 
 
-def get_transcript_via_dialog():
-    """Show web form dialog to get transcript, date, and time."""
+def get_transcript_via_dialog(raw_file):
+    """Show web form dialog to get transcript, date, and time.
+
+    The transcript is written to raw_file as it is uploaded.
+    Returns (word_count, meeting_date, meeting_time).
+    """
+    TranscriptHandler.raw_file = raw_file
 
     # Start local web server
-    port = 8765
-    server = HTTPServer(('127.0.0.1', port), TranscriptHandler)
+    # Port 0 lets the OS pick a free port, so concurrent runs never collide
+    server = HTTPServer(('127.0.0.1', 0), TranscriptHandler)
+    port = server.server_address[1]
 
     # Run server in background thread
     def run_server():
@@ -275,7 +454,7 @@ def get_transcript_via_dialog():
     # Open browser
     url = f'http://127.0.0.1:{port}'
     print(f"\nOpening web form at {url}")
-    print("Enter meeting date/time and paste your transcript, then click Continue...")
+    print("Enter meeting date/time and paste or drop your transcript, then click Continue...")
 
     try:
         subprocess.run(['open', url], check=True)
@@ -285,37 +464,15 @@ def get_transcript_via_dialog():
     # Wait for form submission
     server_thread.join(timeout=600)  # 10 minute timeout
 
-    transcript = TranscriptHandler.transcript_data
+    word_count = TranscriptHandler.word_count
     meeting_date = TranscriptHandler.meeting_date
     meeting_time = TranscriptHandler.meeting_time
 
-    if transcript is None:
+    if word_count is None:
         print("INFO: User canceled or timeout", file=sys.stderr)
         sys.exit(0)
 
-    if not transcript:
-        print("ERROR: No transcript provided", file=sys.stderr)
-        sys.exit(1)
-
-    return transcript, meeting_date, meeting_time
-
-
-def save_to_temp_file(transcript):
-    """Save transcript to temp file with unique timestamp."""
-    timestamp = int(time.time())
-    raw_file = Path(f"/tmp/meeting-raw-{timestamp}.md")
-    cleaned_file = Path(f"/tmp/meeting-cleaned-{timestamp}.md")
-
-    try:
-        raw_file.write_text(transcript, encoding='utf-8')
-        print(f"SUCCESS: Transcript saved to {raw_file}")
-        print(f"INFO: Cleaned file will be: {cleaned_file}")
-        print(f"TIMESTAMP: {timestamp}")
-        return raw_file, cleaned_file, timestamp
-
-    except Exception as e:
-        print(f"ERROR: Failed to save transcript: {e}", file=sys.stderr)
-        sys.exit(1)
+    return word_count, meeting_date, meeting_time
 
 
 def main():
@@ -329,9 +486,21 @@ def main():
 
     print("Starting web form...")
 
-    transcript, meeting_date, meeting_time = get_transcript_via_dialog()
+    # Each run gets its own workspace, so concurrent runs never share files
+    timestamp = create_workspace()
+    ensure_workspace(timestamp)
+    raw_file = raw_file_path(timestamp)
+    cleaned_file = cleaned_file_path(timestamp)
 
-    word_count = len(transcript.split())
+    try:
+        word_count, meeting_date, meeting_time = get_transcript_via_dialog(raw_file)
+    except BaseException:
+        # Cancelled, timed out or failed: no later step will use or remove this workspace
+        remove_workspace(timestamp)
+        raise
+
+    if TranscriptHandler.source_format not in (None, 'text'):
+        print(f"INFO: Parsed {TranscriptHandler.source_format} export into speaker turns")
     print(f"INFO: Received transcript with {word_count} words")
 
     if meeting_date:
@@ -339,12 +508,16 @@ def main():
     if meeting_time:
         print(f"INFO: Meeting time provided: {meeting_time}")
 
-    raw_file, cleaned_file, timestamp = save_to_temp_file(transcript)
+    print(f"SUCCESS: Transcript saved to {raw_file}")
+    print(f"INFO: Cleaned file will be: {cleaned_file}")
+    print(f"TIMESTAMP: {timestamp}")
 
     print(f"INFO: Ready for AI processing")
     print(f"RAW_FILE={raw_file}")
     print(f"CLEANED_FILE={cleaned_file}")
     print(f"TIMESTAMP={timestamp}")
+    print(f"RUN_ID={timestamp}")
+    print(f"WORKSPACE={workspace_dir(timestamp)}")
     print(f"MEETING_DATE={meeting_date if meeting_date else ''}")
     print(f"MEETING_TIME={meeting_time if meeting_time else ''}")
 
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+SQLite index of meeting note frontmatter.
+
+Keeps date, time, title, client, project, participants and tags of every
+note in the meetings folder, refreshed by file mtime and updated whenever
+assemble_obsidian.py saves a note. Finding the previous meeting for a new
+note is then an indexed lookup instead of a walk over the vault.
+
+The meeting notes and transcript sections of each note are also kept in a
+contentless FTS5 table (the inverted index only, not a copy of the text)
+for search_meetings.py.
+
+Usage: meeting_index.py --refresh
+       meeting_index.py --compact
+       meeting_index.py --previous <date> <time> [--client C] [--project P] [--participants "A, B"]
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+from pathlib import Path
+
+from config import CACHE_DIR, get_meetings_dir, option_value
+from frontmatter import read_frontmatter
+
+
+INDEX_FILE = CACHE_DIR / "meetings.sqlite3"
+SCHEMA_VERSION = 2  # Bump to re-read every note after a schema change
+# Participants in more than this share of meetings (usually the vault owner)
+# say nothing about which meeting came before
+COMMON_PARTICIPANT_SHARE = 0.5
+# A folder changed this recently may change again within its mtime resolution,
+# so it is walked again on the next open
+FOLDER_SETTLE_SECONDS = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    date TEXT NOT NULL DEFAULT '',
+    time TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    client TEXT NOT NULL DEFAULT '',
+    project TEXT NOT NULL DEFAULT '',
+    tags TEXT NOT NULL DEFAULT '[]'
+);
+CREATE TABLE IF NOT EXISTS participants (
+    name TEXT NOT NULL,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sections (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL,
+    section TEXT NOT NULL,
+    words INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS folders (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS section_text USING fts5(
+    body, content='', tokenize='porter unicode61 remove_diacritics 2'
+);
+CREATE INDEX IF NOT EXISTS meetings_client ON meetings (client, date, time);
+CREATE INDEX IF NOT EXISTS meetings_project ON meetings (project, date, time);
+CREATE INDEX IF NOT EXISTS participants_name ON participants (name, date, time);
+CREATE INDEX IF NOT EXISTS participants_path ON participants (path);
+CREATE INDEX IF NOT EXISTS sections_path ON sections (path);
+"""
+
+
+def connect(index_file=INDEX_FILE):
+    """Open the index, creating it if needed."""
+    Path(index_file).parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(str(index_file))
+    db.executescript(SCHEMA)
+    if db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        # Notes indexed by an older version are re-read on the next refresh
+        db.execute("UPDATE meetings SET mtime = -1")
+        db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        db.commit()
+    return db
+
+
+def person_name(value):
+    """"[[Jane Doe|Jane]]" -> "Jane Doe"."""
+    name = str(value).strip().strip('"').strip()
+    if name.startswith('[[') and name.endswith(']]'):
+        name = name[2:-2]
+    return name.split('|', 1)[0].strip()
+
+
+def as_list(value):
+    """Frontmatter value as a list of non-empty strings."""
+    if isinstance(value, list):
+        return [item for item in value if item]
+    return [value] if value else []
+
+
+def note_record(path, frontmatter):
+    """Index row for a note from its frontmatter."""
+    date_met = str(frontmatter.get('date met') or frontmatter.get('date') or '')
+    return {
+        "path": str(path),
+        "date": date_met[:10],
+        "time": str(frontmatter.get('time') or ''),
+        "title": Path(path).stem,
+        "client": str(frontmatter.get('client') or ''),
+        "project": str(frontmatter.get('project') or ''),
+        "tags": json.dumps(as_list(frontmatter.get('tags'))),
+        "participants": sorted({person_name(p) for p in as_list(frontmatter.get('participants'))} - {''}),
+    }
+
+
+def note_sections(path):
+    """Body of a note split into {"notes": text, "transcript": text}.
+
+    Everything after the frontmatter and before "## Transcript" counts as
+    meeting notes.
+    """
+    sections = {"notes": [], "transcript": []}
+    current = sections["notes"]
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        if f.readline().strip() == '---':
+            for line in f:
+                if line.strip() == '---':
+                    break
+        else:
+            f.seek(0)
+        for line in f:
+            if line.startswith('## Transcript'):
+                current = sections["transcript"]
+                continue
+            current.append(line)
+    return {name: ''.join(lines).strip() for name, lines in sections.items()}
+
+
+def remove_sections(db, path):
+    """Forget a note's sections.
+
+    FTS5 cannot drop rows from a contentless table without the original
+    text, so their index entries stay behind until compact() and are
+    filtered out by the join with `sections`.
+    """
+    db.execute("DELETE FROM sections WHERE path = ?", (str(path),))
+
+
+def index_sections(db, path):
+    """Add each non-empty section of a note to the full-text index."""
+    remove_sections(db, path)
+    for section, text in note_sections(path).items():
+        if not text:
+            continue
+        section_id = db.execute(
+            "INSERT INTO sections (path, section, words) VALUES (?, ?, ?)",
+            (str(path), section, len(text.split()))).lastrowid
+        db.execute("INSERT INTO section_text (rowid, body) VALUES (?, ?)", (section_id, text))
+
+
+def upsert_note(db, path, mtime=None):
+    """(Re)index one note."""
+    path = Path(path)
+    if mtime is None:
+        mtime = path.stat().st_mtime
+    record = note_record(path, read_frontmatter(path))
+
+    db.execute("DELETE FROM participants WHERE path = ?", (record["path"],))
+    db.execute(
+        "INSERT OR REPLACE INTO meetings (path, mtime, date, time, title, client, project, tags) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (record["path"], mtime, record["date"], record["time"], record["title"],
+         record["client"], record["project"], record["tags"]))
+    db.executemany(
+        "INSERT INTO participants (name, date, time, path) VALUES (?, ?, ?, ?)",
+        [(name, record["date"], record["time"], record["path"]) for name in record["participants"]])
+    index_sections(db, path)
+
+
+def remove_note(db, path):
+    """Drop a note that no longer exists."""
+    remove_sections(db, path)
+    db.execute("DELETE FROM participants WHERE path = ?", (str(path),))
+    db.execute("DELETE FROM meetings WHERE path = ?", (str(path),))
+
+
+def walk_notes(meetings_dir, folders):
+    """Paths of every note under meetings_dir, skipping hidden files and folders.
+
+    Each folder's mtime goes into folders before it is listed, so a note
+    added during the walk still changes a folder the next open checks.
+    """
+    pending = [str(meetings_dir)]
+    while pending:
+        folder = pending.pop()
+        mtime = os.stat(folder).st_mtime
+        folders[folder] = mtime if time.time() - mtime >= FOLDER_SETTLE_SECONDS else -1
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.endswith('.md') and entry.is_file():
+                    yield entry.path
+
+
+def refresh(db, meetings_dir):
+    """Bring the index in line with the folder, re-reading only changed notes.
+
+    Returns (updated, removed) counts.
+    """
+    known = dict(db.execute("SELECT path, mtime FROM meetings"))
+    folders = {}
+    updated = 0
+
+    for path in walk_notes(meetings_dir, folders):
+        mtime = os.stat(path).st_mtime
+        if known.pop(path, None) != mtime:
+            upsert_note(db, path, mtime)
+            updated += 1
+
+    for path in known:
+        remove_note(db, path)
+
+    db.execute("DELETE FROM folders")
+    db.executemany("INSERT INTO folders (path, mtime) VALUES (?, ?)", folders.items())
+    db.commit()
+    compact_if_stale(db)
+    return updated, len(known)
+
+
+def folders_changed(db, meetings_dir):
+    """True unless meetings_dir was walked last and no folder in it changed since.
+
+    Adding, removing or renaming a note changes its folder's mtime; editing
+    a note in place does not (see refresh_notes).
+    """
+    folders = dict(db.execute("SELECT path, mtime FROM folders"))
+    if str(meetings_dir) not in folders:
+        return True
+    for path, mtime in folders.items():
+        try:
+            if os.stat(path).st_mtime != mtime:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+def refresh_notes(db):
+    """Re-read indexed notes whose mtime changed, without listing any folder.
+
+    Returns (updated, removed) counts.
+    """
+    updated = removed = 0
+    for path, mtime in db.execute("SELECT path, mtime FROM meetings").fetchall():
+        try:
+            current = os.stat(path).st_mtime
+        except FileNotFoundError:
+            remove_note(db, path)
+            removed += 1
+            continue
+        if current != mtime:
+            upsert_note(db, path, current)
+            updated += 1
+
+    db.commit()
+    compact_if_stale(db)
+    return updated, removed
+
+
+def compact_if_stale(db):
+    """Rebuild the full-text index once stale entries outnumber live ones."""
+    if stale_sections(db) > db.execute("SELECT COUNT(*) FROM sections").fetchone()[0]:
+        compact(db)
+
+
+def stale_sections(db):
+    """Number of full-text entries left behind by edited or removed notes."""
+    indexed = db.execute("SELECT COUNT(*) FROM section_text").fetchone()[0]
+    return indexed - db.execute("SELECT COUNT(*) FROM sections").fetchone()[0]
+
+
+def compact(db):
+    """Rebuild the full-text index from the notes, dropping stale entries."""
+    db.execute("INSERT INTO section_text (section_text) VALUES ('delete-all')")
+    db.execute("DELETE FROM sections")
+    for (path,) in db.execute("SELECT path FROM meetings").fetchall():
+        try:
+            index_sections(db, path)
+        except OSError as e:
+            print(f"WARNING: Failed to index {path}: {e}", file=sys.stderr)
+    db.commit()
+    db.execute("INSERT INTO section_text (section_text) VALUES ('optimize')")
+    db.commit()
+
+
+def is_empty(db):
+    """True if no notes have been indexed yet."""
+    return db.execute("SELECT 1 FROM meetings LIMIT 1").fetchone() is None
+
+
+def previous_meeting(db, date_met, time_met, client='', project='', participants=(), exclude=None):
+    """Most recent earlier meeting with the same client/project or shared participants.
+
+    Every lookup is a range scan on a (key, date, time) index, so the cost
+    grows with log(meetings), not with the size of the vault.
+    Returns the note title (file stem) or None.
+    """
+    exclude = str(exclude or '')
+    before = (date_met, time_met or '')
+
+    # Same client or project is the strongest link
+    for column, value in (("client", client), ("project", project)):
+        if not value:
+            continue
+        row = db.execute(
+            f"SELECT title FROM meetings WHERE {column} = ? AND (date < ? OR (date = ? AND time < ?)) "
+            "AND path != ? ORDER BY date DESC, time DESC LIMIT 1",
+            (value, before[0], before[0], before[1], exclude)).fetchone()
+        if row:
+            return row[0]
+
+    # Otherwise the latest meeting shared with any distinctive participant
+    total = db.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+    best = None
+    for name in {person_name(p) for p in participants} - {''}:
+        count = db.execute("SELECT COUNT(*) FROM participants WHERE name = ?", (name,)).fetchone()[0]
+        if total >= 4 and count > total * COMMON_PARTICIPANT_SHARE:
+            continue
+        row = db.execute(
+            "SELECT date, time, path FROM participants WHERE name = ? "
+            "AND (date < ? OR (date = ? AND time < ?)) AND path != ? "
+            "ORDER BY date DESC, time DESC LIMIT 1",
+            (name, before[0], before[0], before[1], exclude)).fetchone()
+        if row and (best is None or row[:2] > best[:2]):
+            best = row
+
+    return Path(best[2]).stem if best else None
+
+
+def open_index(meetings_dir=None):
+    """Open the index, refreshed from the meetings folder by mtime.
+
+    Notes edited, added or deleted outside the pipeline are picked up on
+    every open. The folders are only walked again when one of their mtimes
+    changed; otherwise each indexed note costs one stat.
+    """
+    db = connect()
+    meetings_dir = meetings_dir or get_meetings_dir()
+    if Path(meetings_dir).exists():
+        first_use = is_empty(db)
+        if first_use or folders_changed(db, meetings_dir):
+            updated, removed = refresh(db, meetings_dir)
+        else:
+            updated, removed = refresh_notes(db)
+        if first_use:
+            print(f"INFO: Indexed {updated} existing meeting notes")
+        elif updated or removed:
+            print(f"INFO: Meeting index refreshed ({updated} updated, {removed} removed)")
+    return db
+
+
+def main():
+    """Refresh the index or look up a previous meeting."""
+    if "--refresh" in sys.argv:
+        db = connect()
+        updated, removed = refresh(db, get_meetings_dir())
+        count = db.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+        print(f"SUCCESS: Index refreshed ({updated} updated, {removed} removed)")
+        print(f"MEETING_COUNT={count}")
+        print(f"INDEX_FILE={INDEX_FILE}")
+        return 0
+
+    if "--compact" in sys.argv:
+        db = connect()
+        stale = stale_sections(db)
+        compact(db)
+        print(f"SUCCESS: Full-text index rebuilt ({stale} stale entries dropped)")
+        return 0
+
+    if "--previous" in sys.argv:
+        position = sys.argv.index("--previous")
+        if len(sys.argv) < position + 3:
+            print("ERROR: --previous requires a date and a time", file=sys.stderr)
+            sys.exit(1)
+        db = open_index()
+        participants = [p for p in option_value("--participants").split(',') if p.strip()]
+        previous = previous_meeting(
+            db, sys.argv[position + 1], sys.argv[position + 2],
+            option_value("--client"), option_value("--project"), participants)
+        print(f"PREVIOUS_MEETING={f'[[{previous}]]' if previous else ''}")
+        return 0
+
+    print("Usage: meeting_index.py --refresh | --compact", file=sys.stderr)
+    print("   Or: meeting_index.py --previous <date> <time> [--client C] [--project P] "
+          "[--participants \"A, B\"]", file=sys.stderr)
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Trigram index of the People folder for participant name normalisation.
+
+Indexes every person note by file name and frontmatter aliases, refreshes
+by file mtime before each query, and matches a batch of names in one go:
+exact name or alias, nickname, unique first or last name, then trigram
+similarity. Prints the same verification block as the people-normalizer
+agent, so the orchestrator can use either.
+
+Usage: people_index.py "<name>, <name>, ..." [--json]
+       people_index.py --refresh
+"""
+
+import os
+import re
+import sys
+import json
+import sqlite3
+from pathlib import Path
+
+from config import CACHE_DIR, get_people_dir
+from frontmatter import read_frontmatter
+
+
+INDEX_FILE = CACHE_DIR / "people.sqlite3"
+MIN_SCORE = 0.6  # Trigram similarity needed to accept a fuzzy match
+MIN_MARGIN = 0.1  # Best fuzzy match must beat the runner-up by this much
+NICKNAME_SCORE = 0.95  # Exact match after swapping a nickname
+PARTIAL_SCORE = 0.9  # Unique first-name or last-name match
+
+NICKNAMES = {
+    "mike": ["michael"], "bob": ["robert"], "rob": ["robert"], "jim": ["james"],
+    "bill": ["william"], "will": ["william"], "tom": ["thomas"], "beth": ["elizabeth"],
+    "liz": ["elizabeth"], "chris": ["christopher", "christine"], "dan": ["daniel"],
+    "matt": ["matthew"], "sam": ["samuel", "samantha"], "alex": ["alexander", "alexandra"],
+    "joe": ["joseph"], "dave": ["david"], "rick": ["richard"], "dick": ["richard"],
+    "steve": ["steven", "stephen"], "tony": ["anthony"], "andy": ["andrew"],
+    "nick": ["nicholas"], "kate": ["katherine", "catherine"], "jen": ["jennifer"],
+    "ben": ["benjamin"], "greg": ["gregory"], "jon": ["jonathan"], "pat": ["patrick", "patricia"],
+}
+
+NON_NAME = re.compile(r"[^\w\s'-]+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS people (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS names (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    person TEXT NOT NULL,
+    key TEXT NOT NULL,
+    first TEXT NOT NULL,
+    last TEXT NOT NULL,
+    gram_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS grams (
+    gram TEXT NOT NULL,
+    name_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS names_key ON names (key);
+CREATE INDEX IF NOT EXISTS names_first ON names (first);
+CREATE INDEX IF NOT EXISTS names_last ON names (last);
+CREATE INDEX IF NOT EXISTS names_path ON names (path);
+CREATE INDEX IF NOT EXISTS grams_gram ON grams (gram);
+CREATE INDEX IF NOT EXISTS grams_name ON grams (name_id);
+"""
+
+
+def connect(index_file=INDEX_FILE):
+    """Open the index, creating it if needed."""
+    Path(index_file).parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(str(index_file))
+    db.executescript(SCHEMA)
+    return db
+
+
+def name_key(name):
+    """Lower-cased name with punctuation dropped and spaces collapsed."""
+    return ' '.join(NON_NAME.sub(' ', name).lower().split())
+
+
+def trigrams(key):
+    """Set of character trigrams of a name key, padded at the word edges."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def note_names(path):
+    """File name plus frontmatter aliases of a person note."""
+    names = [Path(path).stem]
+    aliases = read_frontmatter(path).get('aliases') or []
+    if isinstance(aliases, str):
+        aliases = [aliases]
+    names.extend(alias for alias in aliases if alias)
+    return names
+
+
+def remove_person(db, path):
+    """Drop a note's names and trigrams from the index."""
+    db.execute("DELETE FROM grams WHERE name_id IN (SELECT id FROM names WHERE path = ?)", (path,))
+    db.execute("DELETE FROM names WHERE path = ?", (path,))
+    db.execute("DELETE FROM people WHERE path = ?", (path,))
+
+
+def index_person(db, path, mtime):
+    """(Re)index one person note."""
+    remove_person(db, path)
+    db.execute("INSERT INTO people (path, mtime) VALUES (?, ?)", (path, mtime))
+    person = Path(path).stem
+    for name in dict.fromkeys(note_names(path)):
+        key = name_key(name)
+        if not key:
+            continue
+        words = key.split()
+        grams = trigrams(key)
+        name_id = db.execute(
+            "INSERT INTO names (path, person, key, first, last, gram_count) VALUES (?, ?, ?, ?, ?, ?)",
+            (path, person, key, words[0], words[-1], len(grams))).lastrowid
+        db.executemany("INSERT INTO grams (gram, name_id) VALUES (?, ?)",
+                       [(gram, name_id) for gram in grams])
+
+
+def refresh(db, people_dir):
+    """Re-read only new or changed person notes. Returns (updated, removed) counts."""
+    known = dict(db.execute("SELECT path, mtime FROM people"))
+    updated = 0
+
+    for root, dirs, files in os.walk(people_dir):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in files:
+            if not name.endswith('.md') or name.startswith('.'):
+                continue
+            path = os.path.join(root, name)
+            mtime = os.stat(path).st_mtime
+            if known.pop(path, None) != mtime:
+                index_person(db, path, mtime)
+                updated += 1
+
+    for path in known:
+        remove_person(db, path)
+
+    db.commit()
+    return updated, len(known)
+
+
+def people_for(db, column, values):
+    """Distinct person names whose name/alias `column` is one of values."""
+    values = list(values)
+    marks = ','.join('?' * len(values))
+    rows = db.execute(f"SELECT DISTINCT person FROM names WHERE {column} IN ({marks})", values)
+    return sorted(row[0] for row in rows)
+
+
+def nickname_variants(key):
+    """The key plus versions with a nickname first name swapped for full names."""
+    words = key.split()
+    variants = [key]
+    for full in NICKNAMES.get(words[0], []):
+        variants.append(' '.join([full] + words[1:]))
+    return variants
+
+
+def fuzzy_matches(db, key):
+    """(score, person) pairs by trigram Dice similarity, best first, one per person."""
+    grams = trigrams(key)
+    marks = ','.join('?' * len(grams))
+    rows = db.execute(
+        f"SELECT n.person, 2.0 * COUNT(*) / (n.gram_count + ?) AS score "
+        f"FROM grams g JOIN names n ON n.id = g.name_id "
+        f"WHERE g.gram IN ({marks}) GROUP BY g.name_id ORDER BY score DESC",
+        [len(grams)] + list(grams))
+    best = {}
+    for person, score in rows:
+        best.setdefault(person, score)
+    return sorted(((score, person) for person, score in best.items()), reverse=True)
+
+
+def title_case(name):
+    """Title Case a name unless it already has deliberate capitalisation."""
+    name = ' '.join(name.split())
+    return name.title() if name.islower() or name.isupper() else name
+
+
+def find_person(db, key):
+    """Best person for a name key. Returns (person or None, score, ambiguous candidates)."""
+    variants = nickname_variants(key)
+
+    # Exact name or alias, then the same after swapping a nickname
+    for names, score in ((variants[:1], 1.0), (variants[1:], NICKNAME_SCORE)):
+        found = people_for(db, "key", names) if names else []
+        if len(found) == 1:
+            return found[0], score, []
+        if found:
+            return None, 0.0, found
+
+    # A lone first or last name counts only if exactly one person has it
+    if ' ' not in key:
+        found = sorted(set(people_for(db, "first", variants)) | set(people_for(db, "last", [key])))
+        if len(found) == 1:
+            return found[0], PARTIAL_SCORE, []
+        if found:
+            return None, 0.0, found
+
+    # Otherwise the closest name by trigrams, if it clearly wins
+    fuzzy = [(score, person) for score, person in fuzzy_matches(db, key) if score >= MIN_SCORE]
+    if fuzzy:
+        runner_up = fuzzy[1][0] if len(fuzzy) > 1 else 0.0
+        if fuzzy[0][0] - runner_up >= MIN_MARGIN:
+            return fuzzy[0][1], fuzzy[0][0], []
+        return None, 0.0, [person for _, person in fuzzy[:3]]
+
+    return None, 0.0, []
+
+
+def match_name(db, name):
+    """Normalise one name. Returns a dict with input, person, status, score and link."""
+    key = name_key(name)
+    person, score, candidates = find_person(db, key) if key else (None, 0.0, [])
+
+    result = {
+        "input": name,
+        "person": person or title_case(name),
+        "status": "matched" if person else "new",
+        "score": round(score, 3),
+    }
+    if candidates:
+        result["candidates"] = candidates
+    result["link"] = f"[[{result['person']}]]"
+    return result
+
+
+def normalise(names, people_dir=None):
+    """Refresh the index and normalise a batch of names."""
+    db = connect()
+    try:
+        refresh(db, people_dir or get_people_dir())
+        results = [match_name(db, name) for name in names]
+    finally:
+        db.close()
+    return results
+
+
+def split_names(args):
+    """Names from arguments, each of which may be a comma-separated list."""
+    names = [name.strip() for arg in args for name in arg.split(',')]
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def print_results(results):
+    """Per-name mapping plus the people-normalizer verification block."""
+    for result in results:
+        detail = f"{result['status']}, {result['score']:.2f}"
+        if result.get("candidates"):
+            detail += f"; ambiguous: {', '.join(result['candidates'])}"
+        print(f"  {result['input']} → {result['link']} ({detail})")
+
+    matched = sum(result["status"] == "matched" for result in results)
+    print()
+    print("=== PEOPLE-NORMALIZER VERIFICATION ===")
+    print(f"NAMES_PROCESSED: {len(results)}")
+    print(f"NAMES_MATCHED: {matched}")
+    print(f"NAMES_NEW: {len(results) - matched}")
+    print("STATUS: SUCCESS")
+    print("WIKI_LINK_LIST:")
+    for link in dict.fromkeys(result["link"] for result in results):
+        print(f"  - {link}")
+    print("=== END VERIFICATION ===")
+
+
+def main():
+    """Normalise names given on the command line, or refresh the index."""
+    if "--refresh" in sys.argv:
+        db = connect()
+        updated, removed = refresh(db, get_people_dir())
+        count = db.execute("SELECT COUNT(*) FROM people").fetchone()[0]
+        print(f"SUCCESS: Index refreshed ({updated} updated, {removed} removed)")
+        print(f"PEOPLE_COUNT={count}")
+        print(f"INDEX_FILE={INDEX_FILE}")
+        return 0
+
+    names = split_names(arg for arg in sys.argv[1:] if not arg.startswith('--'))
+    if not names:
+        print("Usage: people_index.py \"<name>, <name>, ...\" [--json]", file=sys.stderr)
+        print("   Or: people_index.py --refresh", file=sys.stderr)
+        sys.exit(1)
+
+    people_dir = get_people_dir()
+    if not people_dir.exists():
+        print(f"ERROR: People directory not found: {people_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    results = normalise(names, people_dir)
+
+    if "--json" in sys.argv:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return 0
+
+    print("=== Meeting Transcriber: Normalizing Names ===")
+    print_results(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Per-run pipeline state, so a failed meeting run can be resumed.
+
+Each run (keyed by its run ID, the timestamp from get_transcript.py) gets a
+state file recording which phases and which chunks completed and where
+their outputs are. chunk_transcript.py, reassemble_chunks.py and
+assemble_obsidian.py update it, and skip completed work with --resume.
+
+Usage: pipeline_state.py <run_id>
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+from pathlib import Path
+from datetime import datetime
+
+from config import CACHE_DIR
+
+
+RUNS_DIR = CACHE_DIR / "runs"
+PHASES = ("chunk", "reassemble", "assemble")
+# Recorded by check_fidelity.py; may land before or after reassembly in --watch mode
+FIDELITY_PHASE = "fidelity"
+AGENT_OUTPUTS = ("metadata", "people", "notes")
+RUN_MAX_AGE_DAYS = 7  # Run state not updated for this long is pruned
+
+
+def run_dir(run_id):
+    """Directory holding a run's state file and saved agent outputs."""
+    return RUNS_DIR / str(run_id)
+
+
+def state_path(run_id):
+    """Path of a run's state file."""
+    return run_dir(run_id) / "state.json"
+
+
+def load_state(run_id):
+    """Load a run's state, or a fresh empty state if there is none."""
+    try:
+        return json.loads(state_path(run_id).read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"WARNING: Ignoring unreadable run state for {run_id}: {e}", file=sys.stderr)
+    return {"run_id": str(run_id), "phases": {}, "chunks": {}}
+
+
+def save_state(state):
+    """Write a run's state atomically. Returns True on success."""
+    path = state_path(state["run_id"])
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    state["updated"] = datetime.now().isoformat(timespec='seconds')
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(state, indent=2), encoding='utf-8')
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        print(f"WARNING: Failed to save run state: {e}", file=sys.stderr)
+        return False
+
+
+def complete_phase(run_id, phase, **outputs):
+    """Record a phase as done, with the paths and values it produced."""
+    state = load_state(run_id)
+    state["phases"][phase] = {
+        "status": "done",
+        "completed": datetime.now().isoformat(timespec='seconds'),
+        **outputs,
+    }
+    return save_state(state)
+
+
+def reset_phase(run_id, phase):
+    """Forget a phase's completion, e.g. when its check fails on a later attempt."""
+    state = load_state(run_id)
+    if state["phases"].pop(phase, None) is None:
+        return True
+    return save_state(state)
+
+
+def completed_phase(state, phase):
+    """The recorded outputs of a completed phase, or None."""
+    entry = state["phases"].get(phase)
+    if entry and entry.get("status") == "done":
+        return entry
+    return None
+
+
+def record_chunks(run_id, statuses, chunks=None):
+    """Record chunk statuses ({chunk_num: status}) and, optionally, their paths."""
+    state = load_state(run_id)
+    by_num = {chunk["chunk_num"]: chunk for chunk in chunks or []}
+    for chunk_num, status in statuses.items():
+        entry = state["chunks"].setdefault(f"{chunk_num:03d}", {})
+        entry["status"] = status
+        if chunk_num in by_num:
+            entry["output_path"] = by_num[chunk_num]["output_path"]
+    return save_state(state)
+
+
+def agent_output_path(run_id, name):
+    """Where a run's saved agent output (metadata, people or notes) lives."""
+    return run_dir(run_id) / f"{name}.txt"
+
+
+def save_agent_output(run_id, name, text):
+    """Keep an agent's output with the run so assembly can be retried without it."""
+    path = agent_output_path(run_id, name)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+        return path
+    except Exception as e:
+        print(f"WARNING: Failed to save {name} output for resume: {e}", file=sys.stderr)
+        return None
+
+
+def load_agent_output(run_id, name):
+    """An agent output saved with save_agent_output, or None."""
+    try:
+        return agent_output_path(run_id, name).read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return None
+
+
+def prune_runs(max_age_days=RUN_MAX_AGE_DAYS):
+    """Delete the state of runs not updated for max_age_days. Returns how many were removed.
+
+    Finished runs keep their state for a while so --resume still reports the
+    saved note; abandoned runs would otherwise stay in the cache forever.
+    """
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    try:
+        directories = [entry for entry in RUNS_DIR.iterdir() if entry.is_dir()]
+    except FileNotFoundError:
+        return 0
+    for directory in directories:
+        try:
+            if directory.stat().st_mtime < cutoff:
+                shutil.rmtree(directory)
+                removed += 1
+        except OSError as e:
+            print(f"WARNING: Failed to remove old run state {directory}: {e}", file=sys.stderr)
+    return removed
+
+
+def next_phase(state):
+    """First phase that has not completed, or None when the run is finished."""
+    for phase in PHASES:
+        if not completed_phase(state, phase):
+            return phase
+    return None
+
+
+def main():
+    """Print a run's progress for the orchestrator."""
+    if len(sys.argv) < 2:
+        print("Usage: pipeline_state.py <run_id>", file=sys.stderr)
+        sys.exit(1)
+
+    run_id = sys.argv[1]
+    if not state_path(run_id).exists():
+        print(f"ERROR: No saved state for run {run_id}", file=sys.stderr)
+        sys.exit(1)
+
+    state = load_state(run_id)
+    print(f"=== Meeting Transcriber: Run {run_id} ===")
+
+    for phase in PHASES:
+        entry = completed_phase(state, phase)
+        print(f"PHASE_{phase.upper()}={'done' if entry else 'pending'}")
+        for key, value in (entry or {}).items():
+            if key not in ("status", "completed"):
+                print(f"  {key}: {value}")
+
+    pending = [num for num, chunk in sorted(state["chunks"].items())
+               if chunk.get("status") not in ("cleaned", "cached")]
+    print(f"CHUNKS_DONE={len(state['chunks']) - len(pending)}")
+    print(f"PENDING_CHUNKS={','.join(pending)}")
+
+    saved = [name for name in AGENT_OUTPUTS if agent_output_path(run_id, name).exists()]
+    print(f"SAVED_AGENT_OUTPUTS={','.join(saved)}")
+    print(f"NEXT_PHASE={next_phase(state) or 'none'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
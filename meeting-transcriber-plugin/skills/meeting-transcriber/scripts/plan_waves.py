@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Plan transcript-cleaner Task calls into explicit launch waves.
+
+The orchestrating agent can only launch a batch of Task calls per response
+and waits for the whole batch before launching the next, so each wave lasts
+as long as its longest chunk. Sorting chunks longest-first and filling each
+wave to the concurrency limit keeps the long chunks together and minimises
+the sum of wave durations (the critical path).
+"""
+
+import sys
+import json
+import heapq
+from pathlib import Path
+
+from expand_task_plan import is_task_plan, plan_params
+
+
+MAX_CONCURRENCY = 10  # Cleaning agents launched per response
+
+# Rough transcript-cleaner latency model: fixed agent start-up cost plus
+# time proportional to chunk length (~10-20s for a 500 word chunk).
+AGENT_OVERHEAD_SECONDS = 8.0
+SECONDS_PER_WORD = 0.02
+
+
+def predict_seconds(word_count):
+    """Predicted wall-clock time for one cleaner agent on a chunk."""
+    return AGENT_OVERHEAD_SECONDS + word_count * SECONDS_PER_WORD
+
+
+def plan_waves(chunk_words, max_concurrency=MAX_CONCURRENCY):
+    """Group chunks into waves, longest first.
+
+    chunk_words maps chunk number to word count. Returns a list of waves,
+    each a list of chunk numbers, with at most max_concurrency per wave.
+    """
+    ordered = sorted(chunk_words, key=lambda num: (-chunk_words[num], num))
+    return [ordered[i:i + max_concurrency] for i in range(0, len(ordered), max_concurrency)]
+
+
+def critical_path_seconds(waves, chunk_words):
+    """Predicted total time when each wave waits for its slowest chunk."""
+    return sum(max(predict_seconds(chunk_words[num]) for num in wave) for wave in waves if wave)
+
+
+def ideal_makespan_seconds(chunk_words, max_concurrency=MAX_CONCURRENCY):
+    """Predicted total time if a new agent started the moment one finished.
+
+    Longest-processing-time-first list scheduling; this is the lower bound
+    the waves are compared against.
+    """
+    slots = [0.0] * min(max_concurrency, max(1, len(chunk_words)))
+    for num in sorted(chunk_words, key=lambda n: -chunk_words[n]):
+        heapq.heappush(slots, heapq.heappop(slots) + predict_seconds(chunk_words[num]))
+    return max(slots)
+
+
+def print_plan(waves, chunk_words, max_concurrency):
+    """Print wave membership and the predicted critical path."""
+    for i, wave in enumerate(waves, 1):
+        longest = max(chunk_words[num] for num in wave)
+        chunks = ', '.join(f"{num:03d}" for num in wave)
+        print(f"INFO: Wave {i}: {len(wave)} chunks (longest {longest} words): {chunks}")
+
+    critical_path = critical_path_seconds(waves, chunk_words)
+    print(f"INFO: Predicted cleaning time: {critical_path:.0f}s over {len(waves)} waves "
+          f"(no-barrier lower bound {ideal_makespan_seconds(chunk_words, max_concurrency):.0f}s)")
+    print(f"WAVE_COUNT={len(waves)}")
+    print(f"CRITICAL_PATH_SECONDS={critical_path:.0f}")
+
+
+def main():
+    """Re-plan the waves of an existing task calls JSON file."""
+    if len(sys.argv) < 2:
+        print("Usage: plan_waves.py <task_calls_json> [max_concurrency]", file=sys.stderr)
+        sys.exit(1)
+
+    json_path = Path(sys.argv[1])
+    try:
+        max_concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else MAX_CONCURRENCY
+        if max_concurrency <= 0:
+            raise ValueError
+    except ValueError:
+        print("ERROR: max_concurrency must be a positive integer", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        data = json.loads(json_path.read_text(encoding='utf-8'))
+    except Exception as e:
+        print(f"ERROR: Failed to read task calls JSON: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if is_task_plan(data):
+        rows = {int(params['chunk_num']): row for params, row in zip(plan_params(data), data['params'])}
+        chunk_words = {int(params['chunk_num']): params['word_count'] for params in plan_params(data)}
+    else:
+        chunk_words = {int(num): words for num, words in data.get('chunk_words', {}).items()}
+    if not chunk_words:
+        print("INFO: No chunks to schedule")
+        print("WAVE_COUNT=0")
+        return 0
+
+    waves = plan_waves(chunk_words, max_concurrency)
+    print_plan(waves, chunk_words, max_concurrency)
+
+    # Calls (or plan rows) are stored in launch order, so reorder them to match
+    if is_task_plan(data):
+        data['params'] = [rows[num] for wave in waves for num in wave]
+    else:
+        old_order = [int(num) for wave in data.get('waves', []) for num in wave]
+        calls_by_num = dict(zip(old_order, data['task_calls']))
+        data['task_calls'] = [calls_by_num[num] for wave in waves for num in wave]
+    data['waves'] = [[f"{num:03d}" for num in wave] for wave in waves]
+    data['max_concurrency'] = max_concurrency
+    data['critical_path_seconds'] = round(critical_path_seconds(waves, chunk_words))
+
+    try:
+        json_path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+    except Exception as e:
+        print(f"ERROR: Failed to save task calls JSON: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"TASK_CALLS_JSON={json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Remove unambiguous filler words from a raw transcript before chunking.
+
+Runs between get_transcript.py and chunk_transcript.py. Words like "um" and
+"uh" can be removed exactly by a machine, so the transcript-cleaner agents
+receive smaller chunks and spend their tokens on grammar and punctuation.
+Speaker labels are never modified.
+"""
+
+import os
+import re
+import sys
+from pathlib import Path
+
+from chunk_transcript import SPEAKER_LABEL
+
+
+# Fillers that are never meaningful words in that language. Ambiguous ones
+# ("like", "so", "well") are left to the cleaner agents.
+FILLER_WORDS = {
+    'en': ['um', 'umm', 'uh', 'uhh', 'uhm', 'erm', 'hmm'],
+    'de': ['äh', 'ähm', 'öhm', 'hm', 'ähh'],
+    'fr': ['euh', 'heu', 'hum'],
+    'es': ['eh', 'ehm', 'em', 'mmm'],
+}
+
+# Phrase fillers are only removed when set off by commas ("it was, you know,
+# fine"), never inside a sentence ("do you know the answer").
+FILLER_PHRASES = {
+    'en': ['you know', 'I mean'],
+    'de': ['sozusagen', 'quasi'],
+    'fr': ['tu vois', 'vous voyez'],
+    'es': ['o sea', 'sabes'],
+}
+
+# Transcripts up to this size can skip the cleaning agents with --local-only
+LOCAL_ONLY_MAX_WORDS = 2000
+
+
+def case_variants(filler):
+    """A filler as written and with its first letter capitalised ("um", "Um").
+
+    Matching is case-sensitive, so acronyms such as "UM" are never removed.
+    """
+    return {filler, filler[0].upper() + filler[1:]}
+
+
+def build_filler_pattern(languages):
+    """Compile one matcher for all filler words and phrases of the languages."""
+    words = sorted({v for lang in languages for w in FILLER_WORDS[lang] for v in case_variants(w)},
+                   key=len, reverse=True)
+    phrases = sorted({v for lang in languages for p in FILLER_PHRASES[lang] for v in case_variants(p)},
+                     key=len, reverse=True)
+
+    word_alt = '|'.join(re.escape(w) for w in words)
+    phrase_alt = '|'.join(r'\s+'.join(re.escape(part) for part in p.split()) for p in phrases)
+
+    # A run of consecutive fillers ("um, uh,") is removed as one match
+    run = rf"(?:(?:{word_alt})(?![\w'’-])[,.!?…]*[ \t]*)+"
+    alternatives = [rf'(?P<run>{run})']
+    if phrase_alt:
+        alternatives.append(rf'(?P<phrase>(?:{phrase_alt}),[ \t]*)')
+
+    # pre captures what precedes the filler (and any sentence stop before it);
+    # next captures the letter after it so a sentence start can be recapitalised
+    return re.compile(
+        rf"(?P<pre>(?P<stop>[.!?…])?[ \t]+|,[ \t]*|^)(?:{'|'.join(alternatives)})(?P<next>[^\W\d_])?")
+
+
+def after_opening_word(text, end):
+    """True if text[:end] ends in a word that opens its sentence ("Well", "So")."""
+    start = end
+    while start > 0 and (text[start - 1].isalnum() or text[start - 1] in "'’-"):
+        start -= 1
+    if start == end:
+        return False
+    while start > 0 and text[start - 1].isspace():
+        start -= 1
+    return start == 0 or text[start - 1] in '.!?…'
+
+
+def make_replacer(counter):
+    """Build the re.sub callback; counter['removed'] tracks removed words."""
+
+    def replace(match):
+        pre = match.group('pre')
+        stop = match.group('stop') or ''
+        phrase = match.group('phrase')
+        following = match.group('next') or ''
+
+        if phrase is not None:
+            # Only strip comma-delimited phrases (or at the start of a line)
+            if pre and ',' not in pre:
+                return match.group(0)
+            counter['removed'] += len(phrase.split())
+            if not pre and phrase[0].isupper():
+                following = following.upper()
+            # "It was, you know, fine." -> "It was fine."; both commas go, but
+            # "Well, I mean, it's" keeps the comma after its opening word
+            if pre and after_opening_word(match.string, match.start()):
+                return ', ' + following
+            return (' ' if pre else '') + following
+
+        run = match.group('run')
+        counter['removed'] += len(run.split())
+
+        # A filler that opened a sentence hands its capital to the next word
+        if run[0].isupper() and (not pre or stop):
+            following = following.upper()
+
+        if not pre:
+            return following
+
+        # "need to, uh, discuss" -> "need to discuss"; "fine, um." -> "fine.";
+        # "So, um, we" -> "So, we"
+        sentence_end = '' if stop else next((c for c in run if c in '.!?…'), '')
+        if ',' in pre and (',' not in run or after_opening_word(match.string, match.start())):
+            sentence_end = sentence_end or ','
+        return stop + sentence_end + ' ' + following
+
+    return replace
+
+
+def preclean_line(line, pattern, replace):
+    """Remove fillers from one line, leaving any speaker label untouched.
+
+    A label only counts at the start of the line (see SPEAKER_LABEL), and
+    the whitespace after it is kept exactly as it was.
+    """
+    label = ''
+    label_match = SPEAKER_LABEL.match(line)
+    if label_match:
+        label = line[:label_match.end()]
+        line = line[label_match.end():]
+
+    body = line.rstrip('\n')
+    newline = line[len(body):]
+    # Text after the label (or at the start of a line) starts a sentence
+    text = body.lstrip()
+    lead = body[:len(body) - len(text)]
+    cleaned = pattern.sub(replace, text).rstrip()
+    if not cleaned:
+        return label + newline
+    return label + lead + cleaned + newline
+
+
+def preclean_file(input_file, output_file, languages=('en',)):
+    """Stream input_file to output_file with fillers removed.
+
+    Writes to a temp file next to output_file and renames it into place,
+    so input_file and output_file may be the same path.
+    Returns (words_before, words_removed).
+    """
+    pattern = build_filler_pattern(languages)
+    counter = {'removed': 0}
+    replace = make_replacer(counter)
+    words_before = 0
+
+    output_path = Path(output_file)
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+
+    try:
+        with open(input_file, 'r', encoding='utf-8') as src, \
+                open(tmp_path, 'w', encoding='utf-8') as dst:
+            for line in src:
+                words_before += len(line.split())
+                dst.write(preclean_line(line, pattern, replace))
+        os.replace(tmp_path, output_path)
+    except Exception as e:
+        print(f"ERROR: Failed to pre-clean transcript: {e}", file=sys.stderr)
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        sys.exit(1)
+
+    return words_before, counter['removed']
+
+
+def main():
+    """Main entry point."""
+    args = sys.argv[1:]
+    if not args or args[0].startswith('--'):
+        print("Usage: preclean_transcript.py <raw_file> [--lang en|de|fr|es|all] [--output <file>]", file=sys.stderr)
+        print("       [--local-only <cleaned_file>] [--local-only-max-words N]", file=sys.stderr)
+        sys.exit(1)
+
+    raw_file = args[0]
+    options = {}
+    i = 1
+    while i < len(args):
+        if not args[i].startswith('--') or i + 1 >= len(args):
+            print(f"ERROR: Unexpected argument: {args[i]}", file=sys.stderr)
+            sys.exit(1)
+        options[args[i]] = args[i + 1]
+        i += 2
+
+    lang = options.get('--lang', 'en')
+    languages = sorted(FILLER_WORDS) if lang == 'all' else [code.strip() for code in lang.split(',')]
+    unknown = [code for code in languages if code not in FILLER_WORDS]
+    if unknown:
+        print(f"ERROR: No filler table for language(s): {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        local_only_max = int(options.get('--local-only-max-words', LOCAL_ONLY_MAX_WORDS))
+    except ValueError:
+        print("ERROR: --local-only-max-words must be a number", file=sys.stderr)
+        sys.exit(1)
+
+    output_file = options.get('--output', raw_file)
+
+    print("=== Meeting Transcriber: Pre-cleaning Transcript ===")
+    words_before, words_removed = preclean_file(raw_file, output_file, languages)
+    words_after = words_before - words_removed
+    percent = (words_removed / words_before * 100) if words_before else 0.0
+
+    print(f"INFO: Removed {words_removed} filler words ({percent:.1f}%)")
+    print(f"WORDS_BEFORE={words_before}")
+    print(f"WORDS_AFTER={words_after}")
+    print(f"WORDS_REMOVED={words_removed}")
+    print(f"PRECLEANED_FILE={output_file}")
+
+    cleaned_file = options.get('--local-only')
+    if cleaned_file:
+        if words_after <= local_only_max:
+            try:
+                Path(cleaned_file).write_text(Path(output_file).read_text(encoding='utf-8'), encoding='utf-8')
+            except Exception as e:
+                print(f"ERROR: Failed to write cleaned transcript: {e}", file=sys.stderr)
+                sys.exit(1)
+            print("INFO: Short transcript - skipping cleaning agents")
+            print(f"CLEANED_FILE={cleaned_file}")
+            print("LOCAL_ONLY=true")
+        else:
+            print(f"INFO: {words_after} words is over the local-only limit ({local_only_max}); use cleaning agents")
+            print("LOCAL_ONLY=false")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
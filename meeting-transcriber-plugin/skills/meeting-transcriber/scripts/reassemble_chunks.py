@@ -3,10 +3,34 @@
 Reassemble cleaned transcript chunks into a single file.
 """
 
+import io
+import os
 import sys
 import re
+import json
+import time
 from pathlib import Path
 
+import chunk_cache
+import pipeline_state
+from chunk_transcript import CLEANER_PROMPT_VERSION, chunk_path, cleaned_chunk_path
+from config import option_value
+from workspace import remove_chunks
+
+
+POLL_SECONDS = 2.0  # How often --watch looks for new chunk outputs
+SETTLE_SECONDS = 1.0  # An output must be unchanged this long to count as finished
+WATCH_TIMEOUT = 1800  # Give up once no chunk has finished for 30 minutes
+
+
+# One precompiled filter for the status/report lines agents print around the text
+STATUS_LINE = re.compile(
+    r'\s*(?:Transcript Cleaning Complete|Input:|Output:|Word Count Analysis:|Status:'
+    r'|Quality improvements|Content preserved:|Original:.*words|Cleaned:.*words'
+    r'|Reduction:.*%|WARNING:|===)',
+    re.IGNORECASE
+)
+
 
 def read_chunk_file(chunk_file):
     """Read a single chunk file."""
@@ -17,122 +41,392 @@ def read_chunk_file(chunk_file):
         return None
 
 
-def extract_cleaned_content(agent_output):
-    """Extract the cleaned content from agent output (may have status messages)."""
-    # Agent output might include "Transcript Cleaning Complete" and stats
-    # We want just the cleaned text
-
-    # Remove any thinking/status messages
-    content = agent_output
-
-    # Remove lines that look like status reports
-    lines = content.split('\n')
-    cleaned_lines = []
-    skip_patterns = [
-        r'^Transcript Cleaning Complete',
-        r'^Input:',
-        r'^Output:',
-        r'^Word Count Analysis:',
-        r'^Status:',
-        r'^Quality improvements',
-        r'^Content preserved:',
-        r'^Original:.*words',
-        r'^Cleaned:.*words',
-        r'^Reduction:.*%',
-        r'^WARNING:',
-        r'^===',
-    ]
+def iter_cleaned_lines(lines):
+    """Filter status lines from agent output, streaming line by line.
+
+    Yields the remaining lines with leading and trailing whitespace of the
+    whole output removed, matching extract_cleaned_content.
+    """
+    started = False
+    pending = []  # Whitespace-only lines, held until more content follows
+    previous = None  # Last content line, held back so it can be right-stripped
 
     for line in lines:
-        # Skip status/report lines
-        if any(re.match(pattern, line.strip(), re.IGNORECASE) for pattern in skip_patterns):
+        if STATUS_LINE.match(line):
+            continue
+        if not line.strip():
+            if started:
+                pending.append(line)
             continue
-        cleaned_lines.append(line)
+        if previous is None:
+            line = line.lstrip()
+        else:
+            yield previous
+            yield from pending
+        pending = []
+        started = True
+        previous = line
 
-    return '\n'.join(cleaned_lines).strip()
+    if previous is not None:
+        yield previous.rstrip()
 
 
-def reassemble_chunks(chunk_outputs, cleaned_file):
-    """Reassemble cleaned chunks into single file."""
-    print("=== Meeting Transcriber: Reassembling Chunks ===")
+def extract_cleaned_content(agent_output):
+    """Extract the cleaned content from agent output (may have status messages)."""
+    return ''.join(iter_cleaned_lines(io.StringIO(agent_output)))
 
-    cleaned_sections = []
-    total_words = 0
 
-    for i, chunk_output in enumerate(chunk_outputs, 1):
-        if not chunk_output:
-            print(f"ERROR: Missing output for chunk {i}", file=sys.stderr)
-            return False
+def locate_chunk_output(chunk_num, input_path, output_path):
+    """Find the cleaned output for one chunk, or None if there is none.
 
-        # Extract just the cleaned text
-        cleaned_text = extract_cleaned_content(chunk_output)
+    Output the agents wrote is streamed from its file; chunks that were
+    cache hits at chunking time (no task call was emitted for them) are
+    read straight from the cache. Outputs are only added to the cache by
+    check_fidelity.py, once they pass, so nothing is cached here. The raw
+    chunk is only read to compute its key when there is no output file.
+    """
+    output_path = Path(output_path)
+    if output_path.exists():
+        return {"path": output_path}
 
-        if not cleaned_text:
-            print(f"WARNING: Chunk {i} is empty after extraction", file=sys.stderr)
-            continue
+    input_path = Path(input_path)
+    raw_text = read_chunk_file(input_path) if input_path.exists() else None
+    key = chunk_cache.cache_key(raw_text, CLEANER_PROMPT_VERSION) if raw_text is not None else None
+    if key and chunk_cache.contains(key):
+        print(f"INFO: Chunk {chunk_num}: using cached cleaned text")
+        return {"path": chunk_cache.entry_path(key)}
 
-        word_count = len(cleaned_text.split())
-        print(f"INFO: Chunk {i}: {word_count} words")
+    return None
 
-        cleaned_sections.append(cleaned_text)
-        total_words += word_count
 
-    if not cleaned_sections:
-        print("ERROR: No cleaned content to reassemble", file=sys.stderr)
+def collect_chunk_outputs(timestamp, chunk_count):
+    """Locate cleaned output for chunks 1..chunk_count of a run.
+
+    Returns a list of chunk sources with None for any chunk that has no
+    output anywhere.
+    """
+    return [locate_chunk_output(i, chunk_path(timestamp, i), cleaned_chunk_path(timestamp, i))
+            for i in range(1, chunk_count + 1)]
+
+
+def load_manifest(manifest_file):
+    """Read a chunk manifest written by chunk_transcript.py."""
+    try:
+        manifest = json.loads(Path(manifest_file).read_text(encoding='utf-8'))
+        manifest["chunks"].sort(key=lambda chunk: chunk["chunk_num"])
+        return manifest
+    except Exception as e:
+        print(f"ERROR: Failed to read manifest {manifest_file}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def manifest_chunk_outputs(manifest):
+    """Locate cleaned output for every chunk listed in a manifest."""
+    return [locate_chunk_output(chunk["chunk_num"], chunk["input_path"], chunk["output_path"])
+            for chunk in manifest["chunks"]]
+
+
+def report_missing(manifest, chunk_sources):
+    """Print each manifest chunk with no output. Returns the missing chunk numbers."""
+    missing = [chunk for chunk, source in zip(manifest["chunks"], chunk_sources) if source is None]
+    for chunk in missing:
+        print(f"ERROR: Missing output for chunk {chunk['chunk_num']}: expected "
+              f"{chunk['output_path']} ({chunk['word_count']} input words in {chunk['input_path']})",
+              file=sys.stderr)
+    missing_nums = [chunk["chunk_num"] for chunk in missing]
+    print(f"MISSING_CHUNKS={','.join(f'{num:03d}' for num in missing_nums)}")
+    return missing_nums
+
+
+def open_chunk(source):
+    """Open a chunk source ({"path": ...} or {"text": ...}) as a line iterator."""
+    if "text" in source:
+        return io.StringIO(source["text"])
+    return open(source["path"], 'r', encoding='utf-8')
+
+
+def write_chunk(source, out, separator):
+    """Stream one chunk's cleaned lines to out. Returns its word count.
+
+    The separator is written only once the chunk turns out to have content.
+    """
+    word_count = 0
+
+    with open_chunk(source) as lines:
+        for line in iter_cleaned_lines(lines):
+            if not word_count and separator:
+                out.write(separator)
+            out.write(line)
+            word_count += len(line.split())
+
+    return word_count
+
+
+def reassemble_chunks(chunk_sources, cleaned_file):
+    """Reassemble cleaned chunks into single file.
+
+    Chunks are processed one at a time and appended to a temporary file
+    next to cleaned_file, which replaces it once every chunk is written, so
+    memory stays flat however many chunks a meeting has.
+    """
+    print("=== Meeting Transcriber: Reassembling Chunks ===")
+
+    missing = [i for i, source in enumerate(chunk_sources, 1) if source is None]
+    if missing:
+        for i in missing:
+            print(f"ERROR: Missing output for chunk {i}", file=sys.stderr)
         return False
 
-    # Combine all chunks
-    complete_cleaned = '\n\n'.join(cleaned_sections)
+    cleaned_file = Path(cleaned_file)
+    tmp_file = cleaned_file.with_name(f".{cleaned_file.name}.{os.getpid()}.tmp")
+    sections = 0
+    total_words = 0
 
-    # Save to cleaned file
     try:
-        Path(cleaned_file).write_text(complete_cleaned, encoding='utf-8')
-        print(f"SUCCESS: Reassembled {len(cleaned_sections)} chunks")
-        print(f"INFO: Total cleaned transcript: {total_words} words")
-        print(f"OUTPUT: {cleaned_file}")
-        return True
+        with open(tmp_file, 'w', encoding='utf-8') as out:
+            for i, source in enumerate(chunk_sources, 1):
+                word_count = write_chunk(source, out, '\n\n' if sections else '')
+
+                if not word_count:
+                    print(f"WARNING: Chunk {i} is empty after extraction", file=sys.stderr)
+                    continue
+
+                print(f"INFO: Chunk {i}: {word_count} words")
+                sections += 1
+                total_words += word_count
+
+        if not sections:
+            print("ERROR: No cleaned content to reassemble", file=sys.stderr)
+            tmp_file.unlink()
+            return False
+
+        os.replace(tmp_file, cleaned_file)
     except Exception as e:
         print(f"ERROR: Failed to save reassembled transcript: {e}", file=sys.stderr)
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
         return False
 
+    print(f"SUCCESS: Reassembled {sections} chunks")
+    print(f"INFO: Total cleaned transcript: {total_words} words")
+    print(f"OUTPUT: {cleaned_file}")
+    return True
 
-def cleanup_chunk_files(timestamp):
-    """Clean up temporary chunk files."""
+
+def progress_path(cleaned_file):
+    """Path of the progress marker published next to the cleaned file."""
+    cleaned_file = Path(cleaned_file)
+    return cleaned_file.with_name(f"{cleaned_file.name}.progress.json")
+
+
+def write_progress(cleaned_file, chunks_done, chunk_count, words, size, complete=False):
+    """Atomically publish how much of the cleaned file is final.
+
+    Later stages may use the first `bytes` bytes of the cleaned file as soon
+    as they are published; they never change afterwards.
+    """
+    marker = progress_path(cleaned_file)
+    tmp_marker = marker.with_name(f".{marker.name}.{os.getpid()}.tmp")
+    tmp_marker.write_text(json.dumps({
+        "cleaned_file": str(cleaned_file),
+        "chunks_done": chunks_done,
+        "chunk_count": chunk_count,
+        "words": words,
+        "bytes": size,
+        "complete": complete,
+        "updated": time.time(),
+    }), encoding='utf-8')
+    os.replace(tmp_marker, marker)
+
+
+def output_ready(chunk):
+    """True once a manifest chunk's output exists and has stopped changing."""
     try:
-        chunk_pattern = f"/tmp/meeting-chunk-{timestamp}-*.md"
-        import glob
-        chunk_files = glob.glob(chunk_pattern)
+        stat = os.stat(chunk["output_path"])
+        return stat.st_size > 0 and time.time() - stat.st_mtime >= SETTLE_SECONDS
+    except FileNotFoundError:
+        return bool(chunk.get("cached")) and chunk_cache.contains(chunk["cache_key"])
+
+
+def watch_and_reassemble(manifest, cleaned_file, poll_seconds=POLL_SECONDS, timeout=WATCH_TIMEOUT):
+    """Reassemble progressively while the cleaning agents are still running.
+
+    Polls for chunk outputs and appends each contiguous run of finished
+    chunks to cleaned_file as soon as it is available, publishing a progress
+    marker after every append. Gives up when no chunk, in order or not, has
+    finished for timeout seconds. Returns True once every chunk is written.
+    """
+    print("=== Meeting Transcriber: Watching Chunk Outputs ===")
+
+    chunks = manifest["chunks"]
+    marker = progress_path(cleaned_file)
+    deadline = time.time() + timeout
+    finished_ahead = set()
+    next_chunk = 0
+    sections = 0
+    total_words = 0
+
+    try:
+        with open(cleaned_file, 'w', encoding='utf-8') as out:
+            write_progress(cleaned_file, 0, len(chunks), 0, 0)
+            print(f"PROGRESS_FILE={marker}")
+
+            while next_chunk < len(chunks):
+                appended = False
+                while next_chunk < len(chunks) and output_ready(chunks[next_chunk]):
+                    chunk = chunks[next_chunk]
+                    source = locate_chunk_output(chunk["chunk_num"], chunk["input_path"], chunk["output_path"])
+                    word_count = write_chunk(source, out, '\n\n' if sections else '')
+                    if word_count:
+                        sections += 1
+                        total_words += word_count
+                    else:
+                        print(f"WARNING: Chunk {chunk['chunk_num']} is empty after extraction", file=sys.stderr)
+                    next_chunk += 1
+                    appended = True
+
+                if appended:
+                    out.flush()
+                    size = os.fstat(out.fileno()).st_size
+                    write_progress(cleaned_file, next_chunk, len(chunks), total_words, size,
+                                   complete=next_chunk == len(chunks))
+                    print(f"INFO: Chunks 1-{next_chunk} of {len(chunks)} ready ({total_words} words)")
+                    deadline = time.time() + timeout
+                    continue
+
+                # A later chunk finishing first is progress too
+                ready = {chunk["chunk_num"] for chunk in chunks[next_chunk + 1:] if output_ready(chunk)}
+                if ready - finished_ahead:
+                    finished_ahead |= ready
+                    deadline = time.time() + timeout
+                elif time.time() > deadline:
+                    report_missing(manifest, [output_ready(chunk) or None for chunk in chunks])
+                    print(f"ERROR: No chunk finished in {timeout}s while waiting for chunk "
+                          f"{chunks[next_chunk]['chunk_num']}", file=sys.stderr)
+                    return False
+
+                time.sleep(poll_seconds)
+    except Exception as e:
+        print(f"ERROR: Failed to write reassembled transcript: {e}", file=sys.stderr)
+        return False
+
+    if not sections:
+        print("ERROR: No cleaned content to reassemble", file=sys.stderr)
+        return False
+
+    print(f"SUCCESS: Reassembled {sections} chunks")
+    print(f"INFO: Total cleaned transcript: {total_words} words")
+    print(f"OUTPUT: {cleaned_file}")
+    return True
 
-        for chunk_file in chunk_files:
-            Path(chunk_file).unlink()
 
-        print(f"INFO: Cleaned up {len(chunk_files)} chunk files")
+def cleanup_chunk_files(timestamp):
+    """Remove the run's chunk directory once check_fidelity.py has passed it.
+
+    In --watch mode reassembly usually finishes before the fidelity check
+    runs, so the raw and cleaned chunks are kept for it; the workspace,
+    chunks included, is removed after assembly either way.
+    """
+    state = pipeline_state.load_state(timestamp)
+    if not pipeline_state.completed_phase(state, pipeline_state.FIDELITY_PHASE):
+        print("INFO: Keeping chunk files until the fidelity check passes")
+        return
+    try:
+        removed = remove_chunks(timestamp)
+        print(f"INFO: Cleaned up {removed} chunk files")
     except Exception as e:
         print(f"WARNING: Failed to cleanup chunk files: {e}", file=sys.stderr)
 
 
+def record_chunk_statuses(timestamp, manifest, chunk_sources):
+    """Checkpoint which manifest chunks have output (cleaned) and which are missing."""
+    pipeline_state.record_chunks(timestamp, {
+        chunk["chunk_num"]: "missing" if source is None else "cleaned"
+        for chunk, source in zip(manifest["chunks"], chunk_sources)
+    }, manifest["chunks"])
+
+
+def reassembly_done(timestamp, cleaned_file):
+    """True if this run already reassembled into cleaned_file and it is still there."""
+    done = pipeline_state.completed_phase(pipeline_state.load_state(timestamp), "reassemble")
+    path = Path(cleaned_file)
+    return bool(done and done.get("cleaned_file") == str(cleaned_file)
+                and path.exists() and path.stat().st_size)
+
+
 def main():
     """Main entry point."""
+    # A finished run only needs <cleaned_file> <timestamp> to resume
+    if "--resume" in sys.argv:
+        sys.argv.remove("--resume")
+        if len(sys.argv) >= 3 and reassembly_done(sys.argv[2], sys.argv[1]):
+            print(f"INFO: Resuming run {sys.argv[2]}: reassembly already complete")
+            print(f"OUTPUT: {sys.argv[1]}")
+            print("=== Reassembly Complete ===")
+            return 0
+
     if len(sys.argv) < 4:
         print("Usage: reassemble_chunks.py <cleaned_file> <timestamp> <chunk_output_1> [chunk_output_2] ...", file=sys.stderr)
         print("  Or: reassemble_chunks.py <cleaned_file> <timestamp> --from-files <chunk_file_1> ...", file=sys.stderr)
+        print("  Or: reassemble_chunks.py <cleaned_file> <timestamp> --chunk-count <N>", file=sys.stderr)
+        print("  Or: reassemble_chunks.py <cleaned_file> <timestamp> --manifest <manifest_file> [--check]", file=sys.stderr)
+        print("  Or: reassemble_chunks.py <cleaned_file> <timestamp> --manifest <manifest_file> --watch "
+              "[--poll-seconds N] [--timeout N]", file=sys.stderr)
+        print("Add --resume to skip reassembly this run already completed.", file=sys.stderr)
         sys.exit(1)
 
     cleaned_file = sys.argv[1]
     timestamp = sys.argv[2]
 
     # Check if we're reading from files or receiving text directly
-    if sys.argv[3] == "--from-files":
-        # Read from chunk files
-        chunk_files = sys.argv[4:]
-        chunk_outputs = []
-        for chunk_file in chunk_files:
-            content = read_chunk_file(chunk_file)
-            if content:
-                chunk_outputs.append(content)
+    if sys.argv[3] == "--manifest":
+        # Find every chunk's output from the manifest written at chunking time
+        if len(sys.argv) < 5:
+            print("ERROR: --manifest requires a manifest file", file=sys.stderr)
+            sys.exit(1)
+        manifest = load_manifest(sys.argv[4])
+        if "--watch" in sys.argv:
+            try:
+                poll_seconds = float(option_value("--poll-seconds", POLL_SECONDS))
+                timeout = float(option_value("--timeout", WATCH_TIMEOUT))
+            except ValueError as e:
+                print(f"ERROR: Invalid number: {e}", file=sys.stderr)
+                sys.exit(1)
+            success = watch_and_reassemble(manifest, cleaned_file, poll_seconds, timeout)
+            record_chunk_statuses(timestamp, manifest,
+                                  [output_ready(chunk) or None for chunk in manifest["chunks"]])
+            if not success:
+                sys.exit(1)
+            pipeline_state.complete_phase(timestamp, "reassemble", cleaned_file=str(cleaned_file))
+            cleanup_chunk_files(timestamp)
+            print("=== Reassembly Complete ===")
+            return 0
+        chunk_outputs = manifest_chunk_outputs(manifest)
+        record_chunk_statuses(timestamp, manifest, chunk_outputs)
+        missing = report_missing(manifest, chunk_outputs)
+        if missing:
+            print(f"ERROR: {len(missing)} of {len(chunk_outputs)} chunks have no output", file=sys.stderr)
+            sys.exit(1)
+        if "--check" in sys.argv:
+            print(f"SUCCESS: All {len(chunk_outputs)} chunk outputs present")
+            return 0
+    elif sys.argv[3] == "--chunk-count":
+        # Read each chunk's cleaned output file, falling back to the cache
+        try:
+            chunk_count = int(sys.argv[4])
+        except (IndexError, ValueError):
+            print("ERROR: --chunk-count requires a number", file=sys.stderr)
+            sys.exit(1)
+        chunk_outputs = collect_chunk_outputs(timestamp, chunk_count)
+    elif sys.argv[3] == "--from-files":
+        # Stream from chunk files
+        chunk_outputs = [{"path": Path(chunk_file)} if Path(chunk_file).exists() else None
+                         for chunk_file in sys.argv[4:]]
     else:
         # Chunk outputs provided as arguments
-        chunk_outputs = sys.argv[3:]
+        chunk_outputs = [{"text": output} if output else None for output in sys.argv[3:]]
 
     if not chunk_outputs:
         print("ERROR: No chunk outputs provided", file=sys.stderr)
@@ -144,6 +438,8 @@ def main():
     if not success:
         sys.exit(1)
 
+    pipeline_state.complete_phase(timestamp, "reassemble", cleaned_file=str(cleaned_file))
+
     # Cleanup chunk files
     cleanup_chunk_files(timestamp)
 
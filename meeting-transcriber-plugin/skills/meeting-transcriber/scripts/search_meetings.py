@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Search meeting notes and transcripts through the meeting index.
+
+Answers "which meetings mentioned X" from the full-text index kept by
+meeting_index.py, instead of grepping every note in the vault. The index is
+refreshed by file mtime before each search.
+
+Usage: search_meetings.py <query> [--phrase] [--from YYYY-MM-DD] [--to YYYY-MM-DD]
+                          [--section notes|transcript] [--limit N] [--json]
+
+Words in the query must all appear; "quoted words" must appear as a phrase.
+--phrase treats the whole query as one phrase.
+"""
+
+import re
+import sys
+import json
+from datetime import datetime
+
+import meeting_index
+from config import get_meetings_dir, option_value
+
+
+DEFAULT_LIMIT = 20
+SECTIONS = ("notes", "transcript")
+QUERY_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def fts_phrase(text):
+    """Quote text as an FTS5 phrase, so operators and punctuation are literal."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def build_match(query, phrase=False):
+    """FTS5 MATCH expression for a user query (all terms required)."""
+    if phrase:
+        return fts_phrase(query.replace('"', ' ').strip())
+    terms = [quoted or word for quoted, word in QUERY_TERM.findall(query)]
+    return ' '.join(fts_phrase(term) for term in terms if term.strip())
+
+
+def search(db, match, date_from='', date_to='', section=None, limit=DEFAULT_LIMIT):
+    """Best-ranked sections matching an FTS5 expression within a date range."""
+    sql = ("SELECT m.date, m.time, m.title, s.section, m.path, bm25(section_text) AS score "
+           "FROM section_text "
+           "JOIN sections s ON s.id = section_text.rowid "
+           "JOIN meetings m ON m.path = s.path "
+           "WHERE section_text MATCH ? AND m.date >= ? AND m.date <= ?")
+    params = [match, date_from or '', date_to or '9999-12-31']
+    if section:
+        sql += " AND s.section = ?"
+        params.append(section)
+    sql += " ORDER BY score LIMIT ?"
+    params.append(limit)
+
+    keys = ("date", "time", "title", "section", "path", "score")
+    return [dict(zip(keys, row)) for row in db.execute(sql, params)]
+
+
+def check_date(name, value):
+    """Exit with an error unless value is empty or YYYY-MM-DD."""
+    if value:
+        try:
+            datetime.strptime(value, "%Y-%m-%d")
+        except ValueError:
+            print(f"ERROR: {name} must be a date like 2026-01-31", file=sys.stderr)
+            sys.exit(1)
+    return value
+
+
+def query_text(argv):
+    """Positional arguments (not options or their values) joined into the query."""
+    with_values = {"--from", "--to", "--section", "--limit"}
+    words = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in with_values:
+            skip = True
+        elif not arg.startswith('--'):
+            words.append(arg)
+    return ' '.join(words)
+
+
+def main():
+    """Search the meeting index and print matching meetings."""
+    query = query_text(sys.argv[1:])
+    match = build_match(query, "--phrase" in sys.argv)
+    if not match:
+        print("Usage: search_meetings.py <query> [--phrase] [--from YYYY-MM-DD] [--to YYYY-MM-DD] "
+              "[--section notes|transcript] [--limit N] [--json]", file=sys.stderr)
+        sys.exit(1)
+
+    date_from = check_date("--from", option_value("--from"))
+    date_to = check_date("--to", option_value("--to"))
+    section = option_value("--section") or None
+    if section and section not in SECTIONS:
+        print(f"ERROR: --section must be one of: {', '.join(SECTIONS)}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        limit = int(option_value("--limit", DEFAULT_LIMIT))
+    except ValueError:
+        print("ERROR: --limit requires a number", file=sys.stderr)
+        sys.exit(1)
+
+    db = meeting_index.connect()
+    try:
+        meeting_index.refresh(db, get_meetings_dir())
+        results = search(db, match, date_from, date_to, section, limit)
+    except Exception as e:
+        print(f"ERROR: Search failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        db.close()
+
+    if "--json" in sys.argv:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"=== Meeting Transcriber: Search {match} ===")
+    for result in results:
+        print(f"  {result['date']} {result['time']:5}  [[{result['title']}]]  ({result['section']})")
+    print(f"RESULT_COUNT={len(results)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Speaker-turn index of a raw transcript.
+
+Built by chunk_transcript.py while it streams the transcript, and saved as a
+small JSON sidecar. Metadata extraction and name normalisation can read the
+participant list and per-speaker stats from it instead of re-reading the
+whole raw transcript.
+"""
+
+import re
+import sys
+import json
+from pathlib import Path
+
+from workspace import workspace_dir
+
+
+INDEX_VERSION = 1
+
+# Timestamps like 12:34, 1:02:03, 100:00:00 or 00:01:02.500 near the start of a turn
+TIMESTAMP = re.compile(r'\b(?:\d+:)?\d{1,2}:\d{2}(?:[.,]\d{1,3})?\b')
+
+
+def index_path(timestamp):
+    """Path of the speaker index sidecar for a run."""
+    return workspace_dir(timestamp) / "speakers.json"
+
+
+class SpeakerIndex:
+    """Accumulates speaker turns line by line.
+
+    Each turn is stored as [byte_offset, speaker_id, word_count, timestamp]
+    where byte_offset is where the turn starts in the raw transcript file.
+    label_pattern must be anchored and capture the name as "speaker" (see
+    chunk_transcript.SPEAKER_LABEL). A turn ends at its paragraph; text in
+    an unlabelled paragraph is counted as unattributed, not given to the
+    previous speaker.
+    """
+
+    def __init__(self, label_pattern):
+        self.label_pattern = label_pattern
+        self.speakers = []
+        self.speaker_ids = {}
+        self.turns = []
+        self.current = None
+        self.unattributed_words = 0
+
+    def add_line(self, offset, line):
+        """Feed one transcript line and its byte offset in the file."""
+        if not line.strip():
+            self.current = None
+            return
+
+        match = self.label_pattern.match(line)
+        if match:
+            name = match.group('speaker')
+            speaker_id = self.speaker_ids.get(name)
+            if speaker_id is None:
+                speaker_id = self.speaker_ids[name] = len(self.speakers)
+                self.speakers.append(name)
+            stamp = TIMESTAMP.search(line, 0, match.end())
+            self.current = [offset, speaker_id, len(line[match.end():].split()),
+                            stamp.group(0) if stamp else None]
+            self.turns.append(self.current)
+        elif self.current is not None:
+            self.current[2] += len(line.split())
+        else:
+            self.unattributed_words += len(line.split())
+
+    def to_dict(self, source=None):
+        """Compact JSON-serialisable form of the index."""
+        return {
+            "version": INDEX_VERSION,
+            "source": str(source) if source else None,
+            "speakers": self.speakers,
+            "turn_columns": ["offset", "speaker", "words", "timestamp"],
+            "turns": self.turns,
+            "unattributed_words": self.unattributed_words,
+        }
+
+    def save(self, path, source=None):
+        """Write the index sidecar. Returns the path as a string."""
+        try:
+            Path(path).write_text(
+                json.dumps(self.to_dict(source), separators=(',', ':')),
+                encoding='utf-8'
+            )
+            return str(path)
+        except Exception as e:
+            print(f"WARNING: Failed to save speaker index: {e}", file=sys.stderr)
+            return None
+
+
+def load_index(path):
+    """Load a speaker index sidecar."""
+    return json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def speaker_stats(index):
+    """Per-speaker turn count, word count, share of words and time range."""
+    stats = [{"speaker": name, "turns": 0, "words": 0, "first_timestamp": None,
+              "last_timestamp": None} for name in index["speakers"]]
+
+    for _, speaker_id, words, stamp in index["turns"]:
+        entry = stats[speaker_id]
+        entry["turns"] += 1
+        entry["words"] += words
+        if stamp:
+            entry["first_timestamp"] = entry["first_timestamp"] or stamp
+            entry["last_timestamp"] = stamp
+
+    total_words = sum(entry["words"] for entry in stats) or 1
+    for entry in stats:
+        entry["share_percent"] = round(entry["words"] * 100 / total_words, 1)
+
+    return sorted(stats, key=lambda entry: -entry["words"])
+
+
+def participants(index, min_turns=1):
+    """Distinct speakers in order of first appearance."""
+    counts = [0] * len(index["speakers"])
+    for _, speaker_id, _, _ in index["turns"]:
+        counts[speaker_id] += 1
+    return [name for name, count in zip(index["speakers"], counts) if count >= min_turns]
+
+
+def main():
+    """Print participants or speaker stats from an index sidecar."""
+    if len(sys.argv) < 2:
+        print("Usage: speaker_index.py <index_file> [--stats] [--min-turns N]", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        index = load_index(sys.argv[1])
+    except Exception as e:
+        print(f"ERROR: Failed to read speaker index: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    min_turns = 1
+    if "--min-turns" in sys.argv:
+        try:
+            min_turns = int(sys.argv[sys.argv.index("--min-turns") + 1])
+        except (IndexError, ValueError):
+            print("ERROR: --min-turns requires a number", file=sys.stderr)
+            sys.exit(1)
+
+    if "--stats" in sys.argv:
+        for entry in speaker_stats(index):
+            if entry["turns"] < min_turns:
+                continue
+            span = ""
+            if entry["first_timestamp"]:
+                span = f", {entry['first_timestamp']}-{entry['last_timestamp']}"
+            print(f"SPEAKER={entry['speaker']}: {entry['turns']} turns, "
+                  f"{entry['words']} words ({entry['share_percent']}%){span}")
+
+    names = participants(index, min_turns)
+    print(f"PARTICIPANT_COUNT={len(names)}")
+    print(f"PARTICIPANTS={', '.join(names)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
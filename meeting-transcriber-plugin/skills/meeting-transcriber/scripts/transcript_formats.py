@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Parsers for caption and meeting-tool transcript exports.
+
+Reads WebVTT, SRT and Zoom/Teams JSON exports into (start, end, speaker,
+text) cues, merges consecutive cues from the same speaker into turns, and
+writes them as "[00:01:23] Speaker: text" paragraphs, one per turn, which
+the chunker and speaker index read as speaker labels. Cue numbers, per-cue
+timing lines and markup are dropped, which is most of a caption file.
+JSON exports are read incrementally, one cue object at a time.
+
+Usage: transcript_formats.py <input_file> <output_file>
+"""
+
+import os
+import re
+import sys
+import json
+import html
+from pathlib import Path
+
+
+TIMING_LINE = re.compile(
+    r'^\s*((?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3})\s*-->\s*((?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3})'
+)
+VOICE_TAG = re.compile(r'<v(?:\.[^ >]*)?\s+([^>]+)>')
+MARKUP = re.compile(r'<[^>]*>')
+# "Jane Doe: text" at the start of a cue; at most four words, so prose with a colon is left alone
+SPEAKER_PREFIX = re.compile(r"^([A-Z][\w.'-]*(?: [A-Z0-9][\w.'-]*){0,3}):\s+(.*)$")
+SRT_INDEX = re.compile(r'^\s*\d+\s*$')
+JSON_START = re.compile(r'^(?:\{|\[\s*[\[{])')  # Cheap pre-check before a trial parse
+
+# Key names used for the same field by different JSON exports
+JSON_SPEAKER_KEYS = ("speaker", "speakerName", "speaker_name", "speakerDisplayName", "displayName", "username", "name")
+JSON_TEXT_KEYS = ("text", "content", "transcript", "caption", "displayText")
+JSON_START_KEYS = ("start", "startTime", "start_time", "startOffset", "ts", "offset")
+JSON_END_KEYS = ("end", "endTime", "end_time", "endOffset", "end_ts")
+SNIFF_BYTES = 4096
+JSON_SNIFF_CHARS = 1024 * 1024  # A JSON export must yield a cue within this much text
+JSON_BLOCK_CHARS = 64 * 1024  # Read size for JSON exports
+MAX_CUE_CHARS = 64 * 1024  # Objects larger than this are containers, not cues
+
+
+def detect_format(path):
+    """'vtt', 'srt', 'json' or 'text', from the extension or the start of the file.
+
+    Files without a .json extension only count as JSON if a cue can actually
+    be parsed from them, so a transcript that opens with "{laughs}" is text.
+    """
+    if Path(path).suffix.lower() == '.json':
+        return 'json'
+    try:
+        with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+            head = f.read(SNIFF_BYTES)
+    except OSError:
+        return 'text'
+
+    start = head.lstrip()
+    if start.startswith('WEBVTT'):
+        return 'vtt'
+    if JSON_START.match(start) and parses_as_json_export(path):
+        return 'json'
+    lines = start.splitlines()
+    if len(lines) >= 2 and SRT_INDEX.match(lines[0]) and TIMING_LINE.match(lines[1]):
+        return 'srt'
+    return 'text'
+
+
+def parse_timestamp(value):
+    """Seconds from "01:02:03.456", "02:03,456", "00:00:03.6300000" or a number."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().replace(',', '.')
+    try:
+        seconds = 0.0
+        for part in text.split(':'):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    except ValueError:
+        return None
+
+
+def clean_cue_text(lines):
+    """Speaker and plain text of a cue's payload lines (voice tags and markup removed)."""
+    speaker = None
+    parts = []
+    for line in lines:
+        voice = VOICE_TAG.search(line)
+        if voice and speaker is None:
+            speaker = voice.group(1).strip()
+        text = html.unescape(MARKUP.sub('', line)).strip()
+        if text:
+            parts.append(text)
+    text = ' '.join(parts)
+
+    if speaker is None:
+        prefix = SPEAKER_PREFIX.match(text)
+        if prefix:
+            speaker, text = prefix.group(1), prefix.group(2)
+    return speaker, text
+
+
+def iter_blocks(lines):
+    """Blank-line separated blocks of stripped lines."""
+    block = []
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line.strip():
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def iter_caption_cues(lines):
+    """(start, end, speaker, text) cues from WebVTT or SRT lines, one block at a time.
+
+    Blocks without a timing line (the WEBVTT header, NOTE, STYLE and REGION
+    blocks) are skipped; cue identifiers and SRT indexes before the timing
+    line are ignored.
+    """
+    for block in iter_blocks(lines):
+        for i, line in enumerate(block):
+            timing = TIMING_LINE.match(line)
+            if timing:
+                speaker, text = clean_cue_text(block[i + 1:])
+                if text:
+                    yield (parse_timestamp(timing.group(1)), parse_timestamp(timing.group(2)), speaker, text)
+                break
+
+
+def first_key(entry, keys):
+    """Value of the first of keys present in a dict, or None."""
+    for key in keys:
+        if entry.get(key) not in (None, ''):
+            return entry[key]
+    return None
+
+
+def object_end(buf, start):
+    """Index just past the JSON object opening at buf[start], or None if not in buf."""
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(buf)):
+        c = buf[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif c == '\\':
+                escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
+
+
+def iter_cue_objects(f, limit=None):
+    """Cue dicts from the first JSON array of cue objects, read block by block.
+
+    Walks the JSON structure without building it. Each object inside an
+    array that closes within MAX_CUE_CHARS is decoded on its own; if it has
+    a text field it is a cue, otherwise (like any larger object) it is
+    descended into. Stops when the array holding the cues closes, so memory
+    stays around one block whatever the export size. limit caps the
+    characters read, for sniffing.
+    """
+    buf = ''
+    pos = 0
+    read = 0
+    stack = []
+    in_string = False
+    escaped = False
+    cue_depth = None
+
+    def more():
+        nonlocal buf, pos, read
+        size = JSON_BLOCK_CHARS if limit is None else min(JSON_BLOCK_CHARS, limit - read)
+        data = f.read(size) if size > 0 else ''
+        if not data:
+            return False
+        read += len(data)
+        buf = buf[pos:] + data
+        pos = 0
+        return True
+
+    while True:
+        if pos >= len(buf) and not more():
+            if stack and limit is None:
+                raise ValueError("JSON export ends before its cue list is closed")
+            return
+        c = buf[pos]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif c == '\\':
+                escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == '{' and stack and stack[-1] == '[':
+            end = object_end(buf, pos)
+            while end is None and len(buf) - pos <= MAX_CUE_CHARS and more():
+                end = object_end(buf, pos)
+            if end is not None:
+                entry = json.loads(buf[pos:end])
+                if first_key(entry, JSON_TEXT_KEYS) is not None:
+                    cue_depth = len(stack)
+                    yield entry
+                    pos = end
+                    continue
+            stack.append(c)
+        elif c in '[{':
+            stack.append(c)
+        elif c in ']}':
+            if not stack or stack.pop() != ('[' if c == ']' else '{'):
+                raise ValueError("unbalanced JSON")
+            if cue_depth is not None and len(stack) < cue_depth:
+                return
+        pos += 1
+
+
+def iter_json_cues(path, limit=None):
+    """(start, end, speaker, text) cues from a Zoom or Teams JSON export."""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        for entry in iter_cue_objects(f, limit):
+            text = first_key(entry, JSON_TEXT_KEYS)
+            if not isinstance(text, str) or not text.strip():
+                continue
+            speaker = first_key(entry, JSON_SPEAKER_KEYS)
+            if isinstance(speaker, dict):
+                speaker = first_key(speaker, ("name", "displayName"))
+            start = first_key(entry, JSON_START_KEYS)
+            end = first_key(entry, JSON_END_KEYS)
+            yield (parse_timestamp(start) if start is not None else None,
+                   parse_timestamp(end) if end is not None else None,
+                   str(speaker).strip() if speaker else None,
+                   ' '.join(html.unescape(MARKUP.sub('', text)).split()))
+
+
+def parses_as_json_export(path):
+    """True if a transcript cue can be parsed from the start of the file."""
+    try:
+        return next(iter_json_cues(path, JSON_SNIFF_CHARS), None) is not None
+    except (OSError, ValueError):
+        return False
+
+
+def merge_turns(cues):
+    """Merge consecutive cues from the same speaker into (start, end, speaker, text) turns.
+
+    Rolling captions repeat the previous cue's text; an exact repeat from the
+    same speaker is dropped. The same words from another speaker ("Okay."
+    answered with "Okay.") are a turn of their own.
+    """
+    turn = None
+    for start, end, speaker, text in cues:
+        if turn and turn[2] == speaker:
+            if text != turn[3][-1]:
+                turn[3].append(text)
+            turn[1] = end if end is not None else turn[1]
+            continue
+        if turn:
+            yield (turn[0], turn[1], turn[2], ' '.join(turn[3]))
+        turn = [start, end, speaker, [text]]
+    if turn:
+        yield (turn[0], turn[1], turn[2], ' '.join(turn[3]))
+
+
+def open_lines(path):
+    """Lines of a text file, read lazily and closed when exhausted."""
+    with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        yield from f
+
+
+def iter_cues(path, fmt=None):
+    """Cues from a transcript export of the given (or detected) format."""
+    fmt = fmt or detect_format(path)
+    if fmt == 'json':
+        return iter_json_cues(path)
+    if fmt in ('vtt', 'srt'):
+        return iter_caption_cues(open_lines(path))
+    raise ValueError(f"not a caption or JSON transcript export: {path}")
+
+
+def format_timestamp(seconds):
+    """"01:02:03" for a number of seconds."""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def speaker_label(name):
+    """A parsed speaker name as the chunker reads it after a turn time.
+
+    Exports name speakers "Jane Doe (Guest)", "jsmith" or in any script; the
+    name is kept, only squeezed onto one line without colons, capped at 64
+    characters and made to start with a letter ("1234" -> "Speaker 1234").
+    """
+    name = ' '.join(str(name).replace(':', ' ').split())
+    if name and not name[0].isalpha():
+        name = f"Speaker {name}"
+    return name[:64].rstrip() or None
+
+
+def format_turn(start, speaker, text):
+    """One turn as a transcript paragraph: "[00:01:23] Speaker: text"."""
+    speaker = speaker_label(speaker) if speaker else None
+    line = f"{speaker}: {text}" if speaker else text
+    return f"[{format_timestamp(start)}] {line}" if start is not None else line
+
+
+def convert_file(input_file, output_file, fmt=None):
+    """Write an export as "[start] Speaker: text" paragraphs, one per merged turn.
+
+    Writes to a temp file next to output_file and renames it into place, so
+    input_file and output_file may be the same path.
+    Returns a stats dict (format, cues, turns, words, speakers).
+    """
+    fmt = fmt or detect_format(input_file)
+    stats = {"format": fmt, "cues": 0, "turns": 0, "words": 0, "speakers": set()}
+
+    def counted(cues):
+        for cue in cues:
+            stats["cues"] += 1
+            yield cue
+
+    output_path = Path(output_file)
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as out:
+            for start, _, speaker, text in merge_turns(counted(iter_cues(input_file, fmt))):
+                speaker = speaker_label(speaker) if speaker else None
+                if stats["turns"]:
+                    out.write('\n\n')
+                out.write(format_turn(start, speaker, text))
+                stats["turns"] += 1
+                stats["words"] += len(text.split())
+                if speaker:
+                    stats["speakers"].add(speaker)
+            out.write('\n')
+        os.replace(tmp_path, output_path)
+    except Exception:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+    stats["speakers"] = sorted(stats["speakers"])
+    return stats
+
+
+def main():
+    """Convert a caption or JSON transcript export to speaker-turn text."""
+    if len(sys.argv) < 3:
+        print("Usage: transcript_formats.py <input_file> <output_file>", file=sys.stderr)
+        sys.exit(1)
+
+    input_file, output_file = sys.argv[1], sys.argv[2]
+    fmt = detect_format(input_file)
+    if fmt == 'text':
+        print(f"ERROR: {input_file} is not a WebVTT, SRT or JSON transcript export", file=sys.stderr)
+        sys.exit(1)
+
+    print("=== Meeting Transcriber: Converting Transcript Export ===")
+    try:
+        stats = convert_file(input_file, output_file, fmt)
+    except Exception as e:
+        print(f"ERROR: Failed to convert {input_file}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"INFO: {stats['cues']} cues merged into {stats['turns']} speaker turns")
+    print(f"FORMAT={stats['format']}")
+    print(f"TURN_COUNT={stats['turns']}")
+    print(f"WORD_COUNT={stats['words']}")
+    print(f"SPEAKERS={', '.join(stats['speakers'])}")
+    print(f"OUTPUT_FILE={output_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
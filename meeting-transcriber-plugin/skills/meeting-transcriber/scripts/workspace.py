@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Per-run workspace directories for intermediate files.
+
+Every run (keyed by its run ID) keeps its raw and cleaned transcript,
+chunks, manifest, speaker index and task plan in its own directory under
+WORKSPACE_ROOT, so several meetings can be processed at once without
+their files colliding, and a run is cleaned up by removing one directory.
+
+Usage: workspace.py --new | --remove <run_id>
+"""
+
+import sys
+import time
+import shutil
+from pathlib import Path
+
+
+WORKSPACE_ROOT = Path("/tmp/meeting-transcriber")
+CHUNKS_DIR = "chunks"  # Raw and cleaned chunk files, removed after reassembly
+
+
+def workspace_dir(run_id):
+    """Directory holding a run's intermediate files."""
+    return WORKSPACE_ROOT / str(run_id)
+
+
+def chunk_dir(run_id):
+    """Directory holding a run's raw and cleaned chunk files."""
+    return workspace_dir(run_id) / CHUNKS_DIR
+
+
+def create_workspace():
+    """Allocate a new run ID and create its workspace. Returns the run ID.
+
+    The ID is the current Unix time, with a ".N" suffix when another run
+    claimed that second; mkdir is atomic, so concurrent callers never share one.
+    """
+    WORKSPACE_ROOT.mkdir(parents=True, exist_ok=True)
+    base = str(int(time.time()))
+    run_id = base
+    n = 1
+    while True:
+        try:
+            workspace_dir(run_id).mkdir()
+            return run_id
+        except FileExistsError:
+            n += 1
+            run_id = f"{base}.{n}"
+
+
+def ensure_workspace(run_id):
+    """Create a run's workspace and chunk directory if missing. Returns the workspace path."""
+    chunk_dir(run_id).mkdir(parents=True, exist_ok=True)
+    return workspace_dir(run_id)
+
+
+def run_id_of(path):
+    """Run ID of the workspace a file lives in, or None for files outside one."""
+    path = Path(path).resolve()
+    root = WORKSPACE_ROOT.resolve()
+    for parent in path.parents:
+        if parent.parent == root:
+            return parent.name
+    return None
+
+
+def remove_chunks(run_id):
+    """Delete a run's chunk files. Returns the number of files removed."""
+    directory = chunk_dir(run_id)
+    if not directory.exists():
+        return 0
+    count = sum(1 for _ in directory.iterdir())
+    shutil.rmtree(directory)
+    return count
+
+
+def remove_workspace(run_id):
+    """Delete a run's workspace and everything in it. Returns True if it existed."""
+    directory = workspace_dir(run_id)
+    if not directory.exists():
+        return False
+    shutil.rmtree(directory)
+    return True
+
+
+def main():
+    """Create or remove a run workspace from the command line."""
+    if len(sys.argv) >= 2 and sys.argv[1] == "--new":
+        run_id = create_workspace()
+        ensure_workspace(run_id)
+        print(f"RUN_ID={run_id}")
+        print(f"WORKSPACE={workspace_dir(run_id)}")
+        return 0
+
+    if len(sys.argv) >= 3 and sys.argv[1] == "--remove":
+        run_id = sys.argv[2]
+        if remove_workspace(run_id):
+            print(f"INFO: Removed workspace {workspace_dir(run_id)}")
+        else:
+            print(f"INFO: No workspace for run {run_id}")
+        return 0
+
+    print("Usage: workspace.py --new | --remove <run_id>", file=sys.stderr)
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+"""Make the meeting-transcriber scripts importable, as the scripts import each other."""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "skills" / "meeting-transcriber" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
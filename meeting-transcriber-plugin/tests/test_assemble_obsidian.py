@@ -0,0 +1,39 @@
+"""Tests for finding the metadata JSON in agent output and writing the note."""
+
+from assemble_obsidian import find_metadata_json, write_note
+
+METADATA = '{"date": "2026-03-01", "title": "Sync", "participants": ["Jane"]}'
+EXPECTED = {"date": "2026-03-01", "title": "Sync", "participants": ["Jane"]}
+
+
+def test_brace_in_quoted_prose_before_object():
+    assert find_metadata_json(f'The "{{client" field is below.\n{METADATA}') == EXPECTED
+    assert find_metadata_json(f'Use "{{" to open.\n```json\n{METADATA}\n```') == EXPECTED
+
+
+def test_unpaired_quote_in_prose_before_object():
+    assert find_metadata_json(f'Shared a 5" screen.\n{METADATA}') == EXPECTED
+
+
+def test_braces_inside_json_strings():
+    text = '{"note": "use } and {"} then ' + METADATA
+    assert find_metadata_json(text) == EXPECTED
+
+
+def test_failed_write_leaves_existing_note_untouched(tmp_path):
+    note = tmp_path / "Sync.md"
+    note.write_text("previous note", encoding='utf-8')
+    cleaned = tmp_path / "cleaned.md"
+
+    # Unreadable transcript part-way through the copy, then an empty one
+    cleaned.write_bytes(b"Jane Doe: fine so far " * 10000 + b"\xff\xfe")
+    assert write_note(note, "---\n---\n", cleaned) is None
+    cleaned.write_text("", encoding='utf-8')
+    assert write_note(note, "---\n---\n", cleaned) is None
+
+    assert note.read_text(encoding='utf-8') == "previous note"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["Sync.md", "cleaned.md"]
+
+    cleaned.write_text("Jane Doe: hello", encoding='utf-8')
+    assert write_note(note, "---\n---\n", cleaned) == 3
+    assert note.read_text(encoding='utf-8') == "---\n---\nJane Doe: hello\n"
@@ -0,0 +1,43 @@
+"""Tests for chunking many transcripts in a process pool."""
+
+import json
+import sys
+
+import pytest
+
+import batch_ingest
+import chunk_cache
+import pipeline_state
+import workspace
+
+
+@pytest.fixture(autouse=True)
+def run_dirs(tmp_path, monkeypatch):
+    # Workers are forked, so they see the same temp locations
+    monkeypatch.setattr(workspace, "WORKSPACE_ROOT", tmp_path / "workspaces")
+    monkeypatch.setattr(pipeline_state, "RUNS_DIR", tmp_path / "runs")
+    monkeypatch.setattr(chunk_cache, "CHUNK_CACHE_DIR", tmp_path / "cache")
+
+
+def test_batch_chunks_each_file_and_isolates_failures(tmp_path, monkeypatch, capsys):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    (inbox / "2026-03-01 1000 sync.md").write_text(
+        "Jane Doe: um, the rollout starts next quarter.\n\nBob: sounds good to me.\n", encoding='utf-8')
+    (inbox / "call.json").write_text('{"transcript": [{"speaker": "Jane", "text": "Hi', encoding='utf-8')
+
+    monkeypatch.setattr(sys, "argv", ["batch_ingest.py", str(inbox), "--workers", "2"])
+    assert batch_ingest.main() == 1
+    out = capsys.readouterr().out
+    assert "FAILED_COUNT=1" in out
+
+    batch_file = out.split("BATCH_FILE=")[1].split()[0]
+    good, bad = json.loads(open(batch_file, encoding='utf-8').read())["meetings"]
+    assert (good["status"], good["format"], good["meeting_date"], good["meeting_time"]) == (
+        "chunked", "text", "2026-03-01", "10:00")
+    assert good["chunk_count"] == 1 and good["words_removed"] == 1
+    assert open(good["raw_file"], encoding='utf-8').read().startswith("Jane Doe: the rollout")
+
+    assert (bad["status"], bad["format"]) == ("failed", "json")
+    assert bad["error"].startswith("ERROR:")
+    assert bad["run_id"] != good["run_id"]
@@ -0,0 +1,66 @@
+"""Tests for the fidelity gate in front of the cleaned-chunk cache."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+import chunk_cache
+from check_fidelity import check_chunk
+from reassemble_chunks import locate_chunk_output, write_chunk
+
+RAW = ("Jane: We agreed to move the launch to March because the vendor needs "
+       "two more weeks to finish the integration tests and the documentation.")
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(chunk_cache, "CHUNK_CACHE_DIR", tmp_path / "cache")
+    return tmp_path / "cache"
+
+
+def make_chunk(tmp_path, cleaned):
+    raw_file = tmp_path / "chunk-001.md"
+    raw_file.write_text(RAW, encoding='utf-8')
+    output = tmp_path / "chunk-cleaned-001.md"
+    output.write_text(cleaned, encoding='utf-8')
+    return {"chunk_num": 1, "input_path": str(raw_file), "output_path": str(output),
+            "cache_key": "k1", "cached": False}
+
+
+def test_reassembly_does_not_cache(tmp_path):
+    chunk = make_chunk(tmp_path, "Jane: Launch moves.")
+    source = locate_chunk_output(1, chunk["input_path"], chunk["output_path"])
+    assert write_chunk(source, io.StringIO(), '') == 3
+    assert not chunk_cache.contains("k1")
+
+
+def test_only_passing_chunks_are_cached(tmp_path):
+    chunk = make_chunk(tmp_path, "Jane: Launch moves.")
+    assert check_chunk(chunk)["verdict"] != "ok"
+    assert not chunk_cache.contains("k1")
+
+    chunk = make_chunk(tmp_path, RAW.replace("We agreed", "we agreed"))
+    assert check_chunk(chunk)["verdict"] == "ok"
+    assert chunk_cache.lookup("k1") == RAW.replace("We agreed", "we agreed")
+
+
+def test_raw_fallback_is_not_cached(tmp_path):
+    chunk = make_chunk(tmp_path, RAW)
+    assert check_chunk(chunk)["verdict"] == "not_cleaned"
+    assert not chunk_cache.contains("k1")
+
+
+def test_cache_hits_are_checked_and_bad_entries_evicted(tmp_path):
+    chunk = make_chunk(tmp_path, "")
+    Path(chunk["output_path"]).unlink()
+    chunk["cached"] = True
+
+    chunk_cache.store("k1", RAW.replace("We agreed", "we agreed"))
+    result = check_chunk(chunk)
+    assert (result["verdict"], result["cached"]) == ("ok", True)
+
+    chunk_cache.store("k1", "Jane: Launch moves.")
+    assert check_chunk(chunk)["verdict"] != "ok"
+    assert not chunk_cache.contains("k1")
+    assert check_chunk(chunk)["verdict"] == "missing"
@@ -0,0 +1,83 @@
+"""Tests for streaming segmentation and chunk packing."""
+
+import random
+import tracemalloc
+
+from chunk_transcript import CHUNK_SIZE, MAX_CHUNK_WORDS, iter_segments, plan_token_chunks, split_segment
+
+CAPTION_LINE = "so the rollout for the new region starts next quarter with the pilot team\n"
+
+
+def test_caption_dump_without_blank_lines_is_segmented_in_bounded_memory(tmp_path):
+    source = tmp_path / "captions.md"
+    with open(source, 'w', encoding='utf-8') as f:
+        for _ in range(20_000):  # ~280k words, ~1.5 MB, no blank lines or labels
+            f.write(CAPTION_LINE)
+
+    tracemalloc.start()
+    total = 0
+    largest = 0
+    for segment, words in iter_segments(source):
+        total += words
+        largest = max(largest, words)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert total == 20_000 * len(CAPTION_LINE.split())
+    assert largest <= CHUNK_SIZE
+    assert peak < 64 * 1024
+
+
+def test_segments_end_at_speaker_turns_inside_a_paragraph(tmp_path):
+    source = tmp_path / "raw.md"
+    source.write_text("Intro line.\nJane: Hello.\nstill Jane\nBob: Hi.\n\nClosing.\n", encoding='utf-8')
+    assert list(iter_segments(source)) == [
+        ("Intro line.", 2), ("Jane: Hello.\nstill Jane", 4), ("Bob: Hi.", 2), ("Closing.", 1)]
+
+
+def chunk_tokens(sizes, boundaries):
+    edges = [0, *boundaries, len(sizes)]
+    return [sum(tokens for tokens, _ in sizes[a:b]) for a, b in zip(edges, edges[1:])]
+
+
+def test_token_chunks_are_balanced():
+    rng = random.Random(42)
+    sizes = [(tokens, tokens * 3 // 4) for tokens in (rng.randint(20, 180) for _ in range(200))]
+    chunks = chunk_tokens(sizes, plan_token_chunks(sizes, 1000))
+
+    assert max(chunks) <= 1000
+    # No greedy full-full-full-tiny tail: chunks differ by less than one segment
+    assert max(chunks) - min(chunks) <= max(tokens for tokens, _ in sizes)
+
+
+def test_even_segments_split_evenly():
+    sizes = [(100, 75)] * 40  # 4000 tokens with a 1000 budget: four chunks of 1000
+    assert chunk_tokens(sizes, plan_token_chunks(sizes, 1000)) == [1000] * 4
+    sizes = [(100, 75)] * 41  # 4100 tokens: five chunks of 800-900, not 1000 x 4 + 100
+    assert sorted(chunk_tokens(sizes, plan_token_chunks(sizes, 1000))) == [800, 800, 800, 800, 900]
+
+
+def test_word_ceiling_still_applies():
+    sizes = [(10, 100)] * 30
+    boundaries = plan_token_chunks(sizes, 1000, max_words=400)
+    chunk_words = chunk_tokens([(words, tokens) for tokens, words in sizes], boundaries)
+    assert max(chunk_words) <= 400
+
+
+def test_oversized_single_speaker_segment_splits_at_sentences():
+    sentence = "We agreed the rollout starts with the pilot team next quarter."
+    segment = "Jane Doe: " + " ".join([sentence] * 250)
+    word_count = len(segment.split())
+    pieces = list(split_segment(segment, word_count))
+
+    assert len(pieces) > 1
+    assert all(words <= MAX_CHUNK_WORDS and words == len(piece.split()) for piece, words in pieces)
+    assert all(piece.endswith(".") for piece, _ in pieces)
+    assert pieces[0][0].startswith("Jane Doe: ")
+    assert " ".join(piece for piece, _ in pieces).split() == segment.split()
+
+
+def test_unpunctuated_segment_is_cut_at_the_target():
+    segment = "Jane Doe: " + "word " * 2500
+    pieces = list(split_segment(segment, len(segment.split())))
+    assert [words for _, words in pieces] == [CHUNK_SIZE] * 5 + [2]
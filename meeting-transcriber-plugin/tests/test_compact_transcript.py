@@ -0,0 +1,48 @@
+"""Tests for the transcript compaction stage."""
+
+from compact_transcript import compact_file
+
+
+def compact(tmp_path, text):
+    source = tmp_path / "raw.md"
+    source.write_text(text, encoding='utf-8')
+    stats = compact_file(source, source)
+    return source.read_text(encoding='utf-8'), stats
+
+
+def test_colons_inside_text_are_kept(tmp_path):
+    text = ("The meeting at 10:30 works.\n"
+            "See https://example.com/a:b for details.\n")
+    out, _ = compact(tmp_path, text)
+    assert out == text
+
+
+def test_headings_are_not_speakers(tmp_path):
+    out, stats = compact(tmp_path, "Agenda: budget\nAgenda: hiring\nNote: bring laptops\n")
+    assert out == "Agenda: budget\nAgenda: hiring\nNote: bring laptops\n"
+    assert stats["turns"] == 0
+
+
+def test_same_speaker_lines_merge_and_boilerplate_is_dropped(tmp_path):
+    out, stats = compact(tmp_path, "00:00:05\n"
+                                   "Jane Doe: Hello   everyone.\n"
+                                   "Bob Smith joined the meeting\n"
+                                   "Jane Doe: We start at 10:30 today.\n"
+                                   "Bob Smith: Sounds good.\n")
+    assert out == "Jane Doe: Hello everyone. We start at 10:30 today.\n\nBob Smith: Sounds good.\n"
+    assert stats["events_dropped"] == 1
+    assert stats["words_before"] > stats["words_after"]
+
+
+def test_compaction_is_idempotent(tmp_path):
+    out, _ = compact(tmp_path, "Jane: a\nJane: b\n\nplain text\nmore text\n")
+    again, stats = compact(tmp_path, out)
+    assert again == out
+    assert stats["words_before"] == stats["words_after"]
+
+
+def test_turn_start_time_is_kept(tmp_path):
+    out, _ = compact(tmp_path, "[00:01:05] Alice: Okay.\n"
+                               "[00:01:06] Alice: Let's start.\n"
+                               "00:01:07 Bob: Sure.\n")
+    assert out == "[00:01:05] Alice: Okay. Let's start.\n\n[00:01:07] Bob: Sure.\n"
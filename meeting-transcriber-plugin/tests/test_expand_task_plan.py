@@ -0,0 +1,29 @@
+"""Tests for task plan expansion and the prompt prefix check."""
+
+from chunk_transcript import CLEANER_PROMPT_PREFIX, CLEANER_PROMPT_TEMPLATE
+from expand_task_plan import build_task_plan, expand_task_plan, verify_prompt_prefixes
+
+ROWS = [(1, "/tmp/in-001.md", "/tmp/out-001.md", 500), (2, "/tmp/in-002.md", "/tmp/out-002.md", 480)]
+
+
+def plan_with(template):
+    return build_task_plan("general-purpose", "Clean transcript chunk {chunk_num}", template, ROWS,
+                           prompt_prefix=CLEANER_PROMPT_PREFIX)
+
+
+def test_expanded_prompts_match_recorded_prefix():
+    plan = plan_with(CLEANER_PROMPT_TEMPLATE)
+    ok, length = verify_prompt_prefixes(expand_task_plan(plan), plan["prompt_prefix"])
+    assert ok and length == CLEANER_PROMPT_PREFIX["length"]
+
+
+def test_edited_template_fails_the_check():
+    plan = plan_with(CLEANER_PROMPT_TEMPLATE.replace("DO NOT rewrite", "Feel free to rewrite"))
+    ok, _ = verify_prompt_prefixes(expand_task_plan(plan), plan["prompt_prefix"])
+    assert not ok
+
+
+def test_prompt_from_another_version_fails_the_check():
+    template = CLEANER_PROMPT_TEMPLATE.replace(CLEANER_PROMPT_PREFIX["version"], "TRANSCRIPT_CLEANER_V0")
+    plan = plan_with(template)
+    assert not verify_prompt_prefixes(expand_task_plan(plan), plan["prompt_prefix"])[0]
@@ -0,0 +1,100 @@
+"""Tests for streaming transcript uploads to the raw transcript file."""
+
+import json
+import socket
+import threading
+from http.client import HTTPConnection
+from http.server import HTTPServer
+
+import pytest
+
+import get_transcript
+import workspace
+from get_transcript import TranscriptHandler, stream_to_file
+
+
+@pytest.fixture
+def upload(tmp_path, monkeypatch):
+    """Serve the form handler on a free port; yields a request function."""
+    monkeypatch.setattr(TranscriptHandler, "raw_file", tmp_path / "raw.md")
+    for name in ("word_count", "source_format", "meeting_date", "meeting_time"):
+        monkeypatch.setattr(TranscriptHandler, name, None)
+    monkeypatch.setattr(TranscriptHandler, "server_should_stop", False)
+    server = HTTPServer(('127.0.0.1', 0), TranscriptHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def request(path, body=None, headers=None):
+        conn = HTTPConnection('127.0.0.1', server.server_address[1], timeout=10)
+        if body is None:
+            # No Content-Length and not chunked
+            conn.putrequest('POST', path)
+            conn.endheaders()
+        else:
+            conn.request('POST', path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        result = response.status, response.read().decode()
+        conn.close()
+        return result
+
+    request.port = server.server_address[1]
+    yield request
+    server.shutdown()
+    server.server_close()
+
+
+def test_chunked_upload_with_character_split_across_chunks(upload, tmp_path):
+    # "é" is two bytes, sent in different chunks
+    blocks = [b"Jane Doe: caf\xc3", b"\xa9 au lait\n", "Bob: merci\n".encode()]
+    assert upload('/upload?date=2026-03-01&time=10:00', body=iter(blocks)) == (200, 'OK')
+    assert (tmp_path / "raw.md").read_text(encoding='utf-8') == "Jane Doe: café au lait\nBob: merci\n"
+    assert TranscriptHandler.word_count == 7
+    assert TranscriptHandler.meeting_date == "2026-03-01"
+
+
+def test_upload_without_length_is_rejected(upload, tmp_path):
+    assert upload('/upload')[0] == 411
+    assert not (tmp_path / "raw.md").exists()
+
+
+def test_empty_upload_is_rejected(upload):
+    assert upload('/upload', body=b'') == (400, 'Transcript is empty')
+    assert TranscriptHandler.word_count is None
+
+
+def test_legacy_json_submit(upload, tmp_path):
+    body = json.dumps({"transcript": "Jane Doe: hello there", "date": "2026-03-01", "time": ""})
+    assert upload('/submit', body=body.encode(), headers={'Content-Type': 'application/json'}) == (200, 'OK')
+    assert (tmp_path / "raw.md").read_text(encoding='utf-8') == "Jane Doe: hello there"
+    assert TranscriptHandler.word_count == 4
+
+
+def test_broken_chunked_upload_leaves_no_transcript(upload, tmp_path):
+    # A valid first chunk, then a chunk size that is not hex
+    with socket.create_connection(('127.0.0.1', upload.port), timeout=10) as sock:
+        sock.sendall(b"POST /upload HTTP/1.1\r\nHost: localhost\r\nTransfer-Encoding: chunked\r\n\r\n"
+                     b"11\r\nJane Doe: partial\r\nzz\r\n")
+        response = sock.recv(1024).decode()
+    assert response.startswith("HTTP/1.0 400")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_upload_removes_workspace(tmp_path, monkeypatch):
+    def fail(raw_file):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(workspace, "WORKSPACE_ROOT", tmp_path / "workspaces")
+    monkeypatch.setattr(get_transcript, "ensure_configured", lambda: True)
+    monkeypatch.setattr(get_transcript, "get_transcript_via_dialog", fail)
+    with pytest.raises(OSError):
+        get_transcript.main()
+    assert list(workspace.WORKSPACE_ROOT.iterdir()) == []
+
+
+def test_stream_error_removes_temp_file(tmp_path):
+    def blocks():
+        yield b"Jane Doe: partial"
+        raise ValueError("connection closed inside chunk")
+
+    with pytest.raises(ValueError):
+        stream_to_file(blocks(), tmp_path / "raw.md")
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,83 @@
+"""Tests for keeping the meeting index in step with the vault."""
+
+import os
+
+import pytest
+
+import meeting_index
+
+
+@pytest.fixture(autouse=True)
+def index_file(tmp_path, monkeypatch):
+    connect = meeting_index.connect
+    monkeypatch.setattr(meeting_index, "connect", lambda: connect(tmp_path / "index.sqlite3"))
+
+
+def write_note(path, client, mtime):
+    path.write_text(f"---\ndate met: 2026-03-01\ntime: '10:00'\nclient: {client}\n---\n\nNotes.\n",
+                    encoding='utf-8')
+    os.utime(path, (mtime, mtime))
+
+
+def test_open_index_picks_up_edited_and_deleted_notes(tmp_path):
+    meetings = tmp_path / "Meetings"
+    meetings.mkdir()
+    write_note(meetings / "a.md", "Acme", 1_000_000)
+    write_note(meetings / "b.md", "Acme", 1_000_000)
+    meeting_index.open_index(meetings).close()
+
+    write_note(meetings / "a.md", "Globex", 2_000_000)
+    (meetings / "b.md").unlink()
+    write_note(meetings / "c.md", "Initech", 2_000_000)
+
+    db = meeting_index.open_index(meetings)
+    rows = dict(db.execute("SELECT title, client FROM meetings"))
+    db.close()
+    assert rows == {"a": "Globex", "c": "Initech"}
+
+
+def index_rows(meetings):
+    db = meeting_index.open_index(meetings)
+    rows = dict(db.execute("SELECT title, client FROM meetings"))
+    db.close()
+    return rows
+
+
+def test_unchanged_folders_are_not_walked_again(tmp_path, monkeypatch):
+    meetings = tmp_path / "Meetings"
+    (meetings / "2026").mkdir(parents=True)
+    write_note(meetings / "a.md", "Acme", 1_000_000)
+    write_note(meetings / "2026" / "b.md", "Acme", 1_000_000)
+    for folder in (meetings / "2026", meetings):
+        os.utime(folder, (1_000_000, 1_000_000))
+    assert index_rows(meetings) == {"a": "Acme", "b": "Acme"}
+
+    def no_walk(meetings_dir, folders):
+        raise AssertionError("folders were walked")
+
+    # A note edited in place is still seen, by its own mtime
+    walk_notes = meeting_index.walk_notes
+    monkeypatch.setattr(meeting_index, "walk_notes", no_walk)
+    write_note(meetings / "2026" / "b.md", "Globex", 2_000_000)
+    assert index_rows(meetings) == {"a": "Acme", "b": "Globex"}
+
+    # A note added to a subfolder changes that folder's mtime
+    monkeypatch.setattr(meeting_index, "walk_notes", walk_notes)
+    write_note(meetings / "2026" / "c.md", "Initech", 2_000_000)
+    os.utime(meetings / "2026", (2_000_000, 2_000_000))
+    assert index_rows(meetings) == {"a": "Acme", "b": "Globex", "c": "Initech"}
+
+
+def test_deleted_note_is_dropped_without_a_walk(tmp_path, monkeypatch):
+    meetings = tmp_path / "Meetings"
+    meetings.mkdir()
+    write_note(meetings / "a.md", "Acme", 1_000_000)
+    write_note(meetings / "b.md", "Acme", 1_000_000)
+    os.utime(meetings, (1_000_000, 1_000_000))
+    meeting_index.open_index(meetings).close()
+
+    # Even with the folder mtime restored, the missing note is noticed
+    (meetings / "b.md").unlink()
+    os.utime(meetings, (1_000_000, 1_000_000))
+    monkeypatch.setattr(meeting_index, "walk_notes", None)
+    assert index_rows(meetings) == {"a": "Acme"}
@@ -0,0 +1,60 @@
+"""Tests for participant name matching against the People folder index."""
+
+import os
+
+import pytest
+
+from people_index import NICKNAME_SCORE, PARTIAL_SCORE, connect, match_name, refresh
+
+
+@pytest.fixture
+def people(tmp_path):
+    """People folder with three notes, one with aliases; yields (db, people_dir)."""
+    people_dir = tmp_path / "People"
+    people_dir.mkdir()
+    (people_dir / "Jennifer Smith.md").write_text("# Jennifer Smith\n", encoding='utf-8')
+    (people_dir / "Robert Jones.md").write_text("---\naliases: [RJ]\n---\n", encoding='utf-8')
+    (people_dir / "Michael Chen.md").write_text("# Michael Chen\n", encoding='utf-8')
+    db = connect(tmp_path / "people.sqlite3")
+    assert refresh(db, people_dir) == (3, 0)
+    yield db, people_dir
+    db.close()
+
+
+def test_misspelt_name_matches_by_trigrams(people):
+    db, _ = people
+    result = match_name(db, "Jenifer Smyth")
+    assert result["person"] == "Jennifer Smith"
+    assert result["status"] == "matched"
+    assert 0.6 <= result["score"] < 1
+
+
+def test_unrelated_name_is_new(people):
+    db, _ = people
+    result = match_name(db, "priya patel")
+    assert (result["status"], result["link"]) == ("new", "[[Priya Patel]]")
+
+
+def test_nickname_and_alias_lookup(people):
+    db, _ = people
+    matches = {name: match_name(db, name) for name in ("Bob Jones", "Mike Chen", "RJ", "Chen")}
+    assert {name: (m["person"], m["score"]) for name, m in matches.items()} == {
+        "Bob Jones": ("Robert Jones", NICKNAME_SCORE),
+        "Mike Chen": ("Michael Chen", NICKNAME_SCORE),
+        "RJ": ("Robert Jones", 1.0),
+        "Chen": ("Michael Chen", PARTIAL_SCORE),
+    }
+
+
+def test_refresh_reindexes_changed_and_removed_notes(people):
+    db, people_dir = people
+    assert refresh(db, people_dir) == (0, 0)
+
+    note = people_dir / "Michael Chen.md"
+    note.write_text("---\naliases:\n  - Mick\n---\n", encoding='utf-8')
+    os.utime(note, (note.stat().st_atime, note.stat().st_mtime + 10))
+    (people_dir / "Jennifer Smith.md").unlink()
+    assert refresh(db, people_dir) == (1, 1)
+
+    assert match_name(db, "Mick")["person"] == "Michael Chen"
+    assert match_name(db, "Jennifer Smith")["status"] == "new"
@@ -0,0 +1,110 @@
+"""Tests for run state, resuming a run and workspace lifetime."""
+
+import os
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import assemble_obsidian
+import chunk_cache
+import chunk_transcript
+import get_transcript
+import pipeline_state
+import reassemble_chunks
+import workspace
+
+
+@pytest.fixture(autouse=True)
+def run_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(workspace, "WORKSPACE_ROOT", tmp_path / "workspaces")
+    monkeypatch.setattr(pipeline_state, "RUNS_DIR", tmp_path / "runs")
+    monkeypatch.setattr(chunk_cache, "CHUNK_CACHE_DIR", tmp_path / "cache")
+
+
+def test_old_runs_are_pruned():
+    pipeline_state.complete_phase("old", "chunk")
+    pipeline_state.complete_phase("new", "chunk")
+    stale = time.time() - (pipeline_state.RUN_MAX_AGE_DAYS + 1) * 86400
+    os.utime(pipeline_state.run_dir("old"), (stale, stale))
+
+    assert pipeline_state.prune_runs() == 1
+    assert not pipeline_state.run_dir("old").exists()
+    assert pipeline_state.run_dir("new").exists()
+
+
+def test_cancelled_input_removes_its_workspace(monkeypatch):
+    def cancel(raw_file):
+        raise SystemExit(0)
+
+    monkeypatch.setattr(get_transcript, "ensure_configured", lambda: True)
+    monkeypatch.setattr(get_transcript, "get_transcript_via_dialog", cancel)
+    with pytest.raises(SystemExit):
+        get_transcript.main()
+    assert list(workspace.WORKSPACE_ROOT.iterdir()) == []
+
+
+def test_resumed_chunking_reuses_chunks_and_cleaned_outputs(tmp_path, capsys):
+    raw_file = tmp_path / "raw.md"
+    raw_file.write_text("\n\n".join(f"Jane Doe: {'word ' * 400}" for _ in range(6)), encoding='utf-8')
+    chunk_transcript.main([str(raw_file), "run1", "--max-words", "800"])
+    chunk_count = int(capsys.readouterr().out.split("CHUNK_COUNT=")[1].split()[0])
+    assert chunk_count > 1
+
+    manifest = pipeline_state.completed_phase(pipeline_state.load_state("run1"), "chunk")["manifest"]
+    first = json.loads(Path(manifest).read_text(encoding='utf-8'))["chunks"][0]
+    Path(first["output_path"]).write_text("cleaned", encoding='utf-8')
+
+    chunk_transcript.main([str(raw_file), "run1", "--max-words", "800", "--resume"])
+    out = capsys.readouterr().out
+    assert f"reusing {chunk_count} chunks" in out
+    assert f"TASK_CALL_COUNT={chunk_count - 1}" in out
+
+    # Chunk files gone: chunk again instead of reusing a stale manifest
+    Path(first["input_path"]).unlink()
+    assert chunk_transcript.load_resumable_chunks("run1", str(raw_file)) is None
+
+
+def test_resumed_reassembly_skips_a_finished_run(tmp_path, monkeypatch, capsys):
+    cleaned_file = tmp_path / "cleaned.md"
+    monkeypatch.setattr(sys, "argv", ["reassemble_chunks.py", str(cleaned_file), "run1", "--resume"])
+    with pytest.raises(SystemExit):
+        reassemble_chunks.main()
+
+    cleaned_file.write_text("Jane Doe: cleaned text", encoding='utf-8')
+    pipeline_state.complete_phase("run1", "reassemble", cleaned_file=str(cleaned_file))
+    assert reassemble_chunks.reassembly_done("run1", str(cleaned_file))
+    monkeypatch.setattr(sys, "argv", ["reassemble_chunks.py", str(cleaned_file), "run1", "--resume"])
+    assert reassemble_chunks.main() == 0
+    assert "reassembly already complete" in capsys.readouterr().out
+
+    cleaned_file.write_text("", encoding='utf-8')
+    assert not reassemble_chunks.reassembly_done("run1", str(cleaned_file))
+
+
+def test_resumed_assembly_uses_saved_state(tmp_path, monkeypatch):
+    note = tmp_path / "note.md"
+
+    def assemble(cleaned_file, metadata_text, people_text, notes_text):
+        note.write_text(f"{metadata_text}|{people_text}|{notes_text}", encoding='utf-8')
+        return note
+
+    monkeypatch.setattr(assemble_obsidian, "assemble_and_save", assemble)
+    monkeypatch.setattr(assemble_obsidian, "cleanup_temp_files", lambda raw_file, cleaned_file: None)
+
+    pipeline_state.complete_phase("run1", "chunk", raw_file="raw.md")
+    pipeline_state.complete_phase("run1", "reassemble", cleaned_file="cleaned.md")
+    assert assemble_obsidian.finish_run("run1") is None
+
+    for name in pipeline_state.AGENT_OUTPUTS:
+        pipeline_state.save_agent_output("run1", name, name)
+    assert assemble_obsidian.finish_run("run1") == note
+    assert note.read_text(encoding='utf-8') == "|".join(pipeline_state.AGENT_OUTPUTS)
+
+    # Once saved, a second resume returns the note without assembling again
+    monkeypatch.setattr(assemble_obsidian, "assemble_and_save", None)
+    monkeypatch.setattr(sys, "argv", ["assemble_obsidian.py", "--resume", "run1"])
+    monkeypatch.setattr(assemble_obsidian, "ensure_configured", lambda: True)
+    assert assemble_obsidian.main() == 0
@@ -0,0 +1,26 @@
+"""Tests for planning cleaner Task calls into launch waves."""
+
+from plan_waves import critical_path_seconds, ideal_makespan_seconds, plan_waves, predict_seconds
+
+
+def test_waves_are_filled_longest_first():
+    chunk_words = {1: 300, 2: 900, 3: 500, 4: 900, 5: 100}
+    assert plan_waves(chunk_words, max_concurrency=2) == [[2, 4], [3, 1], [5]]
+    assert plan_waves(chunk_words) == [[2, 4, 3, 1, 5]]
+    assert plan_waves({}) == []
+
+
+def test_critical_path_is_the_sum_of_each_waves_longest_chunk():
+    chunk_words = {1: 300, 2: 900, 3: 500, 4: 900, 5: 100}
+    waves = plan_waves(chunk_words, max_concurrency=2)
+    assert critical_path_seconds(waves, chunk_words) == (
+        predict_seconds(900) + predict_seconds(500) + predict_seconds(100))
+
+
+def test_longest_first_beats_chunk_order():
+    # In chunk order every wave holds one long chunk; longest-first groups them
+    chunk_words = {num: 1000 if num % 2 else 100 for num in range(1, 9)}
+    in_order = [[1, 2], [3, 4], [5, 6], [7, 8]]
+    waves = plan_waves(chunk_words, max_concurrency=2)
+    assert critical_path_seconds(waves, chunk_words) < critical_path_seconds(in_order, chunk_words)
+    assert critical_path_seconds(waves, chunk_words) >= ideal_makespan_seconds(chunk_words, 2)
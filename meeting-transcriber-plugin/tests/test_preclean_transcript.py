@@ -0,0 +1,46 @@
+"""Regression tests for the filler pre-cleaning pass."""
+
+import pytest
+
+from preclean_transcript import build_filler_pattern, make_replacer, preclean_line
+
+
+def clean(line):
+    pattern = build_filler_pattern(['en'])
+    return preclean_line(line + '\n', pattern, make_replacer({'removed': 0})).rstrip('\n')
+
+
+@pytest.mark.parametrize("line", [
+    "The meeting at 10:30 works.",
+    "Jane: meet at 10:30 then.",
+    "See https://example.com/a:b for details.",
+    "Ratio was 3:1 overall.",
+])
+def test_colons_inside_text_are_not_rewritten(line):
+    assert clean(line) == line
+
+
+def test_text_after_label_keeps_its_spacing():
+    assert clean("Jane:  Um, hello there.") == "Jane:  Hello there."
+    assert clean("Jane:\tok then") == "Jane:\tok then"
+
+
+def test_mid_sentence_fillers():
+    assert clean("We should um ship it.") == "We should ship it."
+    assert clean("We need to, uh, discuss it.") == "We need to discuss it."
+    assert clean("It was, you know, fine.") == "It was fine."
+
+
+def test_comma_after_an_opening_word_is_kept():
+    assert clean("Well, I mean, it's hmm, fine") == "Well, it's fine"
+    assert clean("So, um, we start.") == "So, we start."
+    assert clean("Done. Yes, you know, I agree.") == "Done. Yes, I agree."
+
+
+def test_fillers_are_case_sensitive():
+    assert clean("The UM team met.") == "The UM team met."
+    assert clean("Um, so we start.") == "So we start."
+
+
+def test_phrases_inside_a_sentence_are_kept():
+    assert clean("Do you know the answer?") == "Do you know the answer?"
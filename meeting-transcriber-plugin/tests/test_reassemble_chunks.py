@@ -0,0 +1,84 @@
+"""Tests for chunk reassembly and chunk file cleanup."""
+
+import time
+
+import pytest
+
+import pipeline_state
+import reassemble_chunks
+import workspace
+from reassemble_chunks import cleanup_chunk_files, watch_and_reassemble
+
+
+@pytest.fixture(autouse=True)
+def run_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(workspace, "WORKSPACE_ROOT", tmp_path / "workspaces")
+    monkeypatch.setattr(pipeline_state, "RUNS_DIR", tmp_path / "runs")
+
+
+def test_chunks_are_kept_until_fidelity_passes():
+    workspace.ensure_workspace("run1")
+    (workspace.chunk_dir("run1") / "chunk-001.md").write_text("text", encoding='utf-8')
+
+    cleanup_chunk_files("run1")
+    assert workspace.chunk_dir("run1").exists()
+
+    pipeline_state.complete_phase("run1", pipeline_state.FIDELITY_PHASE)
+    cleanup_chunk_files("run1")
+    assert not workspace.chunk_dir("run1").exists()
+
+
+def test_failed_fidelity_check_clears_earlier_pass():
+    pipeline_state.complete_phase("run1", pipeline_state.FIDELITY_PHASE)
+    pipeline_state.reset_phase("run1", pipeline_state.FIDELITY_PHASE)
+    state = pipeline_state.load_state("run1")
+    assert pipeline_state.completed_phase(state, pipeline_state.FIDELITY_PHASE) is None
+
+
+class FakeClock:
+    """Stands in for the time module; each sleep advances the clock and runs a callback."""
+
+    def __init__(self, on_sleep):
+        self.now = time.time()
+        self.on_sleep = on_sleep
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.on_sleep(self.now)
+
+
+def watch_manifest(tmp_path, count):
+    chunks = []
+    for num in range(1, count + 1):
+        input_path = tmp_path / f"chunk-{num:03d}.md"
+        input_path.write_text(f"Jane Doe: raw {num}", encoding='utf-8')
+        chunks.append({"chunk_num": num, "input_path": str(input_path),
+                       "output_path": str(tmp_path / f"chunk-{num:03d}-cleaned.md")})
+    return {"chunks": chunks}
+
+
+def test_watch_timeout_restarts_when_any_chunk_finishes(tmp_path, monkeypatch):
+    manifest = watch_manifest(tmp_path, 3)
+    start = time.time()
+
+    def finish_chunks(now):
+        # Chunks finish last-first, 50s apart; the whole run takes 150s
+        for chunk in manifest["chunks"]:
+            if now - start >= 50 * (4 - chunk["chunk_num"]):
+                (tmp_path / f"chunk-{chunk['chunk_num']:03d}-cleaned.md").write_text(
+                    f"Jane Doe: cleaned {chunk['chunk_num']}", encoding='utf-8')
+
+    monkeypatch.setattr(reassemble_chunks, "time", FakeClock(finish_chunks))
+    monkeypatch.setattr(reassemble_chunks, "SETTLE_SECONDS", 0)
+    cleaned_file = tmp_path / "cleaned.md"
+    assert watch_and_reassemble(manifest, cleaned_file, poll_seconds=10, timeout=60)
+    assert cleaned_file.read_text(encoding='utf-8').count("cleaned") == 3
+
+
+def test_watch_gives_up_when_no_chunk_finishes(tmp_path, monkeypatch):
+    monkeypatch.setattr(reassemble_chunks, "time", FakeClock(lambda now: None))
+    assert not watch_and_reassemble(watch_manifest(tmp_path, 2), tmp_path / "cleaned.md",
+                                    poll_seconds=10, timeout=60)
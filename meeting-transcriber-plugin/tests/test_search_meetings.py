@@ -0,0 +1,68 @@
+"""Tests for full-text search over the meeting index."""
+
+import os
+
+import pytest
+
+import meeting_index
+from search_meetings import build_match, search
+
+
+def write_note(path, date_met, notes, transcript, mtime=1_000_000):
+    path.write_text(f"---\ndate met: {date_met}\ntime: '10:00'\n---\n\n{notes}\n\n"
+                    f"## Transcript\n\n{transcript}\n", encoding='utf-8')
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Index of three notes in a temp vault; yields (db, meetings_dir)."""
+    meetings = tmp_path / "Meetings"
+    meetings.mkdir()
+    write_note(meetings / "a.md", "2026-03-01", "Discussed the quarterly budget review.",
+               "Jane Doe: the budget is tight.")
+    write_note(meetings / "b.md", "2026-03-10", "Roadmap planning. Review of budget items deferred.",
+               "Bob: let's move on.")
+    write_note(meetings / "c.md", "2026-04-02", "Hiring plan.",
+               "Bob: quarterly budget review next week.")
+    db = meeting_index.connect(tmp_path / "index.sqlite3")
+    meeting_index.refresh(db, meetings)
+    yield db, meetings
+    db.close()
+
+
+def titles(results):
+    return sorted(f"{result['title']}:{result['section']}" for result in results)
+
+
+def test_query_terms_are_quoted_for_fts():
+    assert build_match('NOT "budget review" c-d') == '"NOT" "budget review" "c-d"'
+    assert build_match('say "hi" there', phrase=True) == '"say  hi  there"'
+
+
+def test_words_and_phrases(index):
+    db, _ = index
+    assert titles(search(db, build_match("budget review"))) == ["a:notes", "b:notes", "c:transcript"]
+    assert titles(search(db, build_match("budget review", phrase=True))) == ["a:notes", "c:transcript"]
+    assert titles(search(db, build_match('"quarterly budget" tight'))) == []
+
+
+def test_date_range_and_section_filters(index):
+    db, _ = index
+    match = build_match("budget")
+    assert titles(search(db, match, date_from="2026-03-05")) == ["b:notes", "c:transcript"]
+    assert titles(search(db, match, date_to="2026-03-31")) == ["a:notes", "a:transcript", "b:notes"]
+    assert titles(search(db, match, section="transcript")) == ["a:transcript", "c:transcript"]
+    assert len(search(db, match, limit=2)) == 2
+
+
+def test_edited_and_deleted_notes_are_not_found(index):
+    db, meetings = index
+    write_note(meetings / "a.md", "2026-03-01", "Office move.", "Jane Doe: boxes.", mtime=2_000_000)
+    (meetings / "c.md").unlink()
+    meeting_index.refresh(db, meetings)
+
+    # Old full-text entries are still there until compaction, but never returned
+    assert meeting_index.stale_sections(db) > 0
+    assert titles(search(db, build_match("quarterly"))) == []
+    assert titles(search(db, build_match("boxes"))) == ["a:transcript"]
@@ -0,0 +1,50 @@
+"""Tests for the speaker-turn index built while chunking."""
+
+from chunk_transcript import SPEAKER_LABEL
+from speaker_index import SpeakerIndex, participants
+from transcript_formats import convert_file
+
+
+def build(text):
+    index = SpeakerIndex(SPEAKER_LABEL)
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        index.add_line(offset, line)
+        offset += len(line.encode('utf-8'))
+    return index.to_dict()
+
+
+def test_prose_with_colons_is_not_a_speaker():
+    index = build("Jane Doe: The meeting at 10:30 works.\n"
+                  "The meeting at 10:30 works for me.\n"
+                  "See https://example.com for the deck.\n"
+                  "Note: bring the budget.\n")
+    assert participants(index) == ["Jane Doe"]
+
+
+def test_unlabelled_paragraph_is_not_credited_to_previous_speaker():
+    index = build("Jane Doe: one two three\nfour five\n\nsix seven eight nine\n\nBob: ten\n")
+    assert index["turns"][0][2] == 5
+    assert index["unattributed_words"] == 4
+    assert participants(index) == ["Jane Doe", "Bob"]
+
+
+def test_turn_time_is_taken_from_the_label_only():
+    index = build("[00:01:23] Jane Doe: see you at 10:30\nBob: at 11:00 then\n")
+    assert index["turns"][0][3] == "00:01:23"
+    assert index["turns"][1][3] is None
+
+
+def test_parsed_export_speakers_are_attributed(tmp_path):
+    source = tmp_path / "call.srt"
+    source.write_text("1\n00:00:01,000 --> 00:00:03,000\n<v Jane Doe (Guest)>Morning all.</v>\n\n"
+                      "2\n00:00:03,000 --> 00:00:05,000\n<v jsmith>Hi Jane, ready?</v>\n\n"
+                      "3\n100:00:05,000 --> 100:00:06,000\n<v Иван>Да.</v>\n", encoding='utf-8')
+    converted = tmp_path / "call.md"
+    convert_file(source, converted)
+
+    index = build(converted.read_text(encoding='utf-8'))
+    assert participants(index) == ["Jane Doe (Guest)", "jsmith", "Иван"]
+    assert [turn[2:] for turn in index["turns"]] == [
+        [2, "00:00:01"], [3, "00:00:03"], [1, "100:00:05"]]
+    assert index["unattributed_words"] == 0
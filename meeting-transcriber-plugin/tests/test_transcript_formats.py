@@ -0,0 +1,78 @@
+"""Tests for caption and JSON export conversion."""
+
+import json
+
+from chunk_transcript import SPEAKER_LABEL
+from compact_transcript import compact_file
+from transcript_formats import convert_file, detect_format, iter_json_cues, merge_turns
+
+
+def convert(tmp_path, name, text):
+    source = tmp_path / name
+    source.write_text(text, encoding='utf-8')
+    output = tmp_path / "out.md"
+    fmt = detect_format(source)
+    convert_file(source, output, fmt)
+    return fmt, output.read_text(encoding='utf-8')
+
+
+def test_same_words_from_another_speaker_are_a_turn():
+    cues = [(0, 1, "Alice", "Okay."), (1, 2, "Bob", "Okay."), (2, 3, "Alice", "Next item.")]
+    assert [(speaker, text) for _, _, speaker, text in merge_turns(cues)] == [
+        ("Alice", "Okay."), ("Bob", "Okay."), ("Alice", "Next item.")]
+
+
+def test_repeated_caption_from_same_speaker_is_dropped():
+    cues = [(0, 1, "Alice", "So the plan"), (1, 2, "Alice", "So the plan"), (2, 3, "Alice", "is set.")]
+    assert list(merge_turns(cues)) == [(0, 3, "Alice", "So the plan is set.")]
+
+
+def test_vtt_turns_keep_start_times(tmp_path):
+    fmt, out = convert(tmp_path, "call.vtt", "WEBVTT\n\n"
+                       "00:01:05.000 --> 00:01:07.000\n<v Alice>Okay.</v>\n\n"
+                       "00:01:07.500 --> 00:01:08.000\n<v Bob>Okay.</v>\n")
+    assert fmt == 'vtt'
+    assert out == "[00:01:05] Alice: Okay.\n\n[00:01:07] Bob: Okay.\n"
+
+
+def test_export_speaker_names_stay_speaker_labels(tmp_path):
+    fmt, out = convert(tmp_path, "call.vtt", "WEBVTT\n\n"
+                       "00:01:05.000 --> 00:01:07.000\n<v Jane Doe (Guest)>Hello.</v>\n\n"
+                       "00:01:07.000 --> 00:01:08.000\n<v jsmith>Hi.</v>\n\n"
+                       "00:01:08.000 --> 00:01:09.000\n<v Иван Петров>Привет.</v>\n\n"
+                       "100:00:00.000 --> 100:00:01.000\n<v Room 2: Mary Ann de la Cruz Smith>Bye.</v>\n")
+    speakers = [SPEAKER_LABEL.match(line).group('speaker') for line in out.split('\n\n')]
+    assert speakers == ["Jane Doe (Guest)", "jsmith", "Иван Петров", "Room 2 Mary Ann de la Cruz Smith"]
+
+    compacted = tmp_path / "compact.md"
+    compact_file(tmp_path / "out.md", compacted)
+    assert compacted.read_text(encoding='utf-8').split('\n\n')[:2] == [
+        "[00:01:05] Jane Doe (Guest): Hello.", "[00:01:07] jsmith: Hi."]
+
+
+def test_untimed_lowercase_prose_is_not_a_label():
+    assert not SPEAKER_LABEL.match("note to self: buy milk")
+    assert not SPEAKER_LABEL.match("[00:01:05] Agenda: budget")
+
+
+def test_json_cues_are_streamed_from_nested_export(tmp_path):
+    export = {"meeting": {"title": "Sync {weekly}", "participants": [{"name": "Alice"}]},
+              "transcript": [{"speaker": {"name": "Alice"}, "start": 3, "text": "Hi \"all\"."},
+                             {"speaker": "Bob", "start": 5, "text": "Hello."}],
+              "after": [{"text": "not part of the cue list"}]}
+    source = tmp_path / "export.json"
+    source.write_text(json.dumps(export), encoding='utf-8')
+    assert [(start, speaker, text) for start, _, speaker, text in iter_json_cues(source)] == [
+        (3, "Alice", 'Hi "all".'), (5, "Bob", "Hello.")]
+
+
+def test_text_starting_with_brace_is_not_json(tmp_path):
+    source = tmp_path / "raw.md"
+    source.write_text("{laughs} Alice: that was fun.\n", encoding='utf-8')
+    assert detect_format(source) == 'text'
+
+
+def test_json_without_extension_is_detected_by_parsing(tmp_path):
+    source = tmp_path / "raw.md"
+    source.write_text('[{"speaker": "Alice", "text": "Hi."}]', encoding='utf-8')
+    assert detect_format(source) == 'json'
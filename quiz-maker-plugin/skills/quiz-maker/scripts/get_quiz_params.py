@@ -378,8 +378,9 @@ class ParamsHandler(BaseHTTPRequestHandler):
 
 def get_params_via_dialog():
     """Show web form to collect quiz parameters."""
-    port = 8766
-    server = HTTPServer(('127.0.0.1', port), ParamsHandler)
+    # Port 0 lets the OS pick a free port, so other skills' forms never collide
+    server = HTTPServer(('127.0.0.1', 0), ParamsHandler)
+    port = server.server_address[1]
 
     def run_server():
         while not ParamsHandler.server_should_stop:
@@ -347,8 +347,9 @@ def preview_extractions(extractions_json):
     """Show preview dialog with extractions."""
     PreviewHandler.extractions_data = json.loads(extractions_json)
 
-    port = 8767
-    server = HTTPServer(('127.0.0.1', port), PreviewHandler)
+    # Port 0 lets the OS pick a free port, so other skills' forms never collide
+    server = HTTPServer(('127.0.0.1', 0), PreviewHandler)
+    port = server.server_address[1]
 
     def run_server():
         while not PreviewHandler.server_should_stop:
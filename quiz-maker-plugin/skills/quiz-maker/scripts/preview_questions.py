@@ -409,8 +409,9 @@ def preview_questions(questions_json):
     """Show preview dialog with questions."""
     QuestionPreviewHandler.questions_data = json.loads(questions_json)
 
-    port = 8768
-    server = HTTPServer(('127.0.0.1', port), QuestionPreviewHandler)
+    # Port 0 lets the OS pick a free port, so other skills' forms never collide
+    server = HTTPServer(('127.0.0.1', 0), QuestionPreviewHandler)
+    port = server.server_address[1]
 
     def run_server():
         while not QuestionPreviewHandler.server_should_stop: